@@ -2,10 +2,15 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from matplotlib.collections import PolyCollection
 from datetime import datetime, timedelta
+import threading
 import warnings
 warnings.filterwarnings('ignore')
 
+# Générateur aléatoire propre à chaque tâche de génération parallèle (par thread)
+_node_rng = threading.local()
+
 class PSFinanceAnalyzer:
     def __init__(self):
         self.parti = "Parti Socialiste (PS)"
@@ -16,6 +21,18 @@ class PSFinanceAnalyzer:
         self.end_year = 2025
         self.creation_year = 1971
         self.presidential_years = [1974, 1981, 1988, 1995, 2002, 2007, 2012, 2017, 2022]
+        self.future_presidential_years = [2027, 2032]
+        self.microsim_agents = None  # nombre d'agents de la microsimulation (None: courbe agrégée)
+        self.legislative_years = [1973, 1978, 1981, 1986, 1988, 1993, 1997, 2002, 2007, 2012, 2017, 2022]
+        self.municipal_years = [1971, 1977, 1983, 1989, 1995, 2001, 2008, 2014, 2020]
+        
+        # Libellés des événements clés, utilisés pour nommer les ruptures détectées
+        self.key_events = {1971: 'Congrès Epinay', 1981: 'Mitterrand', 1995: 'Chirac', 
+                           1997: 'Gauche Plurielle', 2002: 'Défaite Jospin', 
+                           2012: 'Hollande', 2017: 'Effondrement'}
+        self.max_annotations = 12
+        self._forecaster = None
+        self.memory_report = None  # pic mémoire du dernier ensemble généré avec un budget
         
         # Configuration spécifique au PS
         self.config = {
@@ -24,757 +41,752 @@ class PSFinanceAnalyzer:
             "electorat_cible": ["ouvriers", "employes", "enseignants", "fonctionnaires", "classes_moyennes"],
             "budget_base": 20,  # millions d'euros (historiquement important)
             "adherents_base": 100000,
+            "elus_locaux_base": 30000,
+            "maires_base": 500,
             "importance": "historique",
             "sources_financement": ["cotisations", "dons", "financement_public", "evenements", "elus"]
         }
         
-    def generate_financial_data(self):
-        """Génère des données financières pour le PS"""
-        print(f"🏛️ Génération des données financières pour {self.parti}...")
+        # Régimes de croissance par période politique: (début, fin, taux), le premier
+        # intervalle qui contient l'année l'emporte; croissance = 1 + taux * (i/echelle)
+        self.growth_regimes = {
+            'Adherents': {
+                'echelle': 10,
+                'periodes': [(1971, 1981, 0.12),   # Montée vers le pouvoir
+                             (1981, 1988, 0.08),   # Présidence Mitterrand
+                             (1988, 1995, 0.02),   # Second septennat
+                             (1995, 2002, -0.05),  # Opposition
+                             (2002, 2012, 0.10),   # Reconstruction et victoire
+                             (2012, 2017, -0.08),  # Présidence Hollande
+                             (2017, 2022, -0.25)], # Effondrement
+                'defaut': 0.03,                    # 2023-2025 - Reconstruction
+            },
+            'Federations_Departementales': {
+                'echelle': 15,
+                'periodes': [(None, 1990, 0.03), (None, 2010, 0.01)],
+                'defaut': -0.01,
+            },
+            'Elus_Locaux': {
+                'echelle': 20,
+                'periodes': [(None, 1990, 0.04), (None, 2010, 0.01)],
+                'defaut': -0.03,
+            },
+            'Maires': {
+                'echelle': 15,
+                'periodes': [(None, 1995, 0.05), (None, 2014, 0.02)],
+                'defaut': -0.04,
+            },
+            'Revenus_Total': {
+                'echelle': 15,
+                'periodes': [(1971, 1981, 0.15),   # Montée vers le pouvoir
+                             (1981, 1995, 0.10),   # Au pouvoir
+                             (1995, 2002, -0.03),  # Opposition
+                             (2002, 2012, 0.08),   # Reconstruction
+                             (2012, 2017, 0.05),   # Au pouvoir
+                             (2017, 2022, -0.20)], # Effondrement
+                'defaut': 0.02,                    # Reconstruction
+            },
+            'Cotisations_Adherents': {
+                'echelle': 12,
+                'periodes': [(None, 1981, 0.12), (None, 1995, 0.05), (None, 2012, 0.03)],
+                'defaut': -0.08,
+            },
+            'Depenses_Personnel': {
+                'echelle': 12,
+                'periodes': [(None, 1990, 0.06), (None, 2010, 0.03)],
+                'defaut': -0.04,                   # Rationalisation
+            },
+        }
+        
+        # Variation annuelle de la dette selon la position dans le cycle présidentiel
+        self.debt_regime = {
+            'election': 0.15,        # Augmentation dette
+            'post_election': -0.08,  # Réduction dette
+            'defaut': 0.03,
+        }
+        
+        # Chocs historiques appliqués par _add_party_trends: {année: {colonne: facteur}}
+        self.party_events = {
+            1971: {'Revenus_Total': 1.5, 'Adherents': 2.0},  # Congrès d'Epinay
+            1981: {'Revenus_Total': 1.8, 'Financement_Public': 2.2,
+                   'Elus_Nationaux': 2.5},  # Élection de Mitterrand
+            1988: {'Revenus_Total': 1.3, 'Dons_Prives': 1.6},  # Réélection de Mitterrand
+            1997: {'Financement_Public': 1.4, 'Elus_Nationaux': 1.8},  # Gauche plurielle
+            2002: {'Adherents': 0.85, 'Financement_Public': 0.75},  # Défaite de Jospin
+            2007: {'Adherents': 0.90, 'Revenus_Total': 0.95},  # Défaite de Royal
+            2012: {'Revenus_Total': 1.4, 'Financement_Public': 1.6,
+                   'Elus_Nationaux': 1.7},  # Élection de Hollande
+            2017: {'Adherents': 0.60, 'Revenus_Total': 0.55, 'Financement_Public': 0.40,
+                   'Elus_Nationaux': 0.30},  # Défaite de Hamon
+            2022: {'Depenses_Campagnes': 1.4, 'Investissement_Communication': 1.3},  # Primaires
+        }
+        
+    def generate_financial_data(self, verbose=True, max_workers=None, seed=None):
+        """Génère des données financières pour le PS
+        
+        Chaque nœud du graphe de génération tire dans son propre générateur, dérivé
+        de `seed` (à défaut, d'une graine prise au générateur global, qui n'est alors
+        consommé que d'un tirage): les données ne dépendent pas de max_workers.
+        Avec max_workers > 1, les colonnes indépendantes sont lancées sur un pool de
+        threads, mais cela ne réduit pas la latence: chaque nœud ne fait que quelques
+        appels NumPy sur 55 années, et la microsimulation (seul nœud coûteux) est un
+        nœud unique; le temps mesuré est le même de 1 à 8 threads.
+        """
+        from ps_scheduler import PSColumnScheduler
+        
+        if verbose:
+            print(f"🏛️ Génération des données financières pour {self.parti}...")
         
         # Créer une base de données annuelle
         dates = pd.date_range(start=f'{self.start_year}-01-01', 
                              end=f'{self.end_year}-12-31', freq='Y')
         
-        data = {'Annee': [date.year for date in dates]}
-        
-        # Données d'adhérents et structure
-        data['Adherents'] = self._simulate_adherents(dates)
-        data['Federations_Departementales'] = self._simulate_federations(dates)
-        data['Elus_Locaux'] = self._simulate_elus_locaux(dates)
-        data['Elus_Nationaux'] = self._simulate_elus_nationaux(dates)
-        data['Maires'] = self._simulate_maires(dates)
-        data['Conseillers_Regionaux'] = self._simulate_conseillers_regionaux(dates)
-        
-        # Revenus du parti
-        data['Revenus_Total'] = self._simulate_total_revenue(dates)
-        data['Cotisations_Adherents'] = self._simulate_membership_fees(dates)
-        data['Dons_Prives'] = self._simulate_private_donations(dates)
-        data['Financement_Public'] = self._simulate_public_funding(dates)
-        data['Revenus_Evenements'] = self._simulate_event_revenue(dates)
-        data['Cotisations_Elus'] = self._simulate_elected_officials_fees(dates)
-        data['Revenus_Formations'] = self._simulate_training_revenue(dates)
-        
-        # Dépenses du parti
-        data['Depenses_Total'] = self._simulate_total_expenses(dates)
-        data['Depenses_Personnel'] = self._simulate_staff_expenses(dates)
-        data['Depenses_Campagnes'] = self._simulate_campaign_expenses(dates)
-        data['Depenses_Communication'] = self._simulate_communication_expenses(dates)
-        data['Depenses_Fonctionnement'] = self._simulate_operating_expenses(dates)
-        data['Depenses_Formation'] = self._simulate_training_expenses(dates)
-        data['Depenses_International'] = self._simulate_international_expenses(dates)
-        
-        # Indicateurs financiers
-        data['Taux_Execution_Budget'] = self._simulate_budget_execution_rate(dates)
-        data['Ratio_Cotisations_Revenus'] = self._simulate_membership_ratio(dates)
-        data['Dependance_Financement_Public'] = self._simulate_public_funding_dependency(dates)
-        data['Solde_Financier'] = self._simulate_financial_balance(dates)
-        data['Endettement'] = self._simulate_debt(dates)
-        
-        # Investissements stratégiques
-        data['Investissement_Communication'] = self._simulate_communication_investment(dates)
-        data['Investissement_Numérique'] = self._simulate_digital_investment(dates)
-        data['Investissement_Formation'] = self._simulate_training_investment(dates)
-        data['Investissement_Recherche'] = self._simulate_research_investment(dates)
-        data['Investissement_International'] = self._simulate_international_investment(dates)
-        
-        df = pd.DataFrame(data)
-        
-        # Ajouter des tendances spécifiques au PS
-        self._add_party_trends(df)
-        
-        return df
+        tasks = self._column_tasks(dates)
+        # Graines par nœud dérivées de la même façon en séquentiel et en parallèle
+        base_seed = np.random.randint(2**31 - 1) if seed is None else seed
+        names = list(tasks)
+        wrap = lambda name, func: self._with_node_rng(
+            func, self._scenario_seed(base_seed, names.index(name)))
+        return PSColumnScheduler(max_workers).run(tasks, wrap)['_tendances']
+    
+    def _column_tasks(self, dates):
+        """Graphe de génération: nom → (fonction, dépendances), dans l'ordre séquentiel
+        
+        Les nœuds préfixés par '_' sont intermédiaires; '_tendances' assemble le
+        DataFrame et applique _add_party_trends une fois toutes les colonnes prêtes.
+        """
+        columns = [
+            # Données d'adhérents et structure
+            ('Adherents', self._simulate_adherents),
+            ('Federations_Departementales', self._simulate_federations),
+            ('Elus_Locaux', self._simulate_elus_locaux),
+            ('Elus_Nationaux', self._simulate_elus_nationaux),
+            ('Maires', self._simulate_maires),
+            ('Conseillers_Regionaux', self._simulate_conseillers_regionaux),
+            # Revenus du parti
+            ('Revenus_Total', self._simulate_total_revenue),
+            ('Cotisations_Adherents', self._simulate_membership_fees),
+            ('Dons_Prives', self._simulate_private_donations),
+            ('Financement_Public', self._simulate_public_funding),
+            ('Revenus_Evenements', self._simulate_event_revenue),
+            ('Cotisations_Elus', self._simulate_elected_officials_fees),
+            ('Revenus_Formations', self._simulate_training_revenue),
+            # Dépenses du parti
+            ('Depenses_Total', self._simulate_total_expenses),
+            ('Depenses_Personnel', self._simulate_staff_expenses),
+            ('Depenses_Campagnes', self._simulate_campaign_expenses),
+            ('Depenses_Communication', self._simulate_communication_expenses),
+            ('Depenses_Fonctionnement', self._simulate_operating_expenses),
+            ('Depenses_Formation', self._simulate_training_expenses),
+            ('Depenses_International', self._simulate_international_expenses),
+            # Indicateurs financiers
+            ('Taux_Execution_Budget', self._simulate_budget_execution_rate),
+            ('Ratio_Cotisations_Revenus', self._simulate_membership_ratio),
+            ('Dependance_Financement_Public', self._simulate_public_funding_dependency),
+            ('Solde_Financier', self._simulate_financial_balance),
+            ('Endettement', self._simulate_debt),
+            # Investissements stratégiques
+            ('Investissement_Communication', self._simulate_communication_investment),
+            ('Investissement_Numérique', self._simulate_digital_investment),
+            ('Investissement_Formation', self._simulate_training_investment),
+            ('Investissement_Recherche', self._simulate_research_investment),
+            ('Investissement_International', self._simulate_international_investment),
+        ]
+        from ps_microsim import PSMembershipMicrosim
+        
+        tasks = {}
+        if self.microsim_agents:
+            # Adhérents et cotisations issus de la microsimulation (tirée en premier)
+            tasks['_microsim'] = (lambda: self._simulate_membership_microsim(dates), ())
+        for column, simulate in columns:
+            if self.microsim_agents and column in PSMembershipMicrosim.colonnes:
+                tasks[column] = (lambda members, column=column: members[column], ('_microsim',))
+            else:
+                tasks[column] = (lambda simulate=simulate: simulate(dates), ())
+        
+        names = [column for column, _ in columns]
+        deps = tuple(names) + (('_microsim',) if self.microsim_agents else ())
+        
+        def assemble(*values):
+            data = {'Annee': [date.year for date in dates]}
+            data.update(zip(names, values))
+            df = pd.DataFrame(data)
+            # Ajouter des tendances spécifiques au PS (les départs massifs d'adhérents
+            # sont déjà intégrés par la microsimulation)
+            members = values[-1] if self.microsim_agents else None
+            self._add_party_trends(df, skip=members['chocs_integres'] if members else ())
+            return df
+        
+        tasks['_tendances'] = (assemble, deps)
+        return tasks
+    
+    @property
+    def _random(self):
+        """Générateur aléatoire courant: celui du nœud en cours, sinon le générateur global"""
+        return getattr(_node_rng, 'state', np.random)
+    
+    def _with_node_rng(self, func, seed):
+        """Enveloppe une tâche pour qu'elle tire dans son propre générateur (thread courant)"""
+        def run(*args):
+            _node_rng.state = np.random.RandomState(seed)
+            try:
+                return func(*args)
+            finally:
+                del _node_rng.state
+        return run
+    
+    def _scenario_seed(self, seed, scenario):
+        """Graine du scénario, indépendante des autres scénarios de l'ensemble"""
+        return int(np.random.SeedSequence(seed, spawn_key=(scenario,)).generate_state(1)[0])
+    
+    def iter_scenarios(self, n_scenarios, seed=None, start=0):
+        """Génère les scénarios un par un (mémoire constante): (numéro, DataFrame)"""
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        for scenario in range(start, n_scenarios):
+            yield scenario, self.generate_financial_data(
+                verbose=False, seed=self._scenario_seed(seed, scenario))
+    
+    def generate_ensemble(self, n_scenarios, seed=None, max_memory=None):
+        """Génère un ensemble de scénarios au format long (colonne 'Scenario')
+        
+        Avec un budget (max_memory="4GB"), l'ensemble est rempli dans des tableaux
+        préalloués et une MemoryError est levée avant la génération s'il ne tient pas
+        dans le budget (utiliser alors iter_ensemble).
+        """
+        print(f"🏛️ Génération de {n_scenarios} scénarios pour {self.parti}...")
+        if max_memory is not None:
+            from ps_memory import PSMemoryPlanner, format_memory
+            
+            planner = PSMemoryPlanner(self, max_memory)
+            if planner.chunk_size(n_scenarios) < n_scenarios:
+                raise MemoryError(
+                    f"{n_scenarios} scénarios ({format_memory(n_scenarios * planner.scenario_bytes())}) "
+                    f"dépassent le budget de {format_memory(planner.budget)}: utiliser iter_ensemble")
+            ensemble = planner.build(self.iter_scenarios(n_scenarios, seed=seed), n_scenarios)
+            self.memory_report = planner.report()
+            return ensemble
+        
+        frames = []
+        for scenario, df in self.iter_scenarios(n_scenarios, seed=seed):
+            df.insert(0, 'Scenario', scenario)
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True)
+    
+    def iter_ensemble(self, n_scenarios, seed=None, max_memory="1GB"):
+        """Génère l'ensemble par blocs au format long, dimensionnés pour le budget mémoire"""
+        from ps_memory import PSMemoryPlanner
+        
+        # Graine commune à tous les blocs: résultats identiques à generate_ensemble
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        planner = PSMemoryPlanner(self, max_memory)
+        chunk = planner.chunk_size(n_scenarios)
+        for start in range(0, n_scenarios, chunk):
+            stop = min(start + chunk, n_scenarios)
+            yield planner.build(self.iter_scenarios(stop, seed=seed, start=start), stop - start)
+        self.memory_report = planner.report()
+    
+    def run_ensemble_job(self, path, n_scenarios, seed=None, chunk_size=100, max_chunks=None):
+        """Génère un ensemble avec points de reprise dans `path` (reprend s'il existe déjà)"""
+        from ps_checkpoint import PSEnsembleJob
+
+        job = PSEnsembleJob(self, path, n_scenarios, seed=seed, chunk_size=chunk_size)
+        job.run(max_chunks=max_chunks)
+        return job
+
+    def _regime_index(self, column, year):
+        """Indice de l'entrée de régime applicable (len(periodes) pour le défaut)"""
+        periodes = self.growth_regimes[column]['periodes']
+        for k, (debut, fin, _) in enumerate(periodes):
+            if (debut is None or debut <= year) and year <= fin:
+                return k
+        return len(periodes)
+    
+    def _regime_rate(self, column, year):
+        """Taux de croissance du régime applicable à l'année"""
+        regime = self.growth_regimes[column]
+        k = self._regime_index(column, year)
+        return regime['periodes'][k][2] if k < len(regime['periodes']) else regime['defaut']
+    
+    def _regime_rates(self, column, years):
+        """Taux de croissance du régime applicable à chaque année (vectorisé)"""
+        regime = self.growth_regimes[column]
+        # np.select retient la première condition vraie, comme _regime_index
+        conditions = [(years <= fin) & (True if debut is None else years >= debut)
+                      for debut, fin, _ in regime['periodes']]
+        return np.select(conditions, [rate for _, _, rate in regime['periodes']],
+                         default=regime['defaut'])
+    
+    def _regime_growth(self, column, years):
+        """Croissance 1 + taux * (i/echelle) du régime de la colonne"""
+        steps = np.arange(len(years))
+        return 1 + self._regime_rates(column, years) * (steps / self.growth_regimes[column]['echelle'])
+    
+    def _debt_regime_key(self, year):
+        """Position de l'année dans le cycle présidentiel pour l'endettement"""
+        if year in self.presidential_years:
+            return 'election'
+        if year - 1 in self.presidential_years:
+            return 'post_election'
+        return 'defaut'
+    
+    def _noise(self, scale, n):
+        """Bruit multiplicatif N(1, scale) de toute la série, tiré en un seul appel"""
+        return self._random.normal(1, scale, n)
+    
+    def _years(self, dates):
+        return np.asarray(dates.year, dtype=np.int64)
     
     def _simulate_adherents(self, dates):
         """Simule le nombre d'adhérents"""
         base_adherents = self.config["adherents_base"]
         
-        adherents = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Évolution historique des adhérents selon les périodes politiques
-            if 1971 <= year <= 1981:  # Montée vers le pouvoir
-                growth_rate = 0.12
-            elif 1981 <= year <= 1988:  # Présidence Mitterrand
-                growth_rate = 0.08
-            elif 1988 <= year <= 1995:  # Second septennat
-                growth_rate = 0.02
-            elif 1995 <= year <= 2002:  # Opposition
-                growth_rate = -0.05
-            elif 2002 <= year <= 2012:  # Reconstruction et victoire
-                growth_rate = 0.10
-            elif 2012 <= year <= 2017:  # Présidence Hollande
-                growth_rate = -0.08
-            elif 2017 <= year <= 2022:  # Effondrement
-                growth_rate = -0.25
-            else:  # 2023-2025 - Reconstruction
-                growth_rate = 0.03
-                
-            growth = 1 + growth_rate * (i/10)
-            noise = np.random.normal(1, 0.07)
-            adherents.append(base_adherents * growth * noise)
-        
-        return adherents
+        # Évolution historique des adhérents selon les périodes politiques
+        growth = self._regime_growth('Adherents', self._years(dates))
+        return base_adherents * growth * self._noise(0.07, len(dates))
+    
+    def _simulate_membership_microsim(self, dates):
+        """Simule les adhérents et leurs cotisations par microsimulation d'agents"""
+        from ps_microsim import PSMembershipMicrosim
+        
+        # Graine tirée du générateur global: les ensembles restent reproductibles
+        microsim = PSMembershipMicrosim(self, n_agents=self.microsim_agents,
+                                        seed=self._random.randint(2**31 - 1))
+        return microsim.run([date.year for date in dates])
     
     def _simulate_federations(self, dates):
         """Simule le nombre de fédérations départementales"""
         base_federations = 100  # Métropole + outre-mer
         
-        federations = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1990:
-                growth_rate = 0.03
-            elif year <= 2010:
-                growth_rate = 0.01
-            else:
-                growth_rate = -0.01
-                
-            growth = 1 + growth_rate * (i/15)
-            federations.append(base_federations * growth)
-        
-        return federations
+        return base_federations * self._regime_growth('Federations_Departementales', self._years(dates))
     
     def _simulate_elus_locaux(self, dates):
         """Simule le nombre d'élus locaux"""
-        base_elus = 30000
+        base_elus = self.config["elus_locaux_base"]
+        years = self._years(dates)
         
-        elus = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Élections municipales
-            if year in [1971, 1977, 1983, 1989, 1995, 2001, 2008, 2014, 2020]:
-                if year <= 1995:
-                    multiplier = 1.2
-                elif year <= 2014:
-                    multiplier = 1.1
-                else:
-                    multiplier = 0.8
-            else:
-                multiplier = 1.0
-                
-            # Tendance générale
-            if year <= 1990:
-                growth_rate = 0.04
-            elif year <= 2010:
-                growth_rate = 0.01
-            else:
-                growth_rate = -0.03
-                
-            growth = 1 + growth_rate * (i/20)
-            noise = np.random.normal(1, 0.05)
-            elus.append(base_elus * growth * multiplier * noise)
+        # Élections municipales
+        multiplier = np.where(np.isin(years, self.municipal_years),
+                              np.select([years <= 1995, years <= 2014], [1.2, 1.1], 0.8), 1.0)
         
-        return elus
+        # Tendance générale
+        growth = self._regime_growth('Elus_Locaux', years)
+        return base_elus * growth * multiplier * self._noise(0.05, len(dates))
     
     def _simulate_elus_nationaux(self, dates):
         """Simule le nombre d'élus nationaux"""
         base_elus = 200
+        years = self._years(dates)
         
-        elus = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Élections législatives
-            if year in [1973, 1978, 1981, 1986, 1988, 1993, 1997, 2002, 2007, 2012, 2017, 2022]:
-                if year in [1981, 1988, 1997, 2012]:  # Victoires
-                    multiplier = 1.8
-                elif year in [1978, 1993, 2002, 2007, 2017]:  # Défaites
-                    multiplier = 0.6
-                else:
-                    multiplier = 1.2
-            else:
-                multiplier = 1.0
-                
-            growth = 1 - 0.01 * (i/10)
-            noise = np.random.normal(1, 0.10)
-            elus.append(base_elus * growth * multiplier * noise)
+        # Élections législatives
+        multiplier = np.where(np.isin(years, self.legislative_years),
+                              np.select([np.isin(years, [1981, 1988, 1997, 2012]),  # Victoires
+                                         np.isin(years, [1978, 1993, 2002, 2007, 2017])],  # Défaites
+                                        [1.8, 0.6], 1.2), 1.0)
         
-        return elus
+        growth = 1 - 0.01 * (np.arange(len(dates))/10)
+        return base_elus * growth * multiplier * self._noise(0.10, len(dates))
     
     def _simulate_maires(self, dates):
         """Simule le nombre de maires PS"""
-        base_maires = 500
+        base_maires = self.config["maires_base"]
         
-        maires = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1995:
-                growth_rate = 0.05
-            elif year <= 2014:
-                growth_rate = 0.02
-            else:
-                growth_rate = -0.04
-                
-            growth = 1 + growth_rate * (i/15)
-            noise = np.random.normal(1, 0.08)
-            maires.append(base_maires * growth * noise)
-        
-        return maires
+        growth = self._regime_growth('Maires', self._years(dates))
+        return base_maires * growth * self._noise(0.08, len(dates))
     
     def _simulate_conseillers_regionaux(self, dates):
         """Simule le nombre de conseillers régionaux"""
         base_conseillers = 300
+        years = self._years(dates)
         
-        conseillers = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1986:  # Premières régionales
-                if year <= 1998:
-                    growth_rate = 0.08
-                elif year <= 2010:
-                    growth_rate = 0.03
-                else:
-                    growth_rate = -0.05
-            else:
-                growth_rate = 0
-                
-            growth = 1 + growth_rate * max(0, (year - 1986)/20)
-            noise = np.random.normal(1, 0.09)
-            conseillers.append(base_conseillers * growth * noise if year >= 1986 else 0)
-        
-        return conseillers
+        # Premières régionales en 1986
+        growth_rate = np.select([years < 1986, years <= 1998, years <= 2010], [0, 0.08, 0.03], -0.05)
+        growth = 1 + growth_rate * np.maximum(0, (years - 1986)/20)
+        noise = self._noise(0.09, len(dates))
+        return np.where(years >= 1986, base_conseillers * growth * noise, 0)
     
     def _simulate_total_revenue(self, dates):
         """Simule les revenus totaux"""
         base_revenue = self.config["budget_base"]
         
-        revenue = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance historique des revenus
-            if 1971 <= year <= 1981:  # Montée vers le pouvoir
-                growth_rate = 0.15
-            elif 1981 <= year <= 1995:  # Au pouvoir
-                growth_rate = 0.10
-            elif 1995 <= year <= 2002:  # Opposition
-                growth_rate = -0.03
-            elif 2002 <= year <= 2012:  # Reconstruction
-                growth_rate = 0.08
-            elif 2012 <= year <= 2017:  # Au pouvoir
-                growth_rate = 0.05
-            elif 2017 <= year <= 2022:  # Effondrement
-                growth_rate = -0.20
-            else:  # Reconstruction
-                growth_rate = 0.02
-                
-            growth = 1 + growth_rate * (i/15)
-            noise = np.random.normal(1, 0.08)
-            revenue.append(base_revenue * growth * noise)
-        
-        return revenue
+        # Croissance historique des revenus
+        growth = self._regime_growth('Revenus_Total', self._years(dates))
+        return base_revenue * growth * self._noise(0.08, len(dates))
     
     def _simulate_membership_fees(self, dates):
         """Simule les cotisations des adhérents"""
         base_fees = self.config["budget_base"] * 0.20
         
-        fees = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1981:
-                growth_rate = 0.12
-            elif year <= 1995:
-                growth_rate = 0.05
-            elif year <= 2012:
-                growth_rate = 0.03
-            else:
-                growth_rate = -0.08
-                
-            growth = 1 + growth_rate * (i/12)
-            noise = np.random.normal(1, 0.06)
-            fees.append(base_fees * growth * noise)
-        
-        return fees
+        growth = self._regime_growth('Cotisations_Adherents', self._years(dates))
+        return base_fees * growth * self._noise(0.06, len(dates))
     
     def _simulate_private_donations(self, dates):
         """Simule les dons privés"""
         base_donations = self.config["budget_base"] * 0.25
+        years = self._years(dates)
         
-        donations = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Évolution législative et politique
-            if year <= 1990:  # Peu de réglementation
-                multiplier = 1.3
-            elif year <= 2010:  # Réglementation renforcée
-                multiplier = 0.9
-            else:  # Contrôles stricts
-                multiplier = 0.7
-                
-            # Cycles électoraux
-            if year in self.presidential_years:
-                electoral_multiplier = 1.6
-            else:
-                electoral_multiplier = 1.0
-                
-            growth = 1 + 0.02 * (i/10)
-            noise = np.random.normal(1, 0.12)
-            donations.append(base_donations * growth * multiplier * electoral_multiplier * noise)
+        # Évolution législative et politique: peu de réglementation, réglementation
+        # renforcée, puis contrôles stricts
+        multiplier = np.select([years <= 1990, years <= 2010], [1.3, 0.9], 0.7)
+        
+        # Cycles électoraux
+        electoral_multiplier = np.where(np.isin(years, self.presidential_years), 1.6, 1.0)
         
-        return donations
+        growth = 1 + 0.02 * (np.arange(len(dates))/10)
+        noise = self._noise(0.12, len(dates))
+        return base_donations * growth * multiplier * electoral_multiplier * noise
     
     def _simulate_public_funding(self, dates):
         """Simule le financement public"""
         base_funding = self.config["budget_base"] * 0.35
+        years = self._years(dates)
         
-        funding = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Dépend des résultats électoraux
-            if year in [1981, 1982, 1983, 1984, 1985, 1986, 1987, 1988, 1989, 1990,  # Mitterrand
-                       1997, 1998, 1999, 2000, 2001, 2002,  # Jospin
-                       2012, 2013, 2014, 2015, 2016, 2017]:  # Hollande
-                multiplier = 1.5
-            else:
-                multiplier = 0.8
-                
-            growth = 1 + 0.03 * (i/10)
-            noise = np.random.normal(1, 0.07)
-            funding.append(base_funding * growth * multiplier * noise)
+        # Dépend des résultats électoraux
+        in_power = np.isin(years, [1981, 1982, 1983, 1984, 1985, 1986, 1987, 1988, 1989, 1990,  # Mitterrand
+                                   1997, 1998, 1999, 2000, 2001, 2002,  # Jospin
+                                   2012, 2013, 2014, 2015, 2016, 2017])  # Hollande
+        multiplier = np.where(in_power, 1.5, 0.8)
         
-        return funding
+        growth = 1 + 0.03 * (np.arange(len(dates))/10)
+        return base_funding * growth * multiplier * self._noise(0.07, len(dates))
     
     def _simulate_event_revenue(self, dates):
         """Simule les revenus des événements"""
         base_revenue = self.config["budget_base"] * 0.08
+        years = self._years(dates)
         
-        revenue = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Universités d'été, congrès, etc.
-            if year in [1971, 1974, 1981, 1988, 1995, 2002, 2008, 2012, 2017, 2022]:
-                multiplier = 1.8  # Années de congrès importants
-            else:
-                multiplier = 1.0
-                
-            growth = 1 + 0.02 * (i/10)
-            noise = np.random.normal(1, 0.10)
-            revenue.append(base_revenue * growth * multiplier * noise)
+        # Universités d'été, congrès, etc. (années de congrès importants)
+        multiplier = np.where(np.isin(years, [1971, 1974, 1981, 1988, 1995, 2002, 2008, 2012, 2017, 2022]),
+                              1.8, 1.0)
         
-        return revenue
+        growth = 1 + 0.02 * (np.arange(len(dates))/10)
+        return base_revenue * growth * multiplier * self._noise(0.10, len(dates))
     
     def _simulate_elected_officials_fees(self, dates):
         """Simule les cotisations des élus"""
         base_fees = self.config["budget_base"] * 0.10
+        years = self._years(dates)
         
-        fees = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 2000:
-                growth_rate = 0.05
-            elif year <= 2015:
-                growth_rate = 0.02
-            else:
-                growth_rate = -0.06
-                
-            growth = 1 + growth_rate * max(0, (year - 1971)/30)
-            noise = np.random.normal(1, 0.08)
-            fees.append(base_fees * growth * noise)
-        
-        return fees
+        growth_rate = np.select([years <= 2000, years <= 2015], [0.05, 0.02], -0.06)
+        growth = 1 + growth_rate * np.maximum(0, (years - 1971)/30)
+        return base_fees * growth * self._noise(0.08, len(dates))
     
     def _simulate_training_revenue(self, dates):
         """Simule les revenus des formations"""
         base_revenue = self.config["budget_base"] * 0.02
+        years = self._years(dates)
         
-        revenue = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1990:  # Développement de l'offre de formation
-                growth = 1 + 0.04 * max(0, (year - 1990)/20)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.09)
-            revenue.append(base_revenue * growth * noise)
-        
-        return revenue
+        # Développement de l'offre de formation à partir de 1990
+        growth = np.where(years >= 1990, 1 + 0.04 * np.maximum(0, (years - 1990)/20), 1)
+        return base_revenue * growth * self._noise(0.09, len(dates))
     
     def _simulate_total_expenses(self, dates):
         """Simule les dépenses totales"""
         base_expenses = self.config["budget_base"] * 0.95
+        years = self._years(dates)
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year in self.presidential_years:  # Années électorales
-                multiplier = 1.5
-            else:
-                multiplier = 1.0
-                
-            growth = 1 + 0.04 * (i/10)
-            noise = np.random.normal(1, 0.07)
-            expenses.append(base_expenses * growth * multiplier * noise)
+        # Années électorales
+        multiplier = np.where(np.isin(years, self.presidential_years), 1.5, 1.0)
         
-        return expenses
+        growth = 1 + 0.04 * (np.arange(len(dates))/10)
+        return base_expenses * growth * multiplier * self._noise(0.07, len(dates))
     
     def _simulate_staff_expenses(self, dates):
         """Simule les dépenses de personnel"""
         base_staff = self.config["budget_base"] * 0.40  # Structure importante
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1990:
-                growth_rate = 0.06
-            elif year <= 2010:
-                growth_rate = 0.03
-            else:  # Rationalisation
-                growth_rate = -0.04
-                
-            growth = 1 + growth_rate * (i/12)
-            noise = np.random.normal(1, 0.05)
-            expenses.append(base_staff * growth * noise)
-        
-        return expenses
+        growth = self._regime_growth('Depenses_Personnel', self._years(dates))
+        return base_staff * growth * self._noise(0.05, len(dates))
     
     def _simulate_campaign_expenses(self, dates):
         """Simule les dépenses de campagne"""
         base_campaign = self.config["budget_base"] * 0.20
+        years = self._years(dates)
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year in self.presidential_years:  # Années électorales
-                multiplier = 2.5
-            elif year in [y-1 for y in self.presidential_years]:  # Années pré-électorales
-                multiplier = 1.5
-            else:
-                multiplier = 0.7
-                
-            growth = 1 + 0.03 * (i/10)
-            noise = np.random.normal(1, 0.15)
-            expenses.append(base_campaign * growth * multiplier * noise)
+        # Années électorales, pré-électorales, puis le reste du cycle
+        multiplier = np.select([np.isin(years, self.presidential_years),
+                                np.isin(years, [y-1 for y in self.presidential_years])],
+                               [2.5, 1.5], 0.7)
         
-        return expenses
+        growth = 1 + 0.03 * (np.arange(len(dates))/10)
+        return base_campaign * growth * multiplier * self._noise(0.15, len(dates))
     
     def _simulate_communication_expenses(self, dates):
         """Simule les dépenses de communication"""
         base_communication = self.config["budget_base"] * 0.12
+        years = self._years(dates)
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1990:  # Importance croissante de la communication
-                growth = 1 + 0.06 * max(0, (year - 1990)/20)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.10)
-            expenses.append(base_communication * growth * noise)
-        
-        return expenses
+        # Importance croissante de la communication à partir de 1990
+        growth = np.where(years >= 1990, 1 + 0.06 * np.maximum(0, (years - 1990)/20), 1)
+        return base_communication * growth * self._noise(0.10, len(dates))
     
     def _simulate_operating_expenses(self, dates):
         """Simule les dépenses de fonctionnement"""
         base_operating = self.config["budget_base"] * 0.15
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            growth = 1 + 0.02 * (i/10)
-            noise = np.random.normal(1, 0.04)
-            expenses.append(base_operating * growth * noise)
-        
-        return expenses
+        growth = 1 + 0.02 * (np.arange(len(dates))/10)
+        return base_operating * growth * self._noise(0.04, len(dates))
     
     def _simulate_training_expenses(self, dates):
         """Simule les dépenses de formation"""
         base_training = self.config["budget_base"] * 0.05
+        years = self._years(dates)
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1980:  # Développement de l'offre de formation
-                growth = 1 + 0.04 * max(0, (year - 1980)/30)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.08)
-            expenses.append(base_training * growth * noise)
-        
-        return expenses
+        # Développement de l'offre de formation à partir de 1980
+        growth = np.where(years >= 1980, 1 + 0.04 * np.maximum(0, (years - 1980)/30), 1)
+        return base_training * growth * self._noise(0.08, len(dates))
     
     def _simulate_international_expenses(self, dates):
         """Simule les dépenses internationales"""
         base_international = self.config["budget_base"] * 0.03
+        years = self._years(dates)
         
-        expenses = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1975:  # Engagement international
-                growth = 1 + 0.03 * max(0, (year - 1975)/30)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.12)
-            expenses.append(base_international * growth * noise)
-        
-        return expenses
+        # Engagement international à partir de 1975
+        growth = np.where(years >= 1975, 1 + 0.03 * np.maximum(0, (years - 1975)/30), 1)
+        return base_international * growth * self._noise(0.12, len(dates))
     
     def _simulate_budget_execution_rate(self, dates):
         """Simule le taux d'exécution du budget"""
-        rates = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1980:
-                base_rate = 0.82
-            elif year <= 2000:
-                base_rate = 0.85
-            elif year <= 2015:
-                base_rate = 0.88
-            else:  # Difficultés financières
-                base_rate = 0.80
-                
-            noise = np.random.normal(1, 0.05)
-            rates.append(base_rate * noise)
-        
-        return rates
+        years = self._years(dates)
+        
+        # Difficultés financières après 2015
+        base_rate = np.select([years <= 1980, years <= 2000, years <= 2015], [0.82, 0.85, 0.88], 0.80)
+        return base_rate * self._noise(0.05, len(dates))
     
     def _simulate_membership_ratio(self, dates):
         """Simule le ratio cotisations/revenus"""
-        ratios = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1980:
-                base_ratio = 0.25
-            elif year <= 2000:
-                base_ratio = 0.22
-            elif year <= 2015:
-                base_ratio = 0.18
-            else:  # Baisse de la part des cotisations
-                base_ratio = 0.12
-                
-            noise = np.random.normal(1, 0.06)
-            ratios.append(base_ratio * noise)
-        
-        return ratios
+        years = self._years(dates)
+        
+        # Baisse de la part des cotisations après 2015
+        base_ratio = np.select([years <= 1980, years <= 2000, years <= 2015], [0.25, 0.22, 0.18], 0.12)
+        return base_ratio * self._noise(0.06, len(dates))
     
     def _simulate_public_funding_dependency(self, dates):
         """Simule la dépendance au financement public"""
-        dependencies = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year <= 1990:
-                base_dependency = 0.30
-            elif year <= 2010:
-                base_dependency = 0.40
-            else:  # Plus dépendant
-                base_dependency = 0.50
-                
-            noise = np.random.normal(1, 0.07)
-            dependencies.append(base_dependency * noise)
-        
-        return dependencies
+        years = self._years(dates)
+        
+        # Plus dépendant après 2010
+        base_dependency = np.select([years <= 1990, years <= 2010], [0.30, 0.40], 0.50)
+        return base_dependency * self._noise(0.07, len(dates))
     
     def _simulate_financial_balance(self, dates):
         """Simule le solde financier"""
-        balances = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year in self.presidential_years:  # Déficits électoraux
-                base_balance = -0.10
-            elif year in [y+1 for y in self.presidential_years]:  # Redressement
-                base_balance = 0.05
-            else:
-                base_balance = 0.02
-                
-            noise = np.random.normal(1, 0.08)
-            balances.append(base_balance * noise)
+        years = self._years(dates)
         
-        return balances
+        # Déficits électoraux, puis redressement l'année suivante
+        base_balance = np.select([np.isin(years, self.presidential_years),
+                                  np.isin(years, [y+1 for y in self.presidential_years])],
+                                 [-0.10, 0.05], 0.02)
+        return base_balance * self._noise(0.08, len(dates))
     
     def _simulate_debt(self, dates):
         """Simule l'endettement"""
-        base_debt = self.config["budget_base"] * 0.3
+        from ps_kernels import compound_paths
         
-        debt = []
-        current_debt = base_debt
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year in self.presidential_years:  # Augmentation dette
-                change_rate = 0.15
-            elif year in [y+1 for y in self.presidential_years]:  # Réduction dette
-                change_rate = -0.08
-            else:
-                change_rate = 0.03
-                
-            current_debt *= (1 + change_rate)
-            noise = np.random.normal(1, 0.06)
-            debt.append(current_debt * noise)
+        base_debt = self.config["budget_base"] * 0.3
         
-        return debt
+        # Récurrence d'une année sur l'autre: noyau compilé (Numba) si disponible
+        change_rates = [self.debt_regime[self._debt_regime_key(date.year)] for date in dates]
+        return compound_paths(base_debt, change_rates) * self._noise(0.06, len(dates))
     
     def _simulate_communication_investment(self, dates):
         """Simule l'investissement en communication"""
         base_investment = self.config["budget_base"] * 0.07
+        years = self._years(dates)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1990:
-                growth = 1 + 0.05 * max(0, (year - 1990)/20)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.11)
-            investment.append(base_investment * growth * noise)
-        
-        return investment
+        growth = np.where(years >= 1990, 1 + 0.05 * np.maximum(0, (years - 1990)/20), 1)
+        return base_investment * growth * self._noise(0.11, len(dates))
     
     def _simulate_digital_investment(self, dates):
         """Simule l'investissement numérique"""
         base_investment = self.config["budget_base"] * 0.04
+        years = self._years(dates)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 2000:
-                growth = 1 + 0.10 * max(0, (year - 2000)/15)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.15)
-            investment.append(base_investment * growth * noise)
-        
-        return investment
+        growth = np.where(years >= 2000, 1 + 0.10 * np.maximum(0, (years - 2000)/15), 1)
+        return base_investment * growth * self._noise(0.15, len(dates))
     
     def _simulate_training_investment(self, dates):
         """Simule l'investissement en formation"""
         base_investment = self.config["budget_base"] * 0.05
+        years = self._years(dates)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1980:
-                growth = 1 + 0.04 * max(0, (year - 1980)/30)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.10)
-            investment.append(base_investment * growth * noise)
-        
-        return investment
+        growth = np.where(years >= 1980, 1 + 0.04 * np.maximum(0, (years - 1980)/30), 1)
+        return base_investment * growth * self._noise(0.10, len(dates))
     
     def _simulate_research_investment(self, dates):
         """Simule l'investissement en recherche"""
         base_investment = self.config["budget_base"] * 0.03
+        years = self._years(dates)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1990:
-                growth = 1 + 0.03 * max(0, (year - 1990)/20)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.12)
-            investment.append(base_investment * growth * noise)
-        
-        return investment
+        growth = np.where(years >= 1990, 1 + 0.03 * np.maximum(0, (years - 1990)/20), 1)
+        return base_investment * growth * self._noise(0.12, len(dates))
     
     def _simulate_international_investment(self, dates):
         """Simule l'investissement international"""
         base_investment = self.config["budget_base"] * 0.02
+        years = self._years(dates)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            if year >= 1975:
-                growth = 1 + 0.02 * max(0, (year - 1975)/30)
-            else:
-                growth = 1
-                
-            noise = np.random.normal(1, 0.18)
-            investment.append(base_investment * growth * noise)
+        growth = np.where(years >= 1975, 1 + 0.02 * np.maximum(0, (years - 1975)/30), 1)
+        return base_investment * growth * self._noise(0.18, len(dates))
+    
+    def _add_party_trends(self, df, skip=()):
+        """Ajoute des tendances réalistes pour le PS (sauf les couples (année, colonne) de skip)"""
+        years = df['Annee'].to_numpy()
+        # Facteurs cumulés par colonne, appliqués en une multiplication par colonne
+        factors = {}
+        for year, shocks in self.party_events.items():
+            mask = years == year
+            if not mask.any():
+                continue
+            for column, factor in shocks.items():
+                if (year, column) not in skip:
+                    factors.setdefault(column, np.ones(len(years)))[mask] *= factor
+        for column, factor in factors.items():
+            df[column] = df[column].to_numpy() * factor
+    
+    def forecast_financial_data(self, df, until_year=None, method='ets', max_workers=None,
+                                cache_dir=None, alpha=0.05):
+        """Projette toutes les colonnes au-delà de end_year avec intervalles de prédiction"""
+        from ps_forecast import PSForecaster
+        
+        if (self._forecaster is None or self._forecaster.method != method
+                or self._forecaster.cache_dir != cache_dir):
+            self._forecaster = PSForecaster(method=method, max_workers=max_workers,
+                                            cache_dir=cache_dir)
+        
+        # Par défaut: jusqu'aux prochains cycles présidentiels (2027, 2032)
+        if until_year is None:
+            return self._forecaster.forecast_cycles(df, cycle_years=self.future_presidential_years,
+                                                    alpha=alpha)
+        return self._forecaster.forecast(df, until_year=until_year, alpha=alpha)
+    
+    def generate_federation_data(self, n_federations=100, seed=None):
+        """Mode hiérarchique: simule chaque fédération (fédération × année × métrique)"""
+        from ps_federations import PSFederationModel
+
+        years = np.arange(self.start_year, self.end_year + 1)
+        # Flux indépendants pour le modèle agrégé et la microsimulation
+        model_seed, microsim_seed = np.random.SeedSequence(seed).spawn(2)
+        model = PSFederationModel(self, n_federations=n_federations, seed=model_seed)
+        members, skip = None, ()
+        if self.microsim_agents:
+            from ps_microsim import PSMembershipMicrosim
+
+            # Adhérents par fédération issus directement des agents (chocs de départ
+            # inclus), répartis selon les poids structurels des fédérations
+            microsim = PSMembershipMicrosim(self, n_agents=self.microsim_agents,
+                                            n_federations=n_federations, seed=microsim_seed,
+                                            federation_weights=model.size).run(years)
+            members, skip = microsim['Adherents_Federations'], microsim['chocs_integres']
+        return model.run(years, members=members, skip=skip)
+
+    def cycle_index(self, years=None):
+        """Index des cycles électoraux (présidentiel, législatif, municipal) par année"""
+        from ps_cycles import PSCycleIndex
         
-        return investment
+        return PSCycleIndex(self, years)
     
-    def _add_party_trends(self, df):
-        """Ajoute des tendances réalistes pour le PS"""
-        for i, row in df.iterrows():
-            year = row['Annee']
-            
-            # Congrès d'Epinay (1971)
-            if year == 1971:
-                df.loc[i, 'Revenus_Total'] *= 1.5
-                df.loc[i, 'Adherents'] *= 2.0
-            
-            # Élection de Mitterrand (1981)
-            if year == 1981:
-                df.loc[i, 'Revenus_Total'] *= 1.8
-                df.loc[i, 'Financement_Public'] *= 2.2
-                df.loc[i, 'Elus_Nationaux'] *= 2.5
-            
-            # Réélection de Mitterrand (1988)
-            if year == 1988:
-                df.loc[i, 'Revenus_Total'] *= 1.3
-                df.loc[i, 'Dons_Prives'] *= 1.6
-            
-            # Victoire de la gauche plurielle (1997)
-            if year == 1997:
-                df.loc[i, 'Financement_Public'] *= 1.4
-                df.loc[i, 'Elus_Nationaux'] *= 1.8
-            
-            # Défaite de Jospin (2002)
-            if year == 2002:
-                df.loc[i, 'Adherents'] *= 0.85
-                df.loc[i, 'Financement_Public'] *= 0.75
-            
-            # Défaite de Royal (2007)
-            if year == 2007:
-                df.loc[i, 'Adherents'] *= 0.90
-                df.loc[i, 'Revenus_Total'] *= 0.95
-            
-            # Élection de Hollande (2012)
-            if year == 2012:
-                df.loc[i, 'Revenus_Total'] *= 1.4
-                df.loc[i, 'Financement_Public'] *= 1.6
-                df.loc[i, 'Elus_Nationaux'] *= 1.7
-            
-            # Défaite de Hamon (2017)
-            if year == 2017:
-                df.loc[i, 'Adherents'] *= 0.60
-                df.loc[i, 'Revenus_Total'] *= 0.55
-                df.loc[i, 'Financement_Public'] *= 0.40
-                df.loc[i, 'Elus_Nationaux'] *= 0.30
-            
-            # Primaires 2022
-            if year == 2022:
-                df.loc[i, 'Depenses_Campagnes'] *= 1.4
-                df.loc[i, 'Investissement_Communication'] *= 1.3
+    def detect_events(self, df, column='Revenus_Total'):
+        """Ruptures et anomalies détectées sur une colonne: {année: 'rupture'|'anomalie'}"""
+        from ps_detection import PSBreakDetector
+        
+        return PSBreakDetector().events(df, column)
     
-    def create_financial_analysis(self, df):
-        """Crée une analyse complète des finances du PS"""
+    def detect_breaks(self, data, columns=None):
+        """Ruptures et anomalies de toutes les colonnes et scénarios (format long)"""
+        from ps_detection import PSBreakDetector
+        
+        return PSBreakDetector().detect(data, columns)
+    
+    def series_store(self, df):
+        """Séries indexées par année (et scénario): store['Revenus_Total', 1981:1995]"""
+        from ps_series import PSSeriesStore
+        
+        return PSSeriesStore.of(df)
+    
+    def compare_scenarios(self, baseline, variants, quantiles=(0.05, 0.5, 0.95),
+                          max_memory='256MB'):
+        """Compare une référence à des variantes: écarts, distance KS, décalage des quantiles"""
+        from ps_compare import PSScenarioComparison
+        
+        return PSScenarioComparison(baseline, variants, quantiles=quantiles,
+                                    max_memory=max_memory)
+    
+    def what_if(self, df):
+        """Ouvre une session de simulation « et si » incrémentale sur un jeu généré"""
+        from ps_whatif import PSWhatIf
+        
+        return PSWhatIf(self, df)
+    
+    def save_results(self, data, path='PS_resultats.sqlite', label=None, seed=None, extra=None):
+        """Enregistre un jeu généré (ou un ensemble) dans la base SQLite des résultats"""
+        from ps_store import PSResultStore
+        
+        with PSResultStore(path) as store:
+            return store.add_run(data, self.config, label=label, seed=seed, extra=extra)
+    
+    def result_store(self, path='PS_resultats.sqlite'):
+        """Ouvre la base SQLite des résultats (requêtes agrégées côté SQL)"""
+        from ps_store import PSResultStore
+        
+        return PSResultStore(path)
+    
+    def export_excel(self, path, data=None, n_scenarios=1, seed=None):
+        """Exporte un classeur Excel multi-feuilles en écriture continue (openpyxl write-only)"""
+        from ps_export import PSExcelExporter
+        
+        if data is None:
+            scenarios = self.iter_scenarios(n_scenarios, seed=seed)
+        elif 'Scenario' in data.columns:
+            scenarios = data.groupby('Scenario', sort=False)
+        else:
+            scenarios = [(0, data)]
+        
+        with PSExcelExporter(path) as exporter:
+            for scenario, df in scenarios:
+                exporter.write_scenario(scenario, df)
+        print(f"💾 Classeur Excel sauvegardé: {path}")
+    
+    def create_financial_analysis(self, df, quality='final', fmt='png', dpi=None,
+                                  cache_dir=None, cache_size='256MB'):
+        """Crée une analyse complète des finances du PS
+        
+        Avec cache_dir (ex. '.ps_render_cache'), le rendu passe par un cache par
+        panneau, borné à cache_size: seuls les panneaux dont les entrées ont changé
+        sont retracés. quality='apercu' donne un aperçu rapide (72 dpi),
+        'final' la qualité impression (300 dpi); fmt: png, jpg, webp, tiff, pdf, svg.
+        """
+        import matplotlib
+        from ps_render import PSRenderCache
+        
+        output_file = f'PS_financial_analysis.{fmt}'
+        cache = PSRenderCache(self, cache_dir, max_size=cache_size)
+        stats = cache.render(df, output_file, quality=quality, fmt=fmt, dpi=dpi)
+        print(f"🖼️ Analyse sauvegardée: {output_file} ({stats['rendus']} rendu(s), "
+              f"{stats['caches']} en cache)")
+        
+        # Affichage de l'image produite (sans retracer les panneaux) hors backends fichiers
+        file_backends = ('agg', 'pdf', 'ps', 'svg', 'cairo', 'pgf', 'template')
+        if matplotlib.get_backend().lower() not in file_backends and fmt in ('png', 'jpg'):
+            plt.figure(figsize=(20, 24))
+            plt.imshow(plt.imread(output_file))
+            plt.axis('off')
+            plt.show()
+        
+        # Générer les insights
+        self._generate_financial_insights(df)
+    
+    def create_dashboard(self, df):
+        """Crée un tableau de bord persistant, mis à jour en place (exploration, animations)"""
+        from ps_dashboard import PSDashboard
+        
+        return PSDashboard(self, df)
+    
+    def _build_figure(self, df):
+        """Construit la figure à 8 panneaux et renvoie (figure, axes principaux)"""
+        # Les panneaux lisent les séries dans le store indexé par année, construit une fois
+        df = self.series_store(df)
         plt.style.use('seaborn-v0_8')
         fig = plt.figure(figsize=(20, 24))
         
@@ -813,18 +825,101 @@ class PSFinanceAnalyzer:
         plt.suptitle(f'Analyse des Finances du {self.parti} ({self.start_year}-{self.end_year})', 
                     fontsize=16, fontweight='bold')
         plt.tight_layout()
-        plt.savefig(f'PS_financial_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
         
-        # Générer les insights
-        self._generate_financial_insights(df)
+        return fig, [ax1, ax2, ax3, ax4, ax5, ax6, ax7, ax8]
+    
+    def _max_points(self, ax):
+        """Nombre de points au-delà duquel le tracé dépasse la résolution de l'axe"""
+        return max(2 * int(ax.bbox.width), 100)
+    
+    def _downsample_lttb(self, x, y, n_out):
+        """Sous-échantillonnage Largest-Triangle-Three-Buckets (forme visuelle préservée)"""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        n = len(x)
+        if n_out >= n or n_out < 3:
+            return x, y
+        
+        edges = np.append(np.linspace(1, n - 1, n_out - 1).astype(int), n)
+        selected = np.empty(n_out, dtype=int)
+        selected[0], selected[-1] = 0, n - 1
+        a = 0
+        for i in range(n_out - 2):
+            lo, hi = edges[i], edges[i + 1]
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+            area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+            a = lo + int(np.argmax(area))
+            selected[i + 1] = a
+        return x[selected], y[selected]
+    
+    def _line_data(self, ax, x, y):
+        """Données d'une courbe, sous-échantillonnées à la résolution de l'axe"""
+        return self._downsample_lttb(x, y, self._max_points(ax))
+    
+    def _plot_line(self, ax, x, y, **kwargs):
+        """Courbe dont le nombre de points est borné par la largeur de l'axe en pixels"""
+        x, y = self._line_data(ax, x, y)
+        return ax.plot(x, y, **kwargs)[0]
+    
+    def _bar_polygons(self, x, heights, bottom, colors, width=0.8, max_bars=None):
+        """Sommets et couleurs des barres: un rectangle par année, ou un polygone en
+        escalier par couleur quand les barres seraient plus fines qu'un pixel"""
+        x = np.asarray(x, dtype=np.float64)
+        bottom = np.asarray(bottom, dtype=np.float64)
+        top = bottom + np.asarray(heights, dtype=np.float64)
+        colors = np.broadcast_to(np.asarray(colors, dtype=object), x.shape)
+        
+        if max_bars is None or len(x) <= max_bars:
+            left, right = x - width / 2, x + width / 2
+            verts = np.stack([np.column_stack([left, bottom]), np.column_stack([left, top]),
+                              np.column_stack([right, top]), np.column_stack([right, bottom])], axis=1)
+            return verts, list(colors)
+        
+        # Moyenne par groupe de max_bars colonnes: le nombre de sommets reste borné
+        # par la résolution (les moyennes conservent l'empilement des catégories)
+        starts = np.linspace(0, len(x), max_bars, endpoint=False).astype(int)
+        counts = np.diff(np.append(starts, len(x)))
+        bin_mean = lambda v: np.add.reduceat(v, starts) / counts
+        edges = np.append(x[starts] - 0.5, x[-1] + 0.5)
+        xs = np.repeat(edges, 2)[1:-1]
+        verts, facecolors = [], []
+        for color in dict.fromkeys(colors):
+            mask = colors == color
+            upper = np.repeat(bin_mean(np.where(mask, top, bottom)), 2)
+            lower = np.repeat(bin_mean(bottom), 2)
+            verts.append(np.concatenate([np.column_stack([xs, upper]),
+                                         np.column_stack([xs[::-1], lower[::-1]])]))
+            facecolors.append(color)
+        return verts, facecolors
+    
+    def _plot_bars(self, ax, x, heights, bottom=0, color='#FF0000', width=0.8, **kwargs):
+        """Barres dessinées comme une seule collection (un artiste par série)"""
+        bottom = np.broadcast_to(np.asarray(bottom, dtype=np.float64), np.shape(x))
+        verts, facecolors = self._bar_polygons(x, heights, bottom, color, width,
+                                               max_bars=self._max_points(ax) // 2)
+        collection = PolyCollection(verts, facecolors=facecolors, edgecolors='none', **kwargs)
+        collection.sticky_edges.y.append(0)
+        ax.add_collection(collection)
+        ax.autoscale_view()
+        return collection
+    
+    def _plot_stacked_bars(self, ax, df, categories, colors, labels, width=0.8):
+        """Barres empilées: une collection par catégorie"""
+        years = df['Annee']
+        bottom = np.zeros(len(years))
+        for category, color, label in zip(categories, colors, labels):
+            self._plot_bars(ax, years, df[category], bottom=bottom, color=color,
+                            width=width, label=label)
+            bottom = bottom + df[category]
     
     def _plot_revenue_expenses(self, df, ax):
         """Plot de l'évolution des revenus et dépenses"""
-        ax.plot(df['Annee'], df['Revenus_Total'], label='Revenus Totaux', 
-               linewidth=2, color='#FF0000', alpha=0.8)
-        ax.plot(df['Annee'], df['Depenses_Total'], label='Dépenses Totales', 
-               linewidth=2, color='#FF6600', alpha=0.8)
+        df = self.series_store(df)
+        self._plot_line(ax, df['Annee'], df['Revenus_Total'], label='Revenus Totaux', 
+                        linewidth=2, color='#FF0000', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Depenses_Total'], label='Dépenses Totales', 
+                        linewidth=2, color='#FF6600', alpha=0.8)
         
         ax.set_title('Évolution des Revenus et Dépenses (M€)', 
                     fontsize=12, fontweight='bold')
@@ -832,33 +927,26 @@ class PSFinanceAnalyzer:
         ax.legend()
         ax.grid(True, alpha=0.3)
         
-        # Ajouter des annotations pour les événements clés
-        key_events = {1971: 'Congrès Epinay', 1981: 'Mitterrand', 1995: 'Chirac', 
-                     1997: 'Gauche Plurielle', 2002: 'Défaite Jospin', 
-                     2012: 'Hollande', 2017: 'Effondrement'}
-        
-        for year, event in key_events.items():
-            if year in df['Annee'].values:
-                y_val = df[df['Annee'] == year]['Revenus_Total'].values[0]
-                ax.annotate(event, (year, y_val), xytext=(10, 10), 
-                           textcoords='offset points', fontsize=8, 
-                           arrowprops=dict(arrowstyle='->', alpha=0.6))
+        # Annoter les ruptures et anomalies détectées sur les revenus (les événements
+        # connus puis les ruptures d'abord, nombre borné pour les longs horizons)
+        events = self.detect_events(df)
+        priority = sorted(events, key=lambda y: (y not in self.key_events, events[y] != 'rupture', y))
+        for year in sorted(priority[:self.max_annotations]):
+            event = self.key_events.get(year, f"{events[year].capitalize()} {year}")
+            y_val = df['Revenus_Total', year]
+            ax.annotate(event, (year, y_val), xytext=(10, 10), 
+                       textcoords='offset points', fontsize=8, 
+                       arrowprops=dict(arrowstyle='->', alpha=0.6))
     
     def _plot_revenue_structure(self, df, ax):
         """Plot de la structure des revenus"""
-        years = df['Annee']
-        width = 0.8
-        
-        bottom = np.zeros(len(years))
         categories = ['Cotisations_Adherents', 'Dons_Prives', 'Financement_Public', 
                      'Revenus_Evenements', 'Cotisations_Elus', 'Revenus_Formations']
         colors = ['#FF0000', '#FF6600', '#FF9999', '#CC0000', '#FF3333', '#990000']
         labels = ['Cotisations Adhérents', 'Dons Privés', 'Financement Public', 
                  'Événements', 'Cotisations Élus', 'Formations']
         
-        for i, category in enumerate(categories):
-            ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i])
-            bottom += df[category]
+        self._plot_stacked_bars(ax, df, categories, colors, labels)
         
         ax.set_title('Structure des Revenus (M€)', fontsize=12, fontweight='bold')
         ax.set_ylabel('Montants (M€)')
@@ -867,18 +955,12 @@ class PSFinanceAnalyzer:
     
     def _plot_expenses_structure(self, df, ax):
         """Plot de la structure des dépenses"""
-        years = df['Annee']
-        width = 0.8
-        
-        bottom = np.zeros(len(years))
         categories = ['Depenses_Personnel', 'Depenses_Campagnes', 'Depenses_Communication',
                      'Depenses_Fonctionnement', 'Depenses_Formation', 'Depenses_International']
         colors = ['#FF0000', '#FF6600', '#FF9999', '#CC0000', '#FF3333', '#990000']
         labels = ['Personnel', 'Campagnes', 'Communication', 'Fonctionnement', 'Formation', 'International']
         
-        for i, category in enumerate(categories):
-            ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i])
-            bottom += df[category]
+        self._plot_stacked_bars(ax, df, categories, colors, labels)
         
         ax.set_title('Structure des Dépenses (M€)', fontsize=12, fontweight='bold')
         ax.set_ylabel('Montants (M€)')
@@ -888,8 +970,8 @@ class PSFinanceAnalyzer:
     def _plot_membership_structure(self, df, ax):
         """Plot des adhérents et structure"""
         # Adhérents
-        ax.bar(df['Annee'], df['Adherents']/1000, label='Adhérents (milliers)', 
-              color='#FF0000', alpha=0.7)
+        self._plot_bars(ax, df['Annee'], df['Adherents']/1000, label='Adhérents (milliers)', 
+                        color='#FF0000', alpha=0.7)
         
         ax.set_title('Adhérents et Structure Territoriale', fontsize=12, fontweight='bold')
         ax.set_ylabel('Adhérents (milliers)', color='#FF0000')
@@ -898,8 +980,8 @@ class PSFinanceAnalyzer:
         
         # Fédérations en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Federations_Departementales'], label='Fédérations Départementales', 
-                linewidth=2, color='#FF6600')
+        self._plot_line(ax2, df['Annee'], df['Federations_Departementales'], label='Fédérations Départementales', 
+                        linewidth=2, color='#FF6600')
         ax2.set_ylabel('Fédérations Départementales', color='#FF6600')
         ax2.tick_params(axis='y', labelcolor='#FF6600')
         
@@ -910,14 +992,14 @@ class PSFinanceAnalyzer:
     
     def _plot_strategic_investments(self, df, ax):
         """Plot des investissements stratégiques"""
-        ax.plot(df['Annee'], df['Investissement_Communication'], label='Communication', 
-               linewidth=2, color='#FF0000', alpha=0.8)
-        ax.plot(df['Annee'], df['Investissement_Numérique'], label='Numérique', 
-               linewidth=2, color='#FF6600', alpha=0.8)
-        ax.plot(df['Annee'], df['Investissement_Formation'], label='Formation', 
-               linewidth=2, color='#FF9999', alpha=0.8)
-        ax.plot(df['Annee'], df['Investissement_Recherche'], label='Recherche', 
-               linewidth=2, color='#CC0000', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Investissement_Communication'], label='Communication', 
+                        linewidth=2, color='#FF0000', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Investissement_Numérique'], label='Numérique', 
+                        linewidth=2, color='#FF6600', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Investissement_Formation'], label='Formation', 
+                        linewidth=2, color='#FF9999', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Investissement_Recherche'], label='Recherche', 
+                        linewidth=2, color='#CC0000', alpha=0.8)
         
         ax.set_title('Investissements Stratégiques (M€)', fontsize=12, fontweight='bold')
         ax.set_ylabel('Montants (M€)')
@@ -927,8 +1009,8 @@ class PSFinanceAnalyzer:
     def _plot_financial_indicators(self, df, ax):
         """Plot des indicateurs financiers"""
         # Taux d'exécution budgétaire
-        ax.bar(df['Annee'], df['Taux_Execution_Budget']*100, label='Taux d\'Exécution (%)', 
-              color='#FF0000', alpha=0.7)
+        self._plot_bars(ax, df['Annee'], df['Taux_Execution_Budget']*100, label='Taux d\'Exécution (%)', 
+                        color='#FF0000', alpha=0.7)
         
         ax.set_title('Indicateurs Financiers', fontsize=12, fontweight='bold')
         ax.set_ylabel('Taux d\'Exécution (%)', color='#FF0000')
@@ -937,8 +1019,8 @@ class PSFinanceAnalyzer:
         
         # Dépendance financement public en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Dependance_Financement_Public']*100, label='Dépendance Financement Public (%)', 
-                linewidth=3, color='#FF6600')
+        self._plot_line(ax2, df['Annee'], df['Dependance_Financement_Public']*100, label='Dépendance Financement Public (%)', 
+                        linewidth=3, color='#FF6600')
         ax2.set_ylabel('Dépendance Financement Public (%)', color='#FF6600')
         ax2.tick_params(axis='y', labelcolor='#FF6600')
         
@@ -949,8 +1031,8 @@ class PSFinanceAnalyzer:
     
     def _plot_elected_officials(self, df, ax):
         """Plot de l'évolution des élus"""
-        ax.plot(df['Annee'], df['Elus_Locaux']/1000, label='Élus Locaux (milliers)', 
-               linewidth=2, color='#FF0000', alpha=0.8)
+        self._plot_line(ax, df['Annee'], df['Elus_Locaux']/1000, label='Élus Locaux (milliers)', 
+                        linewidth=2, color='#FF0000', alpha=0.8)
         
         ax.set_title('Évolution des Élus', fontsize=12, fontweight='bold')
         ax.set_ylabel('Élus Locaux (milliers)', color='#FF0000')
@@ -959,8 +1041,8 @@ class PSFinanceAnalyzer:
         
         # Élus nationaux en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Elus_Nationaux'], label='Élus Nationaux', 
-                linewidth=2, color='#FF6600', alpha=0.8)
+        self._plot_line(ax2, df['Annee'], df['Elus_Nationaux'], label='Élus Nationaux', 
+                        linewidth=2, color='#FF6600', alpha=0.8)
         ax2.set_ylabel('Élus Nationaux', color='#FF6600')
         ax2.tick_params(axis='y', labelcolor='#FF6600')
         
@@ -972,8 +1054,8 @@ class PSFinanceAnalyzer:
     def _plot_financial_situation(self, df, ax):
         """Plot de la situation financière"""
         # Solde financier
-        ax.bar(df['Annee'], df['Solde_Financier']*100, label='Solde Financier (% du budget)', 
-              color=df['Solde_Financier'].apply(lambda x: '#009900' if x > 0 else '#FF0000'), alpha=0.7)
+        self._plot_bars(ax, df['Annee'], df['Solde_Financier']*100, label='Solde Financier (% du budget)', 
+                        color=np.where(df['Solde_Financier'] > 0, '#009900', '#FF0000'), alpha=0.7)
         
         ax.set_title('Situation Financière', fontsize=12, fontweight='bold')
         ax.set_ylabel('Solde Financier (% du budget)', color='#FF0000')
@@ -982,8 +1064,8 @@ class PSFinanceAnalyzer:
         
         # Endettement en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Endettement'], label='Endettement (M€)', 
-                linewidth=3, color='#FF6600')
+        self._plot_line(ax2, df['Annee'], df['Endettement'], label='Endettement (M€)', 
+                        linewidth=3, color='#FF6600')
         ax2.set_ylabel('Endettement (M€)', color='#FF6600')
         ax2.tick_params(axis='y', labelcolor='#FF6600')
         
@@ -992,54 +1074,71 @@ class PSFinanceAnalyzer:
         lines2, labels2 = ax2.get_legend_handles_labels()
         ax.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
     
+    def compute_financial_metrics(self, df):
+        """Calcule les indicateurs clés rapportés par les insights (définis dans ps_bootstrap.METRICS)"""
+        from ps_bootstrap import METRICS, metric_value
+        
+        store = self.series_store(df)
+        return {name: metric_value(store, *spec) for name, spec in METRICS.items()}
+    
+    def bootstrap_metrics(self, df, n_boot=10000, alpha=0.05, block_size=3, seed=None):
+        """Intervalles de confiance bootstrap des indicateurs de compute_financial_metrics"""
+        from ps_bootstrap import PSBootstrap
+        
+        # Sans graine: entropie du système (le générateur global n'est pas consommé)
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        return PSBootstrap(n_boot=n_boot, alpha=alpha, block_size=block_size,
+                           seed=seed).intervals(df)
+    
     def _generate_financial_insights(self, df):
         """Génère des insights analytiques pour le PS"""
         print(f"🏛️ INSIGHTS ANALYTIQUES - {self.parti} ({self.start_year}-{self.end_year})")
         print("=" * 70)
+        store = self.series_store(df)
+        metrics = self.compute_financial_metrics(store)
+        intervals = self.bootstrap_metrics(store)
+        
+        def ic(key, fmt):
+            low, high = intervals.loc[key, ['Borne_Inf', 'Borne_Sup']]
+            return f" (IC 95%: {low:{fmt}} – {high:{fmt}})"
         
         # 1. Statistiques de base
         print("\n1. 📈 STATISTIQUES GÉNÉRALES:")
-        avg_revenue = df['Revenus_Total'].mean()
-        avg_expenses = df['Depenses_Total'].mean()
-        avg_adherents = df['Adherents'].mean()
-        avg_execution = df['Taux_Execution_Budget'].mean() * 100
-        
-        print(f"Revenus moyens annuels: {avg_revenue:.2f} M€")
-        print(f"Dépenses moyennes annuelles: {avg_expenses:.2f} M€")
-        print(f"Adhérents moyens: {avg_adherents:,.0f} personnes")
-        print(f"Taux d'exécution budgétaire moyen: {avg_execution:.1f}%")
+        print(f"Revenus moyens annuels: {metrics['revenus_moyens']:.2f} M€"
+              + ic('revenus_moyens', '.2f'))
+        print(f"Dépenses moyennes annuelles: {metrics['depenses_moyennes']:.2f} M€"
+              + ic('depenses_moyennes', '.2f'))
+        print(f"Adhérents moyens: {metrics['adherents_moyens']:,.0f} personnes"
+              + ic('adherents_moyens', ',.0f'))
+        print(f"Taux d'exécution budgétaire moyen: {metrics['taux_execution_moyen']:.1f}%"
+              + ic('taux_execution_moyen', '.1f'))
         
         # 2. Croissance historique
         print("\n2. 📊 ÉVOLUTION HISTORIQUE:")
-        revenue_growth = ((df['Revenus_Total'].iloc[-1] / 
-                          df['Revenus_Total'].iloc[0]) - 1) * 100
-        adherents_growth = ((df['Adherents'].iloc[-1] / 
-                           df['Adherents'].iloc[0]) - 1) * 100
-        
-        print(f"Évolution des revenus ({self.start_year}-{self.end_year}): {revenue_growth:.1f}%")
-        print(f"Évolution des adhérents ({self.start_year}-{self.end_year}): {adherents_growth:.1f}%")
+        print(f"Évolution des revenus ({self.start_year}-{self.end_year}): {metrics['evolution_revenus']:.1f}%"
+              + ic('evolution_revenus', '.1f'))
+        print(f"Évolution des adhérents ({self.start_year}-{self.end_year}): {metrics['evolution_adherents']:.1f}%"
+              + ic('evolution_adherents', '.1f'))
         
         # 3. Structure financière
         print("\n3. 📋 STRUCTURE FINANCIÈRE:")
-        membership_share = (df['Cotisations_Adherents'].mean() / df['Revenus_Total'].mean()) * 100
-        donations_share = (df['Dons_Prives'].mean() / df['Revenus_Total'].mean()) * 100
-        public_funding_share = (df['Financement_Public'].mean() / df['Revenus_Total'].mean()) * 100
-        elected_share = (df['Cotisations_Elus'].mean() / df['Revenus_Total'].mean()) * 100
-        
-        print(f"Part des cotisations adhérents: {membership_share:.1f}%")
-        print(f"Part des dons privés: {donations_share:.1f}%")
-        print(f"Part du financement public: {public_funding_share:.1f}%")
-        print(f"Part des cotisations élus: {elected_share:.1f}%")
+        print(f"Part des cotisations adhérents: {metrics['part_cotisations']:.1f}%"
+              + ic('part_cotisations', '.1f'))
+        print(f"Part des dons privés: {metrics['part_dons']:.1f}%" + ic('part_dons', '.1f'))
+        print(f"Part du financement public: {metrics['part_financement_public']:.1f}%"
+              + ic('part_financement_public', '.1f'))
+        print(f"Part des cotisations élus: {metrics['part_cotisations_elus']:.1f}%"
+              + ic('part_cotisations_elus', '.1f'))
         
         # 4. Performance et efficacité
         print("\n4. 🎯 PERFORMANCE FINANCIÈRE:")
-        avg_balance = df['Solde_Financier'].mean() * 100
-        last_debt = df['Endettement'].iloc[-1]
-        dependency_public = df['Dependance_Financement_Public'].iloc[-1] * 100
-        
-        print(f"Solde financier moyen: {avg_balance:.1f}% du budget")
-        print(f"Endettement final: {last_debt:.1f} M€")
-        print(f"Dépendance au financement public: {dependency_public:.1f}%")
+        print(f"Solde financier moyen: {metrics['solde_moyen']:.1f}% du budget"
+              + ic('solde_moyen', '.1f'))
+        print(f"Endettement final: {metrics['endettement_final']:.1f} M€"
+              + ic('endettement_final', '.1f'))
+        print(f"Dépendance au financement public: {metrics['dependance_financement_public']:.1f}%"
+              + ic('dependance_financement_public', '.1f'))
         
         # 5. Spécificités du PS
         print(f"\n5. 🌟 SPÉCIFICITÉS DU PARTI SOCIALISTE:")
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from ps_series import PSSeriesStore
+
+
+# Indicateurs des insights (définition unique, reprise par compute_financial_metrics)
+# et leur mode de rééchantillonnage:
+#   moyenne:    moyenne de la colonne × échelle
+#   part:       moyenne de la colonne / moyenne des revenus × 100 (années appariées)
+#   evolution:  rapport des valeurs extrêmes, chacune perturbée d'un résidu rééchantillonné
+#   final:      dernière valeur perturbée d'un résidu rééchantillonné
+# Les résidus (additifs, centrés) sont les écarts à une médiane glissante: ils mesurent
+# le bruit d'une année isolée, les séries pouvant changer de signe
+METRICS = {
+    'revenus_moyens': ('moyenne', 'Revenus_Total', 1),
+    'depenses_moyennes': ('moyenne', 'Depenses_Total', 1),
+    'adherents_moyens': ('moyenne', 'Adherents', 1),
+    'taux_execution_moyen': ('moyenne', 'Taux_Execution_Budget', 100),
+    'evolution_revenus': ('evolution', 'Revenus_Total', 100),
+    'evolution_adherents': ('evolution', 'Adherents', 100),
+    'part_cotisations': ('part', 'Cotisations_Adherents', 100),
+    'part_dons': ('part', 'Dons_Prives', 100),
+    'part_financement_public': ('part', 'Financement_Public', 100),
+    'part_cotisations_elus': ('part', 'Cotisations_Elus', 100),
+    'solde_moyen': ('moyenne', 'Solde_Financier', 100),
+    'endettement_final': ('final', 'Endettement', 1),
+    'dependance_financement_public': ('final', 'Dependance_Financement_Public', 100),
+}
+
+
+def metric_value(store, kind, column, scale):
+    """Valeur ponctuelle d'un indicateur de METRICS"""
+    x = store[column]
+    if kind == 'moyenne':
+        value = x.mean()
+    elif kind == 'part':
+        value = x.mean() / store['Revenus_Total'].mean()
+    elif kind == 'evolution':
+        value = x[-1] / x[0] - 1
+    else:
+        value = x[-1]
+    return value * scale
+
+
+def block_indices(rng, n_boot, n, block_size):
+    """Indices de rééchantillonnage par blocs mobiles, tirés en un seul lot (n_boot × n)"""
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n - block_size + 1, (n_boot, n_blocks))
+    return (starts[:, :, None] + np.arange(block_size)).reshape(n_boot, -1)[:, :n]
+
+
+class PSBootstrap:
+    """Intervalles de confiance bootstrap des indicateurs rapportés par les insights
+
+    Les indices des répliques sont tirés en un seul lot (blocs mobiles d'années,
+    pour respecter l'autocorrélation), puis chaque indicateur est une réduction
+    sur une matrice (réplique × année): aucune boucle Python sur les répliques.
+    """
+
+    def __init__(self, n_boot=10000, alpha=0.05, block_size=3, seed=None, smooth_window=5):
+        self.n_boot = n_boot
+        self.alpha = alpha
+        self.block_size = block_size
+        self.smooth_window = smooth_window
+        self.rng = np.random.default_rng(seed)
+
+    def _replicates(self, df):
+        """(réplique × indicateur) et estimations ponctuelles"""
+        store = PSSeriesStore.of(df)
+        n = len(store)
+        idx = block_indices(self.rng, self.n_boot, n, self.block_size)
+        # Résidus tirés pour la première et la dernière année de chaque réplique
+        residual_idx = self.rng.integers(0, n, (2, self.n_boot))
+
+        revenue = store['Revenus_Total']
+        revenue_boot = revenue[idx].mean(axis=1)
+        replicates = np.empty((self.n_boot, len(METRICS)))
+        estimates = np.empty(len(METRICS))
+        for k, (kind, column, scale) in enumerate(METRICS.values()):
+            x = store[column]
+            estimates[k] = metric_value(store, kind, column, scale)
+            if kind == 'moyenne':
+                replicates[:, k] = x[idx].mean(axis=1)
+            elif kind == 'part':
+                replicates[:, k] = x[idx].mean(axis=1) / revenue_boot
+            else:
+                trend = (pd.Series(x).rolling(self.smooth_window, center=True, min_periods=1)
+                         .median().to_numpy())
+                residual = x - trend
+                residual -= residual.mean()
+                last = x[-1] + residual[residual_idx[1]]
+                if kind == 'evolution':
+                    first = x[0] + residual[residual_idx[0]]
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        replicates[:, k] = last / first - 1
+                else:
+                    replicates[:, k] = last
+            replicates[:, k] *= scale
+        return replicates, estimates
+
+    def intervals(self, df):
+        """Estimation et bornes (1 - alpha) par indicateur, au format des insights"""
+        replicates, estimates = self._replicates(df)
+        low, high = np.nanquantile(replicates, [self.alpha / 2, 1 - self.alpha / 2], axis=0)
+        return pd.DataFrame({'Estimation': estimates, 'Borne_Inf': low, 'Borne_Sup': high},
+                            index=pd.Index(list(METRICS), name='Indicateur'))
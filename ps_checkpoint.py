@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def _hash(obj):
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _atomic_write(path, write):
+    """Écrit via un fichier temporaire puis le renomme (jamais de fichier à moitié écrit)"""
+    tmp = f"{path}.tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+class PSEnsembleJob:
+    """Génération d'ensemble longue avec points de reprise
+
+    Les scénarios sont générés par blocs; après chaque bloc, le job enregistre
+    dans son répertoire le bloc produit, les accumulateurs partiels (sommes par
+    année et colonne, un fichier par bloc) puis le manifeste: graine, prochain
+    scénario (position dans le flux de graines par scénario), blocs terminés,
+    fichier des accumulateurs et empreintes de la configuration et des tables de
+    régimes. Seul le manifeste fait foi: une interruption avant son écriture
+    laisse l'état du bloc précédent intact. Relancé sur le même répertoire, le job
+    reprend au premier scénario non terminé; les graines étant dérivées par
+    scénario et les accumulateurs sommés dans le même ordre, le résultat est
+    identique au bit près à celui d'une exécution sans interruption.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, analyzer, path, n_scenarios, seed=None, chunk_size=100):
+        self.analyzer = analyzer
+        self.path = path
+        self.n_scenarios = n_scenarios
+        self.chunk_size = chunk_size
+        os.makedirs(path, exist_ok=True)
+
+        hashes = self._hashes()
+        manifest = self._load_manifest()
+        if manifest is None:
+            if seed is None:
+                seed = np.random.SeedSequence().entropy
+            manifest = {'seed': str(seed), 'n_scenarios': n_scenarios, 'next_scenario': 0,
+                        'chunks': [], 'accumulateurs': None, 'hashes': hashes}
+        else:
+            if seed is not None and str(seed) != manifest['seed']:
+                raise ValueError(f"Graine {seed} différente de celle du job ({manifest['seed']})")
+            if n_scenarios != manifest['n_scenarios']:
+                raise ValueError(f"Le job a été lancé pour {manifest['n_scenarios']} scénarios")
+            changed = [k for k, v in hashes.items() if manifest['hashes'].get(k) != v]
+            if changed:
+                raise ValueError(f"Configuration modifiée depuis le début du job: {changed}")
+        self.manifest = manifest
+        self.seed = int(manifest['seed'])
+        self.accumulators = self._load_accumulators()
+
+    def _hashes(self):
+        analyzer = self.analyzer
+        return {
+            'config': _hash(analyzer.config),
+            'horizon': _hash([analyzer.start_year, analyzer.end_year, analyzer.microsim_agents]),
+            'growth_regimes': _hash(analyzer.growth_regimes),
+            'debt_regime': _hash(analyzer.debt_regime),
+            'party_events': _hash(analyzer.party_events),
+        }
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _load_manifest(self):
+        if not os.path.exists(self._file(self.MANIFEST)):
+            return None
+        with open(self._file(self.MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+
+    def _load_accumulators(self):
+        if self.manifest['accumulateurs'] is None:
+            return None
+        with np.load(self._file(self.manifest['accumulateurs'])) as data:
+            return {name: data[name] for name in data.files}
+
+    @property
+    def done(self):
+        return self.manifest['next_scenario'] >= self.n_scenarios
+
+    def _accumulate(self, df):
+        values = df.drop(columns='Annee').to_numpy(dtype=np.float64)
+        if self.accumulators is None:
+            self.accumulators = {'somme': np.zeros_like(values), 'somme_carres': np.zeros_like(values),
+                                 'n': np.zeros(1)}
+        self.accumulators['somme'] += values
+        self.accumulators['somme_carres'] += values ** 2
+        self.accumulators['n'] += 1
+
+    def _checkpoint(self, start, stop, frames):
+        """Persiste un bloc terminé: données, accumulateurs, puis manifeste (dans cet ordre)
+
+        Les accumulateurs sont écrits dans un nouveau fichier par bloc: tant que le
+        manifeste n'est pas remplacé, il désigne toujours ceux du bloc précédent.
+        """
+        name = f"bloc_{start:08d}_{stop:08d}.pkl"
+        chunk = pd.concat(frames, ignore_index=True)
+        _atomic_write(self._file(name), chunk.to_pickle)
+
+        accumulators = f"accum_{stop:08d}.npz"
+
+        def save_accumulators(tmp):
+            with open(tmp, 'wb') as f:
+                np.savez(f, **self.accumulators)
+        _atomic_write(self._file(accumulators), save_accumulators)
+
+        previous = self.manifest['accumulateurs']
+        self.manifest['chunks'].append([start, stop, name])
+        self.manifest['next_scenario'] = stop
+        self.manifest['accumulateurs'] = accumulators
+
+        def save_manifest(tmp):
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, indent=2)
+        _atomic_write(self._file(self.MANIFEST), save_manifest)
+        if previous is not None:
+            os.remove(self._file(previous))
+
+    def run(self, max_chunks=None, verbose=True):
+        """Génère les blocs restants (au plus max_chunks); renvoie True si le job est terminé"""
+        start = self.manifest['next_scenario']
+        if verbose and start:
+            print(f"🔁 Reprise du job à partir du scénario {start}/{self.n_scenarios}")
+        chunks = 0
+        while start < self.n_scenarios and (max_chunks is None or chunks < max_chunks):
+            stop = min(start + self.chunk_size, self.n_scenarios)
+            frames = []
+            for scenario, df in self.analyzer.iter_scenarios(stop, seed=self.seed, start=start):
+                self._accumulate(df)
+                df.insert(0, 'Scenario', scenario)
+                frames.append(df)
+            self._checkpoint(start, stop, frames)
+            if verbose:
+                print(f"💾 Scénarios {start}-{stop - 1} enregistrés ({stop}/{self.n_scenarios})")
+            start = stop
+            chunks += 1
+        return self.done
+
+    def result(self):
+        """Ensemble complet au format long (identique à generate_ensemble avec la même graine)"""
+        frames = [pd.read_pickle(self._file(name)) for _, _, name in self.manifest['chunks']]
+        return pd.concat(frames, ignore_index=True)
+
+    def summary(self):
+        """Moyenne et écart-type par année et colonne, à partir des accumulateurs"""
+        first = pd.read_pickle(self._file(self.manifest['chunks'][0][2]))
+        columns = [c for c in first.columns if c not in ('Scenario', 'Annee')]
+        years = first['Annee'].to_numpy()[:self.accumulators['somme'].shape[0]]
+        n = self.accumulators['n'][0]
+        mean = self.accumulators['somme'] / n
+        std = np.sqrt(np.maximum(self.accumulators['somme_carres'] / n - mean ** 2, 0))
+        frame = pd.concat([pd.DataFrame(mean, columns=columns).add_suffix('_Moyenne'),
+                           pd.DataFrame(std, columns=columns).add_suffix('_Ecart_Type')], axis=1)
+        frame.insert(0, 'Annee', years)
+        return frame
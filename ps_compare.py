@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+from ps_kernels import ks_sorted
+from ps_memory import parse_memory
+from ps_series import PSSeriesStore
+
+
+def sorted_quantiles(values, quantiles):
+    """Quantiles (interpolation linéaire, comme np.quantile) d'échantillons déjà triés sur le dernier axe"""
+    position = np.asarray(quantiles) * (values.shape[-1] - 1)
+    low = np.floor(position).astype(np.int64)
+    high = np.minimum(low + 1, values.shape[-1] - 1)
+    fraction = position - low
+    return values[..., low] * (1 - fraction) + values[..., high] * fraction
+
+
+class PSScenarioComparison:
+    """Comparaison d'une exécution de référence à N variantes (jeux simples ou ensembles)
+
+    Chaque jeu est converti en tableau (scénario × année × colonne); les variantes
+    ayant le même nombre de scénarios sont empilées et traitées par lots dont la
+    taille respecte max_memory. Pour chaque (variante, année, colonne) en une passe:
+    écart absolu et relatif des moyennes, distance KS et décalage des quantiles
+    entre distributions de scénarios (dégénérés pour des jeux à un scénario).
+    """
+
+    def __init__(self, baseline, variants, quantiles=(0.05, 0.5, 0.95), max_memory='256MB'):
+        if isinstance(variants, pd.DataFrame):
+            variants = [variants]
+        if not isinstance(variants, dict):
+            variants = {f'variante_{k}': v for k, v in enumerate(variants)}
+        self.names = list(variants)
+        self.quantiles = np.asarray(quantiles, dtype=np.float64)
+        self.max_memory = parse_memory(max_memory)
+
+        base = PSSeriesStore.of(baseline)
+        stores = [PSSeriesStore.of(df) for df in variants.values()]
+        self.years = base.years
+        # Colonnes communes (ordre de la référence)
+        common = set(base.columns).intersection(*(set(s.columns) for s in stores))
+        self.columns = [c for c in base.columns if c in common]
+        self.base = base.array(self.columns)
+        samples = []
+        for name, store in zip(self.names, stores):
+            if not np.array_equal(store.years, self.years):
+                raise ValueError(f"Les années de la variante {name!r} diffèrent de la référence")
+            samples.append(store.array(self.columns))
+
+        n_variants = len(self.names)
+        shape = (n_variants, len(self.years), len(self.columns))
+        self.base_mean = self.base.mean(axis=0)
+        # Scénarios triés sur le dernier axe: KS et quantiles sans nouveau tri de la référence
+        self.base_sorted = np.sort(np.moveaxis(self.base, 0, -1), axis=-1)
+        self.base_quantiles = np.moveaxis(sorted_quantiles(self.base_sorted, self.quantiles), -1, 0)
+        self.mean = np.empty(shape)
+        self.ks = np.empty(shape)
+        self.variant_quantiles = np.empty((n_variants,) + self.base_quantiles.shape)
+        self._compute(samples)
+
+        self.delta = self.mean - self.base_mean
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.relative = self.delta / np.abs(self.base_mean)
+        self.quantile_shift = self.variant_quantiles - self.base_quantiles
+
+    def _batches(self, samples):
+        """Indices des variantes groupées par nombre de scénarios, par lots bornés en mémoire"""
+        groups = {}
+        for k, values in enumerate(samples):
+            groups.setdefault(values.shape[0], []).append(k)
+        for n_scenarios, members in groups.items():
+            # Copie empilée, copie triée et fusion KS (référence + variante): ~4 tableaux par variante
+            per_variant = 4 * 8 * (n_scenarios + self.base.shape[0]) * self.base[0].size
+            size = max(1, int(self.max_memory // per_variant))
+            for start in range(0, len(members), size):
+                yield members[start:start + size]
+
+    def _compute(self, samples):
+        for batch in self._batches(samples):
+            stacked = np.stack([samples[k] for k in batch])
+            self.mean[batch] = stacked.mean(axis=1)
+            ordered = np.sort(np.moveaxis(stacked, 1, -1), axis=-1)
+            self.ks[batch] = ks_sorted(self.base_sorted, ordered)
+            self.variant_quantiles[batch] = np.moveaxis(
+                sorted_quantiles(ordered, self.quantiles), -1, 1)
+
+    def _quantile_label(self, q):
+        return f"Decalage_Q{100 * q:g}"
+
+    def frame(self):
+        """Format long: une ligne par (variante, année, colonne)"""
+        n_variants, n_years, n_columns = self.delta.shape
+        size = n_variants * n_years * n_columns
+        frame = pd.DataFrame({
+            'Variante': np.repeat(np.asarray(self.names, dtype=object), n_years * n_columns),
+            'Annee': np.tile(np.repeat(self.years, n_columns), n_variants),
+            'Colonne': np.tile(np.asarray(self.columns, dtype=object), n_variants * n_years),
+            'Reference': np.broadcast_to(self.base_mean, self.mean.shape).reshape(size),
+            'Valeur': self.mean.reshape(size),
+            'Ecart': self.delta.reshape(size),
+            'Ecart_Relatif': self.relative.reshape(size),
+            'KS': self.ks.reshape(size),
+        })
+        for k, q in enumerate(self.quantiles):
+            frame[self._quantile_label(q)] = self.quantile_shift[:, k].reshape(size)
+        return frame
+
+    def _measure(self, by):
+        measures = {'Ecart': self.delta, 'Ecart_Relatif': self.relative, 'KS': self.ks}
+        measures.update({self._quantile_label(q): self.quantile_shift[:, k]
+                         for k, q in enumerate(self.quantiles)})
+        if by not in measures:
+            raise ValueError(f"Critère inconnu: {by} (choix: {', '.join(measures)})")
+        return np.abs(measures[by])
+
+    def ranking(self, n=20, by='Ecart_Relatif'):
+        """Plus fortes divergences: une ligne par (variante, colonne), à l'année du maximum"""
+        measure = self._measure(by)
+        measure = np.where(np.isfinite(measure), measure, -np.inf)
+        t = measure.argmax(axis=1)
+        v, c = np.indices(t.shape)
+        score = measure[v, t, c].ravel()
+        order = np.argsort(-score, kind='stable')[:n]
+        v, t, c = v.ravel()[order], t.ravel()[order], c.ravel()[order]
+        frame = pd.DataFrame({
+            'Variante': np.asarray(self.names, dtype=object)[v],
+            'Colonne': np.asarray(self.columns, dtype=object)[c],
+            'Annee': self.years[t],
+            'Reference': self.base_mean[t, c],
+            'Valeur': self.mean[v, t, c],
+            'Ecart': self.delta[v, t, c],
+            'Ecart_Relatif': self.relative[v, t, c],
+            'KS': self.ks[v, t, c],
+        })
+        return frame[np.isfinite(score[order])].reset_index(drop=True)
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from ps_series import PSSeriesStore
+
+
+class PSCycleIndex:
+    """Index précalculé des cycles électoraux (présidentiel, législatif, municipal)
+
+    Pour chaque année: identifiant de cycle (0 = période avant la première élection
+    de la série) et position dans le cycle (0 = année d'élection). Les réductions
+    travaillent sur l'ensemble complet (scénario × année × colonne) en une passe.
+    """
+
+    KINDS = ('presidentiel', 'legislatif', 'municipal')
+
+    def __init__(self, analyzer, years=None):
+        if years is None:
+            years = np.arange(analyzer.start_year, analyzer.end_year + 1)
+        self.years = np.asarray(years)
+        self.elections = {
+            'presidentiel': np.asarray(sorted(analyzer.presidential_years)),
+            'legislatif': np.asarray(sorted(analyzer.legislative_years)),
+            'municipal': np.asarray(sorted(analyzer.municipal_years)),
+        }
+        self.cycle_id = {}
+        self.position = {}
+        self.cycle_start = {}
+        for kind, elections in self.elections.items():
+            ids = np.searchsorted(elections, self.years, side='right')
+            starts = np.concatenate([[self.years[0]], elections])[ids]
+            self.cycle_id[kind] = ids
+            self.position[kind] = self.years - starts
+            # Indices (dans self.years) du début de chaque cycle présent dans la série
+            self.cycle_start[kind] = np.flatnonzero(np.diff(ids, prepend=-1) != 0)
+
+    def frame(self):
+        """Table année → cycle et position pour chaque type d'élection"""
+        data = {'Annee': self.years}
+        for kind in self.KINDS:
+            data[f'Cycle_{kind}'] = self.cycle_id[kind]
+            data[f'Position_{kind}'] = self.position[kind]
+        return pd.DataFrame(data)
+
+    def _values(self, data):
+        store = PSSeriesStore.of(data)
+        if not np.array_equal(store.years, self.years):
+            raise ValueError("Les années de l'ensemble ne correspondent pas à l'index des cycles")
+        return store.array(), store.columns, store.entities
+
+    def _long_frame(self, array, scenarios, labels, columns, label_name):
+        """(scénario × k × colonne) → DataFrame long"""
+        n_scenarios, n_k, _ = array.shape
+        frame = pd.DataFrame(array.reshape(n_scenarios * n_k, -1), columns=columns)
+        frame.insert(0, label_name, np.tile(labels, n_scenarios))
+        frame.insert(0, 'Scenario', np.repeat(scenarios, n_k))
+        return frame
+
+    def _reduce(self, values, kind, how):
+        """Somme (ou moyenne) par cycle: les cycles sont contigus, une seule passe reduceat"""
+        starts = self.cycle_start[kind]
+        totals = np.add.reduceat(values, starts, axis=1)
+        if how == 'mean':
+            lengths = np.diff(np.append(starts, len(self.years)))
+            totals = totals / lengths[None, :, None]
+        return totals
+
+    def cycle_totals(self, data, kind='presidentiel', how='sum'):
+        """Totaux (ou moyennes) par cycle, scénario et colonne"""
+        values, columns, scenarios = self._values(data)
+        totals = self._reduce(values, kind, how)
+        labels = self.years[self.cycle_start[kind]]
+        return self._long_frame(totals, scenarios, labels, columns, 'Debut_Cycle')
+
+    def election_deltas(self, data, kind='presidentiel'):
+        """Variations pré-électorales (N-1 → N) et post-électorales (N → N+1)"""
+        values, columns, scenarios = self._values(data)
+        # Élections ayant une année avant et après dans la série
+        rows = np.flatnonzero(np.isin(self.years, self.elections[kind]))
+        rows = rows[(rows > 0) & (rows < len(self.years) - 1)]
+        elections = self.years[rows]
+        pre = values[:, rows, :] - values[:, rows - 1, :]
+        post = values[:, rows + 1, :] - values[:, rows, :]
+        pre_frame = self._long_frame(pre, scenarios, elections, columns, 'Election')
+        post_frame = self._long_frame(post, scenarios, elections, columns, 'Election')
+        pre_frame.insert(2, 'Phase', 'pre')
+        post_frame.insert(2, 'Phase', 'post')
+        return pd.concat([pre_frame, post_frame], ignore_index=True)
+
+    def cycle_growth(self, data, kind='presidentiel', how='mean'):
+        """Croissance d'un cycle au suivant (sur les moyennes par cycle par défaut)"""
+        values, columns, scenarios = self._values(data)
+        totals = self._reduce(values, kind, how)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = totals[:, 1:, :] / totals[:, :-1, :] - 1
+        labels = self.years[self.cycle_start[kind][1:]]
+        return self._long_frame(growth, scenarios, labels, columns, 'Debut_Cycle')
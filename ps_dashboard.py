@@ -0,0 +1,196 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib import animation
+
+from ps_series import PSSeriesStore
+
+
+# Pour chaque panneau de _build_figure: courbes et barres de l'axe principal
+# (colonne, facteur d'échelle), barres empilées et courbes de l'axe secondaire
+_PANELS = [
+    {'lines': [('Revenus_Total', 1), ('Depenses_Total', 1)], 'annotate': 'Revenus_Total'},
+    {'stack': ['Cotisations_Adherents', 'Dons_Prives', 'Financement_Public',
+               'Revenus_Evenements', 'Cotisations_Elus', 'Revenus_Formations']},
+    {'stack': ['Depenses_Personnel', 'Depenses_Campagnes', 'Depenses_Communication',
+               'Depenses_Fonctionnement', 'Depenses_Formation', 'Depenses_International']},
+    {'bars': ('Adherents', 1/1000), 'twin_lines': [('Federations_Departementales', 1)]},
+    {'lines': [('Investissement_Communication', 1), ('Investissement_Numérique', 1),
+               ('Investissement_Formation', 1), ('Investissement_Recherche', 1)]},
+    {'bars': ('Taux_Execution_Budget', 100), 'twin_lines': [('Dependance_Financement_Public', 100)]},
+    {'lines': [('Elus_Locaux', 1/1000)], 'twin_lines': [('Elus_Nationaux', 1)]},
+    {'bars': ('Solde_Financier', 100), 'signed': True, 'twin_lines': [('Endettement', 1)]},
+]
+
+
+class PSDashboard:
+    """Tableau de bord persistant: les artistes sont créés une fois puis modifiés en place"""
+
+    def __init__(self, analyzer, df):
+        self.analyzer = analyzer
+        df = PSSeriesStore.of(df)
+        self.fig, self.axes = analyzer._build_figure(df)
+        self.years = df.years
+        self.twins = [self._find_twin(ax) for ax in self.axes]
+        self._background = None
+        self._limits = None
+        self._draw()
+
+    def _find_twin(self, ax):
+        for other in self.fig.axes:
+            if other is not ax and ax.get_shared_x_axes().joined(ax, other):
+                return other
+        return None
+
+    def _artists(self):
+        """Artistes modifiés par update() (lignes, collections de barres, annotations)"""
+        artists = []
+        for ax, twin in zip(self.axes, self.twins):
+            for axis in (ax, twin):
+                if axis is None:
+                    continue
+                artists.extend(axis.lines)
+                artists.extend(axis.collections)
+                artists.extend(axis.texts)
+        return artists
+
+    def _current_limits(self):
+        return [axis.get_ylim() for axis in self.fig.axes]
+
+    def _draw(self):
+        """Rendu complet et capture du fond pour le blitting"""
+        canvas = self.fig.canvas
+        artists = self._artists()
+        for artist in artists:
+            artist.set_animated(False)
+        canvas.draw()
+        if canvas.supports_blit:
+            for artist in artists:
+                artist.set_animated(True)
+            canvas.draw()
+            self._background = canvas.copy_from_bbox(self.fig.bbox)
+            # Les artistes animés sont exclus de draw(): les retracer sur le fond
+            # pour que le tampon (frame(), frames()) contienne les données
+            for artist in artists:
+                self.fig.draw_artist(artist)
+            canvas.blit(self.fig.bbox)
+        self._limits = self._current_limits()
+
+    def _update_panel(self, spec, ax, twin, df):
+        # df est le store indexé par année construit par _apply
+        # Étendue des données par axe, calculée au passage (relim() est coûteux sur les barres)
+        ranges = {ax: [], twin: []}
+
+        for line, (column, scale) in zip(ax.lines, spec.get('lines', [])):
+            values = df[column] * scale
+            line.set_data(*self.analyzer._line_data(ax, self.years, values))
+            ranges[ax].append(values)
+
+        if 'stack' in spec:
+            bottom = np.zeros(len(self.years))
+            for collection, column in zip(ax.collections, spec['stack']):
+                values = df[column]
+                self._set_bars(ax, collection, values, bottom)
+                ranges[ax].append(bottom)
+                bottom = bottom + values
+                ranges[ax].append(bottom)
+
+        if 'bars' in spec:
+            column, scale = spec['bars']
+            values = df[column] * scale
+            colors = np.where(values > 0, '#009900', '#FF0000') if spec.get('signed') else None
+            self._set_bars(ax, ax.collections[0], values, 0, colors)
+            ranges[ax].extend([values, np.zeros(1)])
+
+        if twin is not None:
+            for line, (column, scale) in zip(twin.lines, spec.get('twin_lines', [])):
+                values = df[column] * scale
+                line.set_data(*self.analyzer._line_data(twin, self.years, values))
+                ranges[twin].append(values)
+
+        if 'annotate' in spec:
+            for annotation in ax.texts:
+                year = annotation.xy[0]
+                if df.has_year(year):
+                    annotation.xy = (year, df.value(spec['annotate'], year))
+
+        for axis, arrays in ranges.items():
+            if axis is not None and arrays:
+                data = np.concatenate(arrays)
+                self._fit_limits(axis, np.nanmin(data), np.nanmax(data))
+
+    def _set_bars(self, ax, collection, heights, bottom, colors=None):
+        """Remplace les sommets (et éventuellement les couleurs) d'une collection de barres"""
+        bottom = np.broadcast_to(np.asarray(bottom, dtype=np.float64), self.years.shape)
+        verts, facecolors = self.analyzer._bar_polygons(
+            self.years, heights, bottom, colors if colors is not None else '',
+            max_bars=self.analyzer._max_points(ax) // 2)
+        collection.set_verts(verts)
+        if colors is not None:
+            collection.set_facecolor(facecolors)
+
+    def _fit_limits(self, axis, low, high, margin=0.10):
+        """Élargit l'échelle verticale seulement si les données en sortent (préserve le blitting)"""
+        current_low, current_high = axis.get_ylim()
+        if current_low <= low and high <= current_high:
+            return
+        low, high = min(low, current_low), max(high, current_high)
+        pad = (high - low) * margin
+        axis.set_ylim(low - pad if low < current_low else low,
+                      high + pad if high > current_high else high)
+
+    def _apply(self, df):
+        """Modifie les artistes sans déclencher de rendu"""
+        df = PSSeriesStore.of(df)
+        if not np.array_equal(df.years, self.years):
+            raise ValueError("Les années doivent être identiques à celles du tableau de bord initial")
+
+        for spec, ax, twin in zip(_PANELS, self.axes, self.twins):
+            self._update_panel(spec, ax, twin, df)
+        return self._artists()
+
+    def update(self, df):
+        """Met à jour toutes les données en place; blitting si les échelles sont inchangées"""
+        self._apply(df)
+
+        canvas = self.fig.canvas
+        if self._background is not None and self._current_limits() == self._limits:
+            canvas.restore_region(self._background)
+            for artist in self._artists():
+                self.fig.draw_artist(artist)
+            canvas.blit(self.fig.bbox)
+            canvas.flush_events()
+        else:
+            # Les échelles (y compris des axes secondaires) ont changé: rendu complet
+            self._draw()
+        return self._artists()
+
+    def frame(self):
+        """Image RGBA courante (copie du tampon Agg, sans nouveau rendu)"""
+        return np.asarray(self.fig.canvas.buffer_rgba()).copy()
+
+    def frames(self, datasets):
+        """Génère une image par jeu de données (animation de scénarios)"""
+        for df in datasets:
+            self.update(df)
+            yield self.frame()
+
+    def animate(self, datasets, interval=200):
+        """Animation matplotlib réutilisant les mêmes artistes"""
+        datasets = list(datasets)
+        for artist in self._artists():
+            artist.set_animated(False)
+        self._background = None
+        return animation.FuncAnimation(self.fig, self._apply, frames=datasets,
+                                       interval=interval, blit=False, repeat=False)
+
+    def save_animation(self, datasets, path, fps=5, dpi=100):
+        """Exporte l'animation des scénarios (gif via Pillow, sinon writer par défaut)"""
+        anim = self.animate(datasets, interval=1000 // fps)
+        writer = animation.PillowWriter(fps=fps) if path.endswith('.gif') else None
+        if writer is None:
+            anim.save(path, fps=fps, dpi=dpi)
+        else:
+            anim.save(path, writer=writer, dpi=dpi)
+
+    def close(self):
+        plt.close(self.fig)
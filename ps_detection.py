@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from scipy.ndimage import rank_filter
+
+from ps_series import PSSeriesStore
+
+
+def _robust_sigma(x, axis=-1):
+    """Écart-type robuste (MAD) le long de l'axe"""
+    med = np.median(x, axis=axis, keepdims=True)
+    return 1.4826 * np.median(np.abs(x - med), axis=axis)
+
+
+def change_points(series, max_breaks=4, min_size=2, penalty=None):
+    """Ruptures de niveau par segmentation binaire vectorisée
+
+    `series` est une matrice (n_series × n_annees). À chaque itération, le meilleur
+    point de coupure de chaque série est cherché simultanément dans tous ses
+    segments via des sommes cumulées par segment; la coupure est retenue si le gain
+    en somme des carrés dépasse penalty × sigma² (sigma estimé par MAD des
+    différences premières, robuste aux ruptures elles-mêmes).
+    Renvoie un tableau booléen (n_series × n_annees): True l'année où commence un
+    nouveau régime.
+    """
+    x = np.asarray(series, dtype=np.float64)
+    n_series, n = x.shape
+    if penalty is None:
+        penalty = 3 * np.log(n)
+    sigma2 = (_robust_sigma(np.diff(x, axis=1)) / np.sqrt(2)) ** 2
+    sigma2 = np.where(sigma2 > 0, sigma2, np.var(x, axis=1) + 1e-12)
+
+    cum = np.concatenate([np.zeros((n_series, 1)), np.cumsum(x, axis=1)], axis=1)
+    positions = np.arange(n + 1)
+    # breaks[:, k] = True si un segment commence à l'indice k (0 et n toujours vrais)
+    breaks = np.zeros((n_series, n + 1), dtype=bool)
+    breaks[:, 0] = breaks[:, n] = True
+
+    rows = np.arange(n_series)
+    for _ in range(max_breaks):
+        # Seules les séries encore segmentées à l'itération précédente sont recalculées
+        brk = breaks[rows]
+        c = cum[rows]
+        # Début (a) et fin (b) du segment qui contient chaque coupure candidate k
+        a = np.maximum.accumulate(np.where(brk, positions, 0), axis=1)
+        b = np.minimum.accumulate(np.where(brk, positions, n)[:, ::-1], axis=1)[:, ::-1]
+        a = np.concatenate([a[:, :1], a[:, :-1]], axis=1)  # segment à gauche de k
+        n1 = (positions - a).astype(np.float64)
+        n2 = (b - positions).astype(np.float64)
+        s1 = c - np.take_along_axis(c, a, axis=1)
+        s2 = np.take_along_axis(c, b, axis=1) - c
+        valid = (n1 >= min_size) & (n2 >= min_size) & ~brk
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gain = s1 ** 2 / n1 + s2 ** 2 / n2 - (s1 + s2) ** 2 / (n1 + n2)
+        gain = np.where(valid, gain, -np.inf)
+
+        best = np.argmax(gain, axis=1)
+        best_gain = gain[np.arange(len(rows)), best]
+        accept = best_gain > penalty * sigma2[rows]
+        if not accept.any():
+            break
+        breaks[rows[accept], best[accept]] = True
+        rows = rows[accept]
+
+    result = breaks[:, :n].copy()
+    result[:, 0] = False
+    return result
+
+
+def _neighbour_median(x, window):
+    """Médiane glissante des voisins, valeur centrale exclue (filtres de rang scipy en C)
+
+    Exclure le centre évite que le résidu soit exactement nul chaque fois que la
+    valeur est la médiane de sa fenêtre, ce qui écrase l'échelle MAD vers zéro.
+    """
+    footprint = np.ones((1, window), dtype=bool)
+    footprint[0, window // 2] = False
+    k = window - 1
+    if k % 2:
+        return rank_filter(x, k // 2, footprint=footprint, mode='nearest')
+    return 0.5 * (rank_filter(x, k // 2 - 1, footprint=footprint, mode='nearest')
+                  + rank_filter(x, k // 2, footprint=footprint, mode='nearest'))
+
+
+def anomalies(series, window=5, threshold=3.5):
+    """Valeurs aberrantes: écart robuste à la médiane glissante des voisins
+
+    Le résidu x - médiane(voisins) a une loi continue et sigma est l'écart MAD de ce
+    résidu par série: ≈ 0.05 % de dépassements de 3.5 sigma sur un long bruit gaussien
+    (un peu plus sur une trentaine d'années, sigma étant alors estimé sur peu de points).
+    """
+    x = np.asarray(series, dtype=np.float64)
+    residual = x - _neighbour_median(x, window)
+    sigma = _robust_sigma(residual)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = residual / sigma[:, None]
+    return np.abs(np.nan_to_num(z)) > threshold
+
+
+class PSBreakDetector:
+    """Détection groupée des ruptures et anomalies sur toutes les colonnes et scénarios"""
+
+    def __init__(self, max_breaks=4, min_size=2, penalty=None, window=5, threshold=3.5,
+                 chunk_size=200000):
+        self.max_breaks = max_breaks
+        self.min_size = min_size
+        self.penalty = penalty
+        self.window = window
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+
+    def detect_array(self, series):
+        """(n_series × n_annees) → (ruptures, anomalies), traitées par blocs de séries"""
+        series = np.asarray(series, dtype=np.float64)
+        breaks = np.zeros(series.shape, dtype=bool)
+        outliers = np.zeros(series.shape, dtype=bool)
+        for start in range(0, len(series), self.chunk_size):
+            block = series[start:start + self.chunk_size]
+            breaks[start:start + len(block)] = change_points(
+                block, self.max_breaks, self.min_size, self.penalty)
+            outliers[start:start + len(block)] = anomalies(block, self.window, self.threshold)
+        return breaks, outliers
+
+    def detect(self, data, columns=None):
+        """Ruptures et anomalies au format long: Scenario, Colonne, Annee, Type"""
+        store = PSSeriesStore.of(data)
+        columns = columns or store.columns
+        values = store.array(columns)
+        years, scenarios = store.years, store.entities
+        n_scenarios, n_years, n_columns = values.shape
+
+        # Une série par (scénario, colonne)
+        series = values.transpose(0, 2, 1).reshape(n_scenarios * n_columns, n_years)
+        breaks, outliers = self.detect_array(series)
+
+        frames = []
+        for kind, mask in (('rupture', breaks), ('anomalie', outliers)):
+            rows, cols = np.nonzero(mask)
+            frames.append(pd.DataFrame({
+                'Scenario': np.asarray(scenarios)[rows // n_columns],
+                'Colonne': np.asarray(columns, dtype=object)[rows % n_columns],
+                'Annee': years[cols],
+                'Type': kind,
+            }))
+        return pd.concat(frames, ignore_index=True)
+
+    def events(self, df, column='Revenus_Total'):
+        """Ruptures et anomalies d'une colonne (scénario unique): {année: type}"""
+        store = PSSeriesStore.of(df)
+        breaks, outliers = self.detect_array(store[column][None, :])
+        years = store.years
+        found = {int(y): 'anomalie' for y in years[outliers[0]]}
+        found.update({int(y): 'rupture' for y in years[breaks[0]]})
+        return dict(sorted(found.items()))
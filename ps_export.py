@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+from openpyxl import Workbook
+
+
+# Feuilles du classeur: nom -> colonnes du DataFrame généré
+SHEETS = {
+    'Revenus': ['Revenus_Total', 'Cotisations_Adherents', 'Dons_Prives', 'Financement_Public',
+                'Revenus_Evenements', 'Cotisations_Elus', 'Revenus_Formations'],
+    'Depenses': ['Depenses_Total', 'Depenses_Personnel', 'Depenses_Campagnes',
+                 'Depenses_Communication', 'Depenses_Fonctionnement', 'Depenses_Formation',
+                 'Depenses_International'],
+    'Adherents': ['Adherents', 'Federations_Departementales', 'Elus_Locaux', 'Elus_Nationaux',
+                  'Maires', 'Conseillers_Regionaux'],
+    'Indicateurs': ['Taux_Execution_Budget', 'Ratio_Cotisations_Revenus',
+                    'Dependance_Financement_Public', 'Solde_Financier', 'Endettement'],
+    'Investissements': ['Investissement_Communication', 'Investissement_Numérique',
+                        'Investissement_Formation', 'Investissement_Recherche',
+                        'Investissement_International'],
+}
+
+SUMMARY_HEADER = ['Scenario', 'Revenus_Moyens', 'Depenses_Moyennes', 'Adherents_Moyens',
+                  'Part_Financement_Public', 'Solde_Moyen', 'Endettement_Final']
+
+
+class PSExcelExporter:
+    """Classeur Excel écrit en continu (mode write-only d'openpyxl, mémoire constante)
+
+    Les lignes sont écrites scénario par scénario dans des feuilles à flux; rien
+    n'est conservé en mémoire hormis le scénario courant. Le classeur n'est écrit
+    dans `path` qu'à la fermeture sans erreur (via un fichier temporaire): une
+    exception dans le bloc with ne laisse pas de classeur tronqué. Une feuille pleine
+    (limite d'Excel: 1 048 576 lignes, en-tête compris) se poursuit dans une feuille
+    suffixée (Revenus_2, Revenus_3, ...).
+    """
+
+    max_rows = 1048576
+
+    def __init__(self, path, sheets=None):
+        self.path = path
+        self.sheets = sheets or SHEETS
+        self.workbook = Workbook(write_only=True)
+        self._headers = {name: ['Scenario', 'Annee'] + columns
+                         for name, columns in self.sheets.items()}
+        self._headers['Synthese_Scenarios'] = SUMMARY_HEADER
+        self._worksheets = {name: [] for name in self._headers}
+        self._rows = {}
+        for name in self._headers:
+            self._new_sheet(name)
+        self.rows_written = 0
+
+    def _new_sheet(self, name):
+        """Ouvre la feuille suivante de `name` (name, name_2, ...) avec son en-tête"""
+        part = len(self._worksheets[name]) + 1
+        ws = self.workbook.create_sheet(title=name if part == 1 else f"{name}_{part}")
+        ws.append(self._headers[name])
+        self._worksheets[name].append(ws)
+        self._rows[name] = 1
+
+    def _append(self, name, rows):
+        """Ajoute des lignes à `name`, en passant à une nouvelle feuille si elle est pleine"""
+        for row in rows:
+            if self._rows[name] >= self.max_rows:
+                self._new_sheet(name)
+            self._worksheets[name][-1].append(row)
+            self._rows[name] += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def write_scenario(self, scenario, df):
+        """Ajoute les lignes d'un scénario à chaque feuille et sa ligne de synthèse"""
+        scenario = int(scenario) if isinstance(scenario, (int, np.integer)) else str(scenario)
+        years = df['Annee'].to_numpy().tolist()
+        for name, columns in self.sheets.items():
+            values = df[columns].to_numpy(dtype=np.float64).tolist()
+            self._append(name, ([scenario, year] + row for year, row in zip(years, values)))
+            self.rows_written += len(values)
+
+        revenue = df['Revenus_Total'].to_numpy()
+        self._append('Synthese_Scenarios', [[
+            scenario,
+            float(revenue.mean()),
+            float(df['Depenses_Total'].mean()),
+            float(df['Adherents'].mean()),
+            float(df['Financement_Public'].mean() / revenue.mean()),
+            float(df['Solde_Financier'].mean()),
+            float(df['Endettement'].iloc[-1]),
+        ]])
+
+    def close(self):
+        """Écrit le classeur (remplace `path` seulement une fois l'écriture terminée)"""
+        if self.workbook is not None:
+            tmp = f"{self.path}.tmp"
+            try:
+                self.workbook.save(tmp)
+                os.replace(tmp, self.path)
+            finally:
+                self.workbook = None
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+    def discard(self):
+        """Abandonne le classeur sans rien écrire"""
+        if self.workbook is not None:
+            # Termine les flux des feuilles (fichiers temporaires supprimés par openpyxl)
+            for sheets in self._worksheets.values():
+                for ws in sheets:
+                    ws.close()
+            self.workbook = None
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+
+# Métriques simulées pour chaque fédération
+METRICS = ['Adherents', 'Elus_Locaux', 'Maires', 'Cotisations_Adherents', 'Cotisations_Elus',
+           'Revenus_Federation']
+
+
+class PSFederationModel:
+    """Simulation hiérarchique des fédérations départementales
+
+    Chaque fédération a un poids structurel (taille relative, tirée une fois par
+    simulation) et une dérive régionale propre qui s'ajoute aux régimes de
+    croissance nationaux (bastions qui résistent, fédérations en déclin). Toutes
+    les fédérations et toutes les années sont tirées en une seule opération
+    vectorisée: le résultat est un tableau (fédération × année × métrique) et
+    les totaux nationaux s'obtiennent par réduction sur l'axe des fédérations.
+    Les bases et les chocs historiques (party_events) sont ceux du modèle national:
+    les totaux suivent les séries de generate_financial_data.
+    """
+
+    cotisation_moyenne = 40.0    # € par adhérent et par an
+    cotisation_elu = 100.0       # € reversés par élu local et par an
+    part_locale = 0.5            # part des cotisations conservée par la fédération
+
+    def __init__(self, analyzer, n_federations=100, size_sigma=0.6, drift_sigma=0.03, seed=None):
+        self.analyzer = analyzer
+        self.n_federations = n_federations
+        self.size_sigma = size_sigma
+        self.drift_sigma = drift_sigma
+        self.rng = np.random.default_rng(seed)
+        self.federations = np.array([f"F{k + 1:03d}" for k in range(n_federations)])
+        # Poids structurels, tirés une fois (partagés avec la microsimulation)
+        self.size = self._shares(size_sigma)
+
+    def _trend(self, column, years):
+        """Croissance nationale sans bruit (régimes de growth_regimes) pour chaque année"""
+        regime = self.analyzer.growth_regimes[column]
+        return self.analyzer._regime_rates(column, years), np.arange(len(years)) / regime['echelle']
+
+    def _municipal_multiplier(self, years):
+        """Effet des municipales sur les élus locaux (comme _simulate_elus_locaux)"""
+        election = np.isin(years, self.analyzer.municipal_years)
+        level = np.select([years <= 1995, years <= 2014], [1.2, 1.1], 0.8)
+        return np.where(election, level, 1.0)
+
+    def _event_multipliers(self, column, years, skip=()):
+        """Chocs de party_events sur la colonne pour chaque année (comme _add_party_trends)"""
+        multipliers = np.ones(len(years))
+        for year, shocks in self.analyzer.party_events.items():
+            if column in shocks and (year, column) not in skip:
+                multipliers[years == year] *= shocks[column]
+        return multipliers
+
+    def _shares(self, sigma):
+        """Poids des fédérations (log-normaux, somme égale à 1)"""
+        weights = self.rng.lognormal(0.0, sigma, self.n_federations)
+        return weights / weights.sum()
+
+    def _local_series(self, column, base, years, size, noise_sd):
+        """(fédération × année): base × poids × (1 + (taux + dérive) × i/échelle) × bruit"""
+        rates, steps = self._trend(column, years)
+        drift = self.rng.normal(0.0, self.drift_sigma, self.n_federations)
+        growth = 1 + (rates[None, :] + drift[:, None]) * steps[None, :]
+        noise = self.rng.normal(1.0, noise_sd, (self.n_federations, len(years)))
+        return base * size[:, None] * np.maximum(growth, 0.05) * noise
+
+    def run(self, years, members=None, skip=()):
+        """Simule toutes les fédérations; renvoie un tableau (fédération × année × métrique)
+
+        `members` (année × fédération), issu de la microsimulation, remplace les
+        adhérents tirés par le modèle agrégé; `skip` liste les couples (année,
+        colonne) dont le choc y est déjà intégré.
+        """
+        years = np.asarray(years)
+        config = self.analyzer.config
+        size = self.size
+        # Le poids électoral local suit la taille de la fédération, avec sa propre dispersion
+        implantation = size * self.rng.lognormal(0.0, self.size_sigma / 2, self.n_federations)
+        implantation /= implantation.sum()
+
+        values = np.empty((self.n_federations, len(years), len(METRICS)))
+        if members is not None:
+            values[:, :, 0] = np.asarray(members).T
+        else:
+            values[:, :, 0] = self._local_series('Adherents', config["adherents_base"], years,
+                                                 size, 0.07)
+        values[:, :, 1] = (self._local_series('Elus_Locaux', config["elus_locaux_base"], years,
+                                              implantation, 0.05)
+                           * self._municipal_multiplier(years)[None, :])
+        values[:, :, 2] = self._local_series('Maires', config["maires_base"], years,
+                                             implantation, 0.08)
+        # Chocs historiques le long de l'axe des années, avant les métriques dérivées
+        for k, column in enumerate(METRICS[:3]):
+            values[:, :, k] *= self._event_multipliers(column, years, skip)[None, :]
+        values[:, :, 3] = values[:, :, 0] * self.cotisation_moyenne / 1e6
+        values[:, :, 4] = values[:, :, 1] * self.cotisation_elu / 1e6
+        values[:, :, 5] = self.part_locale * values[:, :, 3] + values[:, :, 4]
+        return PSFederationResult(self.federations, years, values)
+
+
+class PSFederationResult:
+    """Résultat hiérarchique: tableau (fédération × année × métrique) et réductions"""
+
+    def __init__(self, federations, years, values):
+        self.federations = federations
+        self.years = years
+        self.metrics = list(METRICS)
+        self.values = values
+
+    def national(self):
+        """Totaux nationaux par année (somme sur les fédérations)"""
+        frame = pd.DataFrame(self.values.sum(axis=0), columns=self.metrics)
+        frame.insert(0, 'Annee', self.years)
+        return frame
+
+    def frame(self):
+        """Format long: une ligne par (fédération, année)"""
+        n_federations, n_years, _ = self.values.shape
+        frame = pd.DataFrame(self.values.reshape(n_federations * n_years, -1),
+                             columns=self.metrics)
+        frame.insert(0, 'Annee', np.tile(self.years, n_federations))
+        frame.insert(0, 'Federation', np.repeat(self.federations, n_years))
+        return frame
+
+    def shares(self, metric='Adherents'):
+        """Part de chaque fédération dans le total national (fédération × année)"""
+        layer = self.values[:, :, self.metrics.index(metric)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return layer / layer.sum(axis=0, keepdims=True)
+
+    def top(self, metric='Adherents', year=None, n=10):
+        """Les n plus grandes fédérations pour une métrique (dernière année par défaut)"""
+        t = -1 if year is None else int(np.flatnonzero(self.years == year)[0])
+        layer = self.values[:, t, self.metrics.index(metric)]
+        order = np.argsort(layer)[::-1][:n]
+        return pd.Series(layer[order], index=self.federations[order], name=metric)
@@ -0,0 +1,142 @@
+import os
+import hashlib
+import pickle
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ps_series import PSSeriesStore
+
+
+def _series_key(scenario, column, method, values):
+    """Clé de cache d'un modèle: scénario, colonne, méthode et contenu de la série"""
+    digest = hashlib.sha1(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()
+    return (scenario, column, method, digest)
+
+
+def _fit_series(task):
+    """Ajuste un modèle de série temporelle (exécuté dans un processus du pool)"""
+    key, values, method = task
+    values = pd.Series(values)
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore')
+        if method == 'ets':
+            from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+            model = ETSModel(values, error='add', trend='add', damped_trend=True)
+            results = model.fit(disp=False)
+        elif method == 'arima':
+            from statsmodels.tsa.arima.model import ARIMA
+            model = ARIMA(values, order=(1, 1, 1))
+            results = model.fit()
+        else:
+            raise ValueError(f"Méthode de prévision inconnue: {method}")
+    return key, results
+
+
+def _predict(results, method, steps, alpha):
+    """Prévision et intervalles de prédiction sur `steps` années"""
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore')
+        if method == 'ets':
+            n = results.nobs
+            frame = results.get_prediction(start=n, end=n + steps - 1).summary_frame(alpha=alpha)
+            return (frame['mean'].to_numpy(), frame['pi_lower'].to_numpy(),
+                    frame['pi_upper'].to_numpy())
+        frame = results.get_forecast(steps).summary_frame(alpha=alpha)
+        return (frame['mean'].to_numpy(), frame['mean_ci_lower'].to_numpy(),
+                frame['mean_ci_upper'].to_numpy())
+
+
+class PSForecaster:
+    """Prévisions au-delà de `end_year` pour toutes les colonnes générées"""
+
+    def __init__(self, method='ets', max_workers=None, cache_dir=None):
+        self.method = method
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self._models = {}
+
+    def _scenarios(self, data):
+        """Normalise l'entrée en (scénario, store, entité): DataFrame simple, DataFrame
+        avec 'Scenario' (un store pour tout l'ensemble) ou dict de DataFrames"""
+        if isinstance(data, dict):
+            return [(scenario, PSSeriesStore.of(df), None) for scenario, df in data.items()]
+        store = PSSeriesStore.of(data)
+        if store.has_entities:
+            return [(scenario, store, scenario) for scenario in store.entities.tolist()]
+        return [(0, store, None)]
+
+    def _cache_path(self, key):
+        name = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.pkl")
+
+    def _load_cached(self, key):
+        if key in self._models:
+            return self._models[key]
+        if self.cache_dir:
+            path = self._cache_path(key)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    self._models[key] = pickle.load(f)
+                return self._models[key]
+        return None
+
+    def _store(self, key, results):
+        self._models[key] = results
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._cache_path(key), 'wb') as f:
+                pickle.dump(results, f)
+
+    def fit(self, data, columns=None):
+        """Ajuste (en parallèle) un modèle par colonne et par scénario, avec cache"""
+        fitted = {}
+        tasks = []
+        for scenario, store, entity in self._scenarios(data):
+            cols = columns or store.columns
+            for column in cols:
+                values = np.array(store[column, None, entity])
+                key = _series_key(scenario, column, self.method, values)
+                fitted[(scenario, column)] = (key, int(store.years[-1]))
+                if self._load_cached(key) is None:
+                    tasks.append((key, values, self.method))
+
+        if tasks:
+            if self.max_workers == 1 or len(tasks) == 1:
+                results = map(_fit_series, tasks)
+            else:
+                chunksize = max(1, len(tasks) // (self.max_workers * 4))
+                with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                    results = list(executor.map(_fit_series, tasks, chunksize=chunksize))
+            for key, res in results:
+                self._store(key, res)
+        return fitted
+
+    def forecast(self, data, until_year=2032, columns=None, alpha=0.05):
+        """Prévisions jusqu'à `until_year` avec intervalles de prédiction (format long)"""
+        fitted = self.fit(data, columns=columns)
+        frames = []
+        for (scenario, column), (key, last_year) in fitted.items():
+            steps = until_year - last_year
+            if steps <= 0:
+                continue
+            mean, lower, upper = _predict(self._models[key], self.method, steps, alpha)
+            frames.append(pd.DataFrame({
+                'Scenario': scenario,
+                'Colonne': column,
+                'Annee': np.arange(last_year + 1, until_year + 1),
+                'Prevision': mean,
+                'Borne_Inf': lower,
+                'Borne_Sup': upper,
+            }))
+        if not frames:
+            return pd.DataFrame(columns=['Scenario', 'Colonne', 'Annee', 'Prevision',
+                                         'Borne_Inf', 'Borne_Sup'])
+        return pd.concat(frames, ignore_index=True)
+
+    def forecast_cycles(self, data, cycle_years=(2027, 2032), columns=None, alpha=0.05):
+        """Prévisions restreintes aux années des prochaines présidentielles"""
+        forecast = self.forecast(data, until_year=max(cycle_years), columns=columns, alpha=alpha)
+        return forecast[forecast['Annee'].isin(cycle_years)].reset_index(drop=True)
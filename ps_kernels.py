@@ -0,0 +1,187 @@
+import os
+import threading
+import types
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+# Numba est optionnel: sans lui (ou avec PS_DISABLE_JIT=1) les noyaux NumPy sont utilisés
+HAS_NUMBA = numba is not None
+USE_JIT = HAS_NUMBA and os.environ.get('PS_DISABLE_JIT', '0') != '1'
+
+
+def jit(parallel=False):
+    """Compile la fonction avec Numba si disponible (nogil, cache disque), sinon la renvoie
+
+    Le cache (`cache=True`) écrit le code machine à côté du module (__pycache__, ou
+    NUMBA_CACHE_DIR): la compilation n'est payée qu'au premier lancement. Sert aussi
+    aux régimes personnalisés qui veulent une récurrence compilée.
+
+    Avec parallel=True, les boucles prange ne sont parallélisées que depuis le thread
+    principal: dans un thread secondaire (génération parallèle des colonnes, déjà
+    concurrente) la version séquentielle nogil est utilisée, les couches de threads
+    de Numba (TBB, workqueue) ne supportant pas d'être lancées depuis plusieurs threads.
+    """
+    def decorate(func):
+        if not HAS_NUMBA:
+            return func
+        if not parallel:
+            return numba.njit(cache=True, nogil=True)(func)
+        parallel_func = numba.njit(cache=True, nogil=True, parallel=True)(func)
+        # Copie renommée: le cache disque de Numba ne distingue pas parallel=True/False
+        serial_func = types.FunctionType(func.__code__, func.__globals__, func.__name__ + '_serie')
+        serial_func.__qualname__ = func.__qualname__ + '_serie'
+        serial = numba.njit(cache=True, nogil=True)(serial_func)
+
+        def dispatch(*args):
+            if threading.current_thread() is threading.main_thread():
+                return parallel_func(*args)
+            return serial(*args)
+        return dispatch
+    return decorate
+
+
+_prange = numba.prange if HAS_NUMBA else range
+
+
+# --- Récurrence multiplicative (endettement, croissance composée) -------------------
+
+# Séquentiel: la génération n'en passe qu'une trajectoire à la fois (55 pas), trop
+# peu pour amortir le lancement des threads de Numba
+@jit()
+def _compound_jit(start, rates):
+    n_paths, n_steps = rates.shape
+    levels = np.empty((n_paths, n_steps))
+    for s in range(n_paths):
+        level = start[s]
+        for t in range(n_steps):
+            level = level * (1 + rates[s, t])
+            levels[s, t] = level
+    return levels
+
+
+def _compound_numpy(start, rates):
+    # Boucle sur le temps, vectorisée sur les trajectoires: mêmes opérations, même ordre
+    levels = np.empty(rates.shape)
+    level = start.copy()
+    for t in range(rates.shape[1]):
+        level = level * (1 + rates[:, t])
+        levels[:, t] = level
+    return levels
+
+
+def compound_paths(start, rates):
+    """Niveaux successifs level[t] = level[t-1] * (1 + rates[t]) pour chaque trajectoire
+
+    `start` (n_trajectoires,) et `rates` (n_trajectoires × n_annees); une trajectoire
+    unique peut être passée en 1D. Les deux implémentations donnent des résultats
+    identiques au bit près (multiplications dans le même ordre que la boucle Python).
+    """
+    rates = np.asarray(rates, dtype=np.float64)
+    single = rates.ndim == 1
+    rates = np.atleast_2d(rates)
+    start = np.broadcast_to(np.asarray(start, dtype=np.float64), rates.shape[:1]).copy()
+    levels = (_compound_jit if USE_JIT else _compound_numpy)(start, rates)
+    return levels[0] if single else levels
+
+
+# --- Transitions de la microsimulation ----------------------------------------------
+
+@jit(parallel=True)
+def _exits_jit(seniority, tier, draws, depart, fidelity, shock):
+    leaving = np.empty(len(draws), dtype=np.bool_)
+    for k in _prange(len(draws)):
+        p_exit = depart * (1.5 if seniority[k] < 2 else 1.0) * fidelity[tier[k]]
+        if shock != 1.0:
+            p_exit = 1 - (1 - p_exit) * shock
+        leaving[k] = draws[k] < p_exit
+    return leaving
+
+
+def _exits_numpy(seniority, tier, draws, depart, fidelity, shock):
+    p_exit = depart * np.where(seniority < 2, 1.5, 1.0) * fidelity[tier]
+    if shock != 1.0:
+        p_exit = 1 - (1 - p_exit) * shock
+    return draws < p_exit
+
+
+def microsim_exits(seniority, tier, draws, depart, fidelity, shock=1.0):
+    """Départs de l'année: probabilité selon l'ancienneté, la tranche et le choc éventuel
+
+    Version fusionnée (sans tableaux intermédiaires) quand Numba est disponible.
+    """
+    kernel = _exits_jit if USE_JIT else _exits_numpy
+    return kernel(seniority, tier, draws, float(depart), fidelity, float(shock))
+
+
+# --- Distance de Kolmogorov-Smirnov entre échantillons triés ------------------------
+
+@jit(parallel=True)
+def _ks_jit(base, variants):
+    n_variants, n_rows, m = variants.shape
+    n = base.shape[1]
+    gaps = np.zeros((n_variants, n_rows), dtype=np.int64)
+    for v in _prange(n_variants):
+        for r in range(n_rows):
+            # Fusion des deux suites triées; écart évalué après chaque groupe d'ex aequo.
+            # Les NaN (triés en fin de suite) forment un dernier groupe commun: la
+            # fusion s'arrête quand les deux suites n'ont plus que des NaN
+            i = 0
+            j = 0
+            best = 0
+            while i < n and j < m:
+                a = base[r, i]
+                b = variants[v, r, j]
+                if a != a and b != b:
+                    break
+                if a != a:
+                    value = b
+                elif b != b:
+                    value = a
+                else:
+                    value = min(a, b)
+                while i < n and base[r, i] == value:
+                    i += 1
+                while j < m and variants[v, r, j] == value:
+                    j += 1
+                best = max(best, abs(i * m - j * n))
+            gaps[v, r] = best
+    return gaps
+
+
+def _ks_numpy(base, variants):
+    # Fusion par tri stable des deux suites; poids entiers +m (référence) et -n (variante)
+    n, m = base.shape[-1], variants.shape[-1]
+    pooled = np.concatenate([np.broadcast_to(base, variants.shape[:-1] + (n,)), variants], axis=-1)
+    weights = np.concatenate([np.full(n, m, dtype=np.int64), np.full(m, -n, dtype=np.int64)])
+    order = np.argsort(pooled, axis=-1, kind='stable')
+    gaps = np.cumsum(weights[order], axis=-1)
+    ordered = np.take_along_axis(pooled, order, axis=-1)
+    # Écart évalué seulement en fin de groupe d'ex aequo (les NaN forment un groupe)
+    tied = ((ordered[..., 1:] == ordered[..., :-1])
+            | (np.isnan(ordered[..., 1:]) & np.isnan(ordered[..., :-1])))
+    gaps[..., :-1][tied] = 0
+    return np.abs(gaps).max(axis=-1)
+
+
+def ks_sorted(base, variants):
+    """Distance de Kolmogorov-Smirnov entre une référence et des variantes
+
+    `base` (... × n) et `variants` (V × ... × m), échantillons triés sur le dernier
+    axe; renvoie (V × ...). L'écart des fonctions de répartition est calculé en
+    entiers (n·m fois l'écart): les deux implémentations donnent le même résultat.
+    Les NaN comptent dans n et m mais sont classés après toutes les valeurs.
+    """
+    base = np.asarray(base, dtype=np.float64)
+    variants = np.asarray(variants, dtype=np.float64)
+    shape = variants.shape[:-1]
+    n, m = base.shape[-1], variants.shape[-1]
+    base = np.ascontiguousarray(base.reshape(-1, n))
+    variants = np.ascontiguousarray(variants.reshape(shape[0], -1, m))
+    gaps = (_ks_jit if USE_JIT else _ks_numpy)(base, variants)
+    return (gaps / (n * m)).reshape(shape)
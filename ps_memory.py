@@ -0,0 +1,117 @@
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+_UNITS = {'': 1, 'B': 1, 'K': 1e3, 'KB': 1e3, 'M': 1e6, 'MB': 1e6, 'G': 1e9, 'GB': 1e9,
+          'T': 1e12, 'TB': 1e12, 'KIB': 2**10, 'MIB': 2**20, 'GIB': 2**30, 'TIB': 2**40}
+
+
+def parse_memory(value):
+    """Convertit un budget mémoire ("4GB", "512MiB", 2e9...) en octets"""
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return int(value)
+    match = re.fullmatch(r'\s*([0-9.]+)\s*([A-Za-z]*)\s*', str(value))
+    if not match or match.group(2).upper() not in _UNITS:
+        raise ValueError(f"Budget mémoire invalide: {value!r}")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def format_memory(n_bytes):
+    """Octets → texte lisible"""
+    for unit in ('o', 'Ko', 'Mo', 'Go'):
+        if abs(n_bytes) < 1000:
+            return f"{n_bytes:.1f} {unit}"
+        n_bytes /= 1000
+    return f"{n_bytes:.1f} To"
+
+
+def process_peak_memory():
+    """Pic de mémoire résidente depuis le lancement du processus (octets), None si indisponible
+
+    ru_maxrss ne redescend jamais: c'est le maximum sur toute la vie du processus,
+    pas celui d'une génération donnée (voir le pic estimé de PSMemoryPlanner).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS: octets; Linux et autres Unix: kilo-octets
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class PSMemoryPlanner:
+    """Découpe un ensemble de scénarios en blocs qui tiennent dans un budget mémoire
+
+    L'empreinte d'un scénario est estimée à partir de l'ensemble des colonnes, de
+    leurs types et de l'horizon (une génération témoin, l'état du générateur
+    aléatoire étant restauré ensuite). Chaque bloc est rempli directement dans des
+    tableaux préalloués, sans concaténation: un bloc coûte son empreinte plus un
+    scénario en cours de génération.
+    """
+
+    def __init__(self, analyzer, max_memory):
+        self.analyzer = analyzer
+        self.budget = parse_memory(max_memory)
+        self.columns, self.dtypes = self._probe()
+        self.n_years = analyzer.end_year - analyzer.start_year + 1
+        self.peak = 0
+        self.chunks = 0
+
+    def _probe(self):
+        state = np.random.get_state()
+        try:
+            probe = self.analyzer.generate_financial_data(verbose=False)
+        finally:
+            np.random.set_state(state)
+        columns = ['Scenario'] + list(probe.columns)
+        dtypes = [np.dtype(np.int64)] + list(probe.dtypes)
+        return columns, dtypes
+
+    def scenario_bytes(self):
+        """Empreinte d'un scénario au format long (colonnes × types × horizon)"""
+        return self.n_years * sum(dtype.itemsize for dtype in self.dtypes)
+
+    def chunk_size(self, n_scenarios):
+        """Nombre de scénarios par bloc: le bloc et un scénario en cours tiennent dans le budget"""
+        per_scenario = self.scenario_bytes()
+        # Le DataFrame du scénario en cours et ses temporaires (~2 fois son empreinte)
+        available = self.budget - 2 * per_scenario
+        if available < per_scenario:
+            raise MemoryError(f"Budget de {format_memory(self.budget)} insuffisant pour un "
+                              f"scénario ({format_memory(per_scenario)})")
+        return int(min(n_scenarios, available // per_scenario))
+
+    def build(self, scenario_iter, n_chunk):
+        """Construit un bloc au format long de n_chunk scénarios (tableaux préalloués)"""
+        n_rows = n_chunk * self.n_years
+        arrays = {c: np.empty(n_rows, dtype=d) for c, d in zip(self.columns, self.dtypes)}
+        row = 0
+        for scenario, df in scenario_iter:
+            arrays['Scenario'][row:row + len(df)] = scenario
+            for column in self.columns[1:]:
+                arrays[column][row:row + len(df)] = df[column].to_numpy()
+            row += len(df)
+            # Bloc préalloué + scénario en cours et ses temporaires
+            used = n_chunk * self.scenario_bytes() + 2 * int(df.memory_usage(index=False).sum())
+            self.peak = max(self.peak, used)
+        self.chunks += 1
+        # copy=False: le DataFrame réutilise les tableaux remplis (pas de copie de consolidation)
+        return pd.DataFrame({c: a[:row] for c, a in arrays.items()}, copy=False)
+
+    def report(self):
+        """Affiche et renvoie le pic mémoire (estimé pour les blocs, mesuré pour le processus
+        depuis son lancement, générations précédentes comprises)"""
+        process_peak = process_peak_memory()
+        print(f"💾 Budget {format_memory(self.budget)}: {self.chunks} bloc(s), pic estimé "
+              f"{format_memory(self.peak)}"
+              + (f", pic du processus depuis son lancement {format_memory(process_peak)}"
+                 if process_peak else ""))
+        return {'budget': self.budget, 'blocs': self.chunks, 'pic_estime': self.peak,
+                'pic_processus': process_peak}
@@ -0,0 +1,119 @@
+import numpy as np
+
+from ps_kernels import microsim_exits
+
+
+# Statuts des agents (emplacements recyclés: mémoire bornée par la capacité)
+LIBRE, ACTIF = 0, 1
+
+
+class PSMembershipMicrosim:
+    """Microsimulation des adhérents en structure de tableaux NumPy
+
+    Chaque agent représente `adherents_base / n_agents` adhérents et porte son année
+    d'adhésion, sa fédération, son statut et sa tranche de cotisation. Chaque année,
+    les départs (probabilité selon la période politique, l'ancienneté et la tranche)
+    et les adhésions sont tirés de façon vectorisée sur tous les agents, puis
+    agrégés en Adherents et Cotisations_Adherents.
+    """
+
+    # Colonnes du jeu généré produites par la microsimulation (non décomposables
+    # en croissance × résidu × choc: PSWhatIf ne peut pas les recalculer en place)
+    colonnes = ('Adherents', 'Cotisations_Adherents')
+
+    # (début, fin, taux de départ, taux d'adhésion) par période politique
+    periodes = [(1971, 1981, 0.08, 0.145),  # Montée vers le pouvoir
+                (1981, 1988, 0.09, 0.11),   # Présidence Mitterrand
+                (1988, 1995, 0.11, 0.11),   # Second septennat
+                (1995, 2002, 0.14, 0.10),   # Opposition
+                (2002, 2012, 0.09, 0.13),   # Reconstruction et victoire
+                (2012, 2017, 0.15, 0.08),   # Présidence Hollande
+                (2017, 2022, 0.18, 0.05)]   # Effondrement
+    defaut = (0.10, 0.12)                   # Reconstruction
+
+    cotisations_tranches = np.array([15.0, 30.0, 60.0, 120.0])  # € par an
+    repartition_tranches = np.array([0.30, 0.35, 0.25, 0.10])
+    fidelite_tranches = np.array([1.2, 1.0, 0.9, 0.7])  # multiplicateur du taux de départ
+
+    def __init__(self, analyzer, n_agents=100000, capacity_factor=3.0, n_federations=100,
+                 seed=None, federation_weights=None):
+        self.analyzer = analyzer
+        self.n_agents = int(n_agents)
+        self.capacity = int(self.n_agents * capacity_factor)
+        self.n_federations = n_federations
+        # Probabilité qu'un nouvel adhérent rejoigne chaque fédération (uniforme par défaut)
+        self.federation_weights = federation_weights
+        self.scale = analyzer.config["adherents_base"] / self.n_agents
+        self.rng = np.random.default_rng(seed)
+
+        # Structure de tableaux compacte (~6 octets par agent jusqu'à 256 fédérations;
+        # le type des fédérations s'élargit au-delà)
+        self.join_year = np.zeros(self.capacity, dtype=np.int16)
+        self.federation = np.zeros(self.capacity,
+                                   dtype=np.min_scalar_type(max(n_federations - 1, 0)))
+        self.status = np.zeros(self.capacity, dtype=np.int8)
+        self.fee_tier = np.zeros(self.capacity, dtype=np.int8)
+        self.saturated_years = []
+
+    def _rates(self, year):
+        for debut, fin, depart, adhesion in self.periodes:
+            if debut <= year <= fin:
+                return depart, adhesion
+        return self.defaut
+
+    def _join(self, n, year):
+        """Active n agents dans des emplacements libres (limité par la capacité)"""
+        free = np.flatnonzero(self.status == LIBRE)
+        if n > len(free):
+            self.saturated_years.append(year)
+            n = len(free)
+        slots = free[:n]
+        self.status[slots] = ACTIF
+        self.join_year[slots] = year
+        if self.federation_weights is None:
+            self.federation[slots] = self.rng.integers(0, self.n_federations, n)
+        else:
+            self.federation[slots] = self.rng.choice(self.n_federations, n,
+                                                     p=self.federation_weights)
+        self.fee_tier[slots] = self.rng.choice(len(self.cotisations_tranches), n,
+                                               p=self.repartition_tranches)
+
+    def run(self, years):
+        """Fait évoluer les agents année par année; renvoie les agrégats annuels"""
+        years = np.asarray(years)
+        adherents = np.zeros(len(years))
+        fees = np.zeros(len(years))
+        per_federation = np.zeros((len(years), self.n_federations))
+        # Seuls les chocs de départ (facteur < 1) sont des événements de cohorte; les
+        # afflux ponctuels (ex. Epinay) restent appliqués par _add_party_trends
+        shocks = {year: events['Adherents'] for year, events in self.analyzer.party_events.items()
+                  if events.get('Adherents', 1.0) < 1}
+
+        self._join(self.n_agents, int(years[0]))
+        for t, year in enumerate(years):
+            year = int(year)
+            depart, adhesion = self._rates(year)
+            active = np.flatnonzero(self.status == ACTIF)
+
+            # Départs: nouveaux adhérents plus volatils, tranches élevées plus fidèles
+            # (départ massif, ex. 2017: probabilité supplémentaire de quitter)
+            seniority = year - self.join_year[active]
+            leaving = active[microsim_exits(seniority, self.fee_tier[active],
+                                            self.rng.random(len(active)), depart,
+                                            self.fidelite_tranches, shocks.get(year, 1.0))]
+            self.status[leaving] = LIBRE
+
+            self._join(self.rng.poisson(adhesion * len(active)), year)
+
+            current = self.status == ACTIF
+            adherents[t] = current.sum() * self.scale
+            fees[t] = self.cotisations_tranches[self.fee_tier[current]].sum() * self.scale / 1e6
+            per_federation[t] = np.bincount(self.federation[current],
+                                            minlength=self.n_federations) * self.scale
+
+        return {
+            'chocs_integres': [(year, 'Adherents') for year in shocks],
+            'Adherents': adherents,
+            'Cotisations_Adherents': fees,
+            'Adherents_Federations': per_federation,
+        }
@@ -0,0 +1,211 @@
+import hashlib
+import os
+import tempfile
+import types
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
+
+import ps_detection
+from ps_memory import parse_memory
+from ps_series import PSSeriesStore
+
+
+# À incrémenter quand l'assemblage des vignettes change (invalide tout le cache)
+RENDER_VERSION = 2
+STYLE = 'seaborn-v0_8'
+PANEL_SIZE = (10, 6)     # pouces: une case de la grille 4 × 2 de la figure 20 × 24
+TITLE_HEIGHT = 0.6       # pouces
+
+# Panneaux: (méthode de tracé, colonnes utilisées, attributs de l'analyseur utilisés)
+PANELS = [
+    ('_plot_revenue_expenses', ['Revenus_Total', 'Depenses_Total'],
+     ('key_events', 'max_annotations')),
+    ('_plot_revenue_structure', ['Cotisations_Adherents', 'Dons_Prives', 'Financement_Public',
+                                 'Revenus_Evenements', 'Cotisations_Elus', 'Revenus_Formations'], ()),
+    ('_plot_expenses_structure', ['Depenses_Personnel', 'Depenses_Campagnes',
+                                  'Depenses_Communication', 'Depenses_Fonctionnement',
+                                  'Depenses_Formation', 'Depenses_International'], ()),
+    ('_plot_membership_structure', ['Adherents', 'Federations_Departementales'], ()),
+    ('_plot_strategic_investments', ['Investissement_Communication', 'Investissement_Numérique',
+                                     'Investissement_Formation', 'Investissement_Recherche'], ()),
+    ('_plot_financial_indicators', ['Taux_Execution_Budget', 'Dependance_Financement_Public'], ()),
+    ('_plot_elected_officials', ['Elus_Locaux', 'Elus_Nationaux'], ()),
+    ('_plot_financial_situation', ['Solde_Financier', 'Endettement'], ()),
+]
+
+# Fonctions communes appelées par les panneaux: leur code entre dans l'empreinte
+# de chaque panneau (méthodes de l'analyseur, puis détection des ruptures annotées)
+HELPERS = ['_plot_line', '_line_data', '_downsample_lttb', '_max_points', '_plot_bars',
+           '_bar_polygons', '_plot_stacked_bars', 'detect_events']
+DETECTION_HELPERS = [ps_detection.change_points, ps_detection.anomalies, ps_detection._robust_sigma,
+                     ps_detection._neighbour_median,
+                     ps_detection.PSBreakDetector.detect_array, ps_detection.PSBreakDetector.events]
+
+# Qualités prédéfinies: aperçu rapide ou impression
+PRESETS = {
+    'apercu': {'dpi': 72, 'format': 'png'},
+    'final': {'dpi': 300, 'format': 'png'},
+}
+
+# Formats vectoriels: la figure complète est rendue (pas d'assemblage de vignettes)
+VECTOR_FORMATS = {'pdf', 'svg', 'eps'}
+
+
+class PSRenderCache:
+    """Cache de rendu par panneau de l'analyse financière
+
+    Chaque panneau est rendu dans sa propre image, dont le nom est l'empreinte de
+    ses entrées: colonnes du DataFrame qu'il trace, attributs de l'analyseur qu'il
+    lit, code de sa méthode de tracé et des fonctions communes (HELPERS, détection
+    et ses paramètres), style, version de matplotlib et résolution.
+    La figure finale (formats matriciels) est assemblée à partir des vignettes:
+    seuls les panneaux dont les entrées ont changé sont retracés.
+
+    Sans cache_dir, les vignettes sont rendues dans un répertoire temporaire
+    supprimé après le rendu. Avec cache_dir, le cache est borné à max_size: les
+    fichiers les moins récemment utilisés sont supprimés au-delà.
+    """
+
+    def __init__(self, analyzer, cache_dir=None, max_size='256MB'):
+        self.analyzer = analyzer
+        self.cache_dir = cache_dir
+        self.max_size = parse_memory(max_size)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._dir = cache_dir
+        self.stats = {'rendus': 0, 'caches': 0}
+
+    def _digest(self, *parts):
+        h = hashlib.sha256()
+        for part in parts:
+            h.update(part if isinstance(part, bytes) else repr(part).encode('utf-8'))
+            h.update(b'\x00')
+        return h.hexdigest()[:32]
+
+    def _style_key(self, dpi):
+        return (RENDER_VERSION, STYLE, matplotlib.__version__, PANEL_SIZE, dpi)
+
+    def _code_key(self, func):
+        """Bytecode, noms et constantes d'une fonction (fonctions imbriquées comprises)"""
+        def parts(code):
+            return [code.co_code, code.co_names,
+                    [parts(c) if isinstance(c, types.CodeType) else c for c in code.co_consts]]
+        return parts(func.__code__)
+
+    def _helpers_key(self):
+        analyzer_type = type(self.analyzer)
+        return ([self._code_key(getattr(analyzer_type, name)) for name in HELPERS],
+                [self._code_key(func) for func in DETECTION_HELPERS],
+                sorted(vars(ps_detection.PSBreakDetector()).items()))
+
+    def panel_key(self, store, method, columns, attributes, dpi, helpers=None):
+        """Empreinte des entrées d'un panneau"""
+        values = np.stack([store['Annee']] + [store[c] for c in columns]).astype(np.float64)
+        code = self._code_key(getattr(type(self.analyzer), method))
+        return self._digest(method, columns, values.tobytes(), values.shape,
+                            [getattr(self.analyzer, a) for a in attributes],
+                            code, helpers or self._helpers_key(), self._style_key(dpi))
+
+    def _title(self):
+        return (f'Analyse des Finances du {self.analyzer.parti} '
+                f'({self.analyzer.start_year}-{self.analyzer.end_year})')
+
+    def _render_panel(self, df, method, dpi, path):
+        with plt.style.context(STYLE):
+            fig = plt.figure(figsize=PANEL_SIZE)
+            ax = fig.add_subplot(1, 1, 1)
+            getattr(self.analyzer, method)(df, ax)
+            fig.tight_layout()
+            fig.savefig(path, dpi=dpi)
+            plt.close(fig)
+
+    def _render_title(self, dpi, path):
+        fig = plt.figure(figsize=(2 * PANEL_SIZE[0], TITLE_HEIGHT))
+        fig.text(0.5, 0.5, self._title(), ha='center', va='center', fontsize=16, fontweight='bold')
+        fig.savefig(path, dpi=dpi)
+        plt.close(fig)
+
+    def _cached(self, key, render):
+        """Chemin de la vignette `key`, rendue seulement si elle est absente du cache"""
+        path = os.path.join(self._dir, f"{key}.png")
+        if os.path.exists(path):
+            os.utime(path)  # dernière utilisation, pour l'éviction LRU
+            self.stats['caches'] += 1
+        else:
+            tmp = f"{path}.tmp.png"
+            render(tmp)
+            os.replace(tmp, path)
+            self.stats['rendus'] += 1
+        return path
+
+    def render(self, df, path, quality='final', fmt=None, dpi=None):
+        """Écrit l'analyse dans `path` (format et résolution selon la qualité choisie)"""
+        if self.cache_dir:
+            stats = self._render(df, path, quality, fmt, dpi)
+            self.evict()
+            return stats
+        with tempfile.TemporaryDirectory(prefix='ps_render_') as tmp:
+            self._dir = tmp
+            try:
+                return self._render(df, path, quality, fmt, dpi)
+            finally:
+                self._dir = None
+
+    def evict(self):
+        """Supprime les fichiers les moins récemment utilisés au-delà de max_size"""
+        entries = [entry for entry in os.scandir(self.cache_dir)
+                   if entry.is_file() and '.tmp' not in entry.name]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        total = 0
+        for entry in entries:
+            total += entry.stat().st_size
+            if total > self.max_size:
+                os.remove(entry.path)
+
+    def _render(self, df, path, quality, fmt, dpi):
+        preset = PRESETS[quality]
+        dpi = dpi or preset['dpi']
+        fmt = (fmt or os.path.splitext(path)[1].lstrip('.') or preset['format']).lower()
+        self.stats = {'rendus': 0, 'caches': 0}
+
+        df = PSSeriesStore.of(df)
+        helpers = self._helpers_key()
+        keys = [self.panel_key(df, m, c, a, dpi, helpers) for m, c, a in PANELS]
+        title_key = self._digest('titre', self._title(), self._style_key(dpi))
+        # La figure finale est elle-même en cache: rien n'est recalculé si rien n'a changé
+        final = os.path.join(self._dir, f"{self._digest(keys, title_key, fmt)}.{fmt}")
+        if os.path.exists(final):
+            os.utime(final)
+            self.stats['caches'] += 1
+        elif fmt in VECTOR_FORMATS:
+            # Formats vectoriels: figure complète, sans assemblage de vignettes
+            fig, _ = self.analyzer._build_figure(df)
+            fig.savefig(f"{final}.tmp", dpi=dpi, bbox_inches='tight', format=fmt)
+            plt.close(fig)
+            os.replace(f"{final}.tmp", final)
+            self.stats['rendus'] += 1
+        else:
+            tiles = [self._cached(key, lambda p, m=method: self._render_panel(df, m, dpi, p))
+                     for key, (method, _, _) in zip(keys, PANELS)]
+            title = self._cached(title_key, lambda p: self._render_title(dpi, p))
+            self._assemble(title, tiles, dpi, fmt, final)
+        with open(final, 'rb') as src, open(path, 'wb') as dst:
+            dst.write(src.read())
+        return self.stats
+
+    def _assemble(self, title, tiles, dpi, fmt, path):
+        """Assemble le titre et la grille 4 × 2 des vignettes dans une image"""
+        width, height = int(PANEL_SIZE[0] * dpi), int(PANEL_SIZE[1] * dpi)
+        title_height = int(TITLE_HEIGHT * dpi)
+        sheet = Image.new('RGB', (2 * width, title_height + 4 * height), 'white')
+        with Image.open(title) as image:
+            sheet.paste(image.convert('RGB'), (0, 0))
+        for k, tile in enumerate(tiles):
+            with Image.open(tile) as image:
+                sheet.paste(image.convert('RGB'), ((k % 2) * width, title_height + (k // 2) * height))
+        tmp = f"{path}.tmp"
+        sheet.save(tmp, format='JPEG' if fmt == 'jpg' else fmt.upper(), dpi=(dpi, dpi))
+        os.replace(tmp, path)
@@ -0,0 +1,50 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class PSColumnScheduler:
+    """Exécute un graphe de tâches {nom: (fonction, dépendances)}
+
+    Chaque fonction reçoit en arguments positionnels les résultats de ses
+    dépendances. Sans max_workers (ou avec 1), les tâches s'exécutent dans l'ordre
+    d'insertion, qui doit être topologique; sinon les tâches prêtes sont lancées
+    en parallèle sur un pool de threads dès que leurs dépendances sont terminées.
+    Le pool n'accélère que des tâches longues qui relâchent le GIL; pour les
+    colonnes de generate_financial_data, il n'apporte aucun gain.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+
+    @staticmethod
+    def check(tasks):
+        """Vérifie que les dépendances existent et précèdent chaque tâche (pas de cycle)"""
+        seen = set()
+        for name, (_, deps) in tasks.items():
+            missing = [d for d in deps if d not in seen]
+            if missing:
+                raise ValueError(f"Tâche {name!r}: dépendances inconnues ou postérieures {missing}")
+            seen.add(name)
+
+    def run(self, tasks, wrap=None):
+        """Exécute le graphe; `wrap(nom, fonction)` peut envelopper chaque tâche"""
+        self.check(tasks)
+        wrap = wrap or (lambda name, func: func)
+        results = {}
+        if not self.max_workers or self.max_workers <= 1:
+            for name, (func, deps) in tasks.items():
+                results[name] = wrap(name, func)(*[results[d] for d in deps])
+            return results
+
+        waiting = dict(tasks)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while waiting or running:
+                for name, (func, deps) in list(waiting.items()):
+                    if all(d in results for d in deps):
+                        future = pool.submit(wrap(name, func), *[results[d] for d in deps])
+                        running[future] = name
+                        del waiting[name]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+        return results
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+
+# Colonnes identifiant une série (scénario d'un ensemble, fédération du mode hiérarchique)
+ENTITY_COLUMNS = ('Scenario', 'Federation')
+
+
+def ensemble_array(df):
+    """Convertit un ensemble au format long en tableau (scénario × année × colonne)
+
+    Accepte aussi un DataFrame simple (un seul scénario). Les scénarios doivent
+    couvrir les mêmes années, comme ceux produits par generate_ensemble.
+    """
+    columns = [c for c in df.columns if c not in ('Scenario', 'Annee')]
+    if 'Scenario' in df.columns:
+        df = df.sort_values(['Scenario', 'Annee'], kind='stable')
+        scenarios = pd.unique(df['Scenario'])
+    else:
+        df = df.sort_values('Annee', kind='stable')
+        scenarios = np.array([0])
+    n_scenarios = len(scenarios)
+    years = df['Annee'].to_numpy()[:len(df) // n_scenarios]
+    values = df[columns].to_numpy(dtype=np.float64).reshape(n_scenarios, len(years), len(columns))
+    return values, years, columns, scenarios
+
+
+class PSSeriesStore:
+    """Séries annuelles indexées par année (et par scénario ou fédération si présents)
+
+    Les valeurs sont copiées une fois dans un tableau contigu (colonne × entité ×
+    année), en lecture seule. Les accès se font par indice et non par balayage:
+        store['Revenus_Total']               série complète (vue)
+        store['Revenus_Total', 1981]         valeur d'une année, O(1)
+        store['Revenus_Total', 1981:1995]    tranche d'années, bornes incluses (vue)
+        store['Revenus_Total', 1981:1995, 3] idem pour le scénario 3 d'un ensemble
+    Sans entité (jeu simple), les séries sont à une dimension (année); pour un
+    ensemble, store[colonne] et store[colonne, tranche] sont (entité × année).
+    store['Annee'] renvoie les années, comme la colonne du DataFrame.
+    """
+
+    def __init__(self, df):
+        self.entity_name = next((c for c in ENTITY_COLUMNS if c in df.columns), None)
+        if self.entity_name not in (None, 'Scenario'):
+            df = df.rename(columns={self.entity_name: 'Scenario'})
+        values, years, columns, entities = ensemble_array(df)
+
+        self.values = np.ascontiguousarray(values.transpose(2, 0, 1))
+        self.values.flags.writeable = False
+        self.years = np.asarray(years).copy()
+        self.years.flags.writeable = False
+        self.columns = list(columns)
+        self.entities = np.asarray(entities)
+        self._column_index = {c: k for k, c in enumerate(self.columns)}
+        self._year_index = {int(y): k for k, y in enumerate(self.years)}
+        self._entity_index = {e: k for k, e in enumerate(self.entities.tolist())}
+
+    @classmethod
+    def of(cls, data):
+        """Store d'un DataFrame (renvoie data tel quel si c'est déjà un store)"""
+        return data if isinstance(data, cls) else cls(data)
+
+    @property
+    def has_entities(self):
+        return self.entity_name is not None
+
+    def __len__(self):
+        return len(self.years)
+
+    def __contains__(self, column):
+        return column == 'Annee' or column in self._column_index
+
+    def _column(self, column):
+        try:
+            return self._column_index[column]
+        except KeyError:
+            raise KeyError(f"Colonne inconnue: {column}") from None
+
+    def _year(self, year):
+        """Position d'une année (int) ou d'une tranche d'années (bornes incluses)"""
+        if isinstance(year, slice):
+            start = None if year.start is None else int(np.searchsorted(self.years, year.start, 'left'))
+            stop = None if year.stop is None else int(np.searchsorted(self.years, year.stop, 'right'))
+            return slice(start, stop, year.step)
+        try:
+            return self._year_index[int(year)]
+        except KeyError:
+            raise KeyError(f"Année absente: {year}") from None
+
+    def _entity(self, entity):
+        if entity is None:
+            return 0 if not self.has_entities else slice(None)
+        try:
+            return self._entity_index[entity]
+        except KeyError:
+            raise KeyError(f"{self.entity_name} inconnu: {entity}") from None
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            if key == 'Annee':
+                return self.years
+            key = (key,)
+        column, year, entity = key + (None,) * (3 - len(key))
+        c = self._column(column)
+        e = self._entity(entity)
+        t = slice(None) if year is None else self._year(year)
+        return self.values[c, e, t]
+
+    def has_year(self, year):
+        return int(year) in self._year_index
+
+    def index(self, year):
+        """Position d'une année (ou d'une tranche d'années, bornes incluses) dans les séries"""
+        return self._year(year)
+
+    def array(self, columns=None):
+        """Tableau (entité × année × colonne), vue en lecture seule si columns est None"""
+        if columns is None:
+            return self.values.transpose(1, 2, 0)
+        return self.values[[self._column(c) for c in columns]].transpose(1, 2, 0)
+
+    def value(self, column, year, entity=None):
+        """Valeur d'une année (float), O(1)"""
+        return float(self[column, year, entity])
+
+    def first(self, column, entity=None):
+        return self.values[self._column(column), self._entity(entity), 0]
+
+    def last(self, column, entity=None):
+        return self.values[self._column(column), self._entity(entity), -1]
+
+    def frame(self, entity=None):
+        """Retour au DataFrame (une entité, ou format long pour tout l'ensemble)"""
+        if entity is not None or not self.has_entities:
+            e = self._entity(entity)
+            frame = pd.DataFrame(self.values[:, e, :].T, columns=self.columns)
+            frame.insert(0, 'Annee', self.years)
+            return frame
+        n_entities, n_years = len(self.entities), len(self.years)
+        frame = pd.DataFrame(self.values.transpose(1, 2, 0).reshape(n_entities * n_years, -1),
+                             columns=self.columns)
+        frame.insert(0, 'Annee', np.tile(self.years, n_entities))
+        frame.insert(0, self.entity_name, np.repeat(self.entities, n_years))
+        return frame
@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+# Nombre maximal de scénarios par requête (le résultat complet est tenu en mémoire)
+MAX_SCENARIOS = 10000
+
+
+def _make_analyzer(params):
+    from Ps import PSFinanceAnalyzer
+
+    analyzer = PSFinanceAnalyzer()
+    analyzer.config.update(params.get('config', {}))
+    return analyzer
+
+
+def _validate(params):
+    """Vérifie les paramètres d'une requête avant sa mise en file (ValueError → 400)"""
+    from Ps import PSFinanceAnalyzer
+
+    if not isinstance(params, dict):
+        raise ValueError("Le corps de la requête doit être un objet JSON")
+    for name, default, minimum, maximum in (('n_scenarios', 1, 1, MAX_SCENARIOS),
+                                            ('seed', 0, 0, None)):
+        value = params.get(name, default)
+        if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+            raise ValueError(f"{name} doit être un entier supérieur ou égal à {minimum}")
+        if maximum is not None and value > maximum:
+            raise ValueError(f"{name} ne peut pas dépasser {maximum}")
+
+    config = params.get('config', {})
+    if not isinstance(config, dict):
+        raise ValueError("config doit être un objet JSON")
+    defaults = PSFinanceAnalyzer().config
+    for key, value in config.items():
+        if key not in defaults:
+            raise ValueError(f"Paramètre de config inconnu: {key}")
+        # Les nombres entiers de la config par défaut acceptent aussi les flottants
+        expected = (int, float) if isinstance(defaults[key], (int, float)) else type(defaults[key])
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise ValueError(f"config.{key} doit être de type {type(defaults[key]).__name__}")
+
+
+def _run_simulation(params):
+    """Génère l'ensemble demandé et renvoie le CSV (exécuté dans le pool de processus)"""
+    analyzer = _make_analyzer(params)
+    chunks = []
+    header = True
+    for scenario, df in analyzer.iter_scenarios(int(params.get('n_scenarios', 1)),
+                                                 seed=params.get('seed', 0)):
+        df.insert(0, 'Scenario', scenario)
+        chunks.append(df.to_csv(index=False, header=header).encode('utf-8'))
+        header = False
+    return chunks
+
+
+def _run_report(params):
+    """Calcule les indicateurs clés de chaque scénario (exécuté dans le pool de processus)"""
+    analyzer = _make_analyzer(params)
+    reports = []
+    for scenario, df in analyzer.iter_scenarios(int(params.get('n_scenarios', 1)),
+                                                 seed=params.get('seed', 0)):
+        metrics = analyzer.compute_financial_metrics(df)
+        metrics = {k: float(v) if isinstance(v, (float, np.floating)) else v
+                   for k, v in metrics.items()}
+        metrics['scenario'] = scenario
+        reports.append(json.dumps(metrics).encode('utf-8') + b'\n')
+    return reports
+
+
+_JOBS = {
+    '/simulate': (_run_simulation, 'text/csv; charset=utf-8'),
+    '/report': (_run_report, 'application/x-ndjson'),
+}
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error',
+            503: 'Service Unavailable'}
+
+
+class PSSimulationService:
+    """Service local asyncio de simulations et de rapports
+
+    Les requêtes identiques en cours sont fusionnées (une seule exécution, résultat
+    partagé), le calcul est délégué à un pool de processus, la file est bornée
+    (503 + Retry-After quand elle est pleine) et les résultats sont renvoyés par
+    morceaux (HTTP chunked), un morceau par scénario. Le résultat complet est
+    calculé dans le pool avant l'envoi (il est partagé entre requêtes fusionnées):
+    l'envoi par morceaux ménage les clients lents, pas le pic mémoire.
+
+    Les paramètres invalides sont refusés avant la mise en file (400); une erreur
+    pendant le calcul est une erreur du service (500).
+    """
+
+    def __init__(self, max_workers=None, max_queue=64):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.executor = None
+        self._in_flight = {}
+        self._consumers = []
+        self.stats = {'recues': 0, 'fusionnees': 0, 'executees': 0, 'rejetees': 0}
+
+    async def start(self):
+        # forkserver: les processus du pool n'héritent pas des sockets clients ouverts
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                            mp_context=multiprocessing.get_context('forkserver'))
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.max_workers)]
+
+    async def stop(self):
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            key, func, params, future = await self.queue.get()
+            try:
+                result = await loop.run_in_executor(self.executor, func, params)
+                self.stats['executees'] += 1
+                future.set_result(result)
+            except Exception as exc:
+                future.set_exception(exc)
+            finally:
+                self._in_flight.pop(key, None)
+                self.queue.task_done()
+
+    def submit(self, path, params):
+        """Renvoie le futur du résultat, partagé avec toute requête identique en cours
+
+        Lève asyncio.QueueFull si la file est pleine (contre-pression).
+        """
+        self.stats['recues'] += 1
+        key = (path, json.dumps(params, sort_keys=True))
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats['fusionnees'] += 1
+            return future
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((key, _JOBS[path][0], params, future))
+        except asyncio.QueueFull:
+            self.stats['rejetees'] += 1
+            raise
+        self._in_flight[key] = future
+        return future
+
+    async def _respond(self, writer, status, body=b'', content_type='application/json',
+                       headers=None):
+        lines = [f"HTTP/1.1 {status} {_REASONS[status]}",
+                 f"Content-Type: {content_type}",
+                 f"Content-Length: {len(body)}",
+                 "Connection: close"]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+        await writer.drain()
+
+    async def _stream(self, writer, chunks, content_type):
+        head = (f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+                "Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        writer.write(head.encode('latin-1'))
+        for chunk in chunks:
+            writer.write(f"{len(chunk):X}\r\n".encode('latin-1') + chunk + b"\r\n")
+            # Contre-pression côté client lent
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            if len(request_line) < 2:
+                return await self._respond(writer, 400)
+            method, path = request_line[0], request_line[1]
+
+            if method == 'GET' and path == '/status':
+                status = dict(self.stats, file=self.queue.qsize(), en_cours=len(self._in_flight))
+                return await self._respond(writer, 200, json.dumps(status).encode('utf-8'))
+            if method != 'POST' or path not in _JOBS:
+                return await self._respond(writer, 404)
+
+            length = int(headers.get('content-length', 0))
+            try:
+                params = json.loads(await reader.readexactly(length)) if length else {}
+                _validate(params)
+            except ValueError as exc:
+                body = json.dumps({'erreur': str(exc)}).encode('utf-8')
+                return await self._respond(writer, 400, body)
+
+            try:
+                future = self.submit(path, params)
+            except asyncio.QueueFull:
+                return await self._respond(writer, 503, headers={'Retry-After': '1'})
+
+            try:
+                chunks = await asyncio.shield(future)
+            except Exception as exc:
+                body = json.dumps({'erreur': f"Erreur interne: {exc}"}).encode('utf-8')
+                return await self._respond(writer, 500, body)
+            await self._stream(writer, chunks, _JOBS[path][1])
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, unix_path=None):
+        """Démarre le service HTTP (TCP ou socket Unix) jusqu'à annulation"""
+        await self.start()
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle, path=unix_path)
+            print(f"🏛️ Service de simulation PS à l'écoute sur {unix_path}")
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+            print(f"🏛️ Service de simulation PS à l'écoute sur http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
+
+
+def main():
+    """Lance le service de simulation en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Service de simulation des finances du PS")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help="chemin d'un socket Unix")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-queue', type=int, default=64)
+    args = parser.parse_args()
+
+    service = PSSimulationService(max_workers=args.workers, max_queue=args.max_queue)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import numbers
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    config_id INTEGER PRIMARY KEY,
+    hash TEXT UNIQUE NOT NULL,
+    contenu TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS config_params (
+    config_id INTEGER NOT NULL REFERENCES configs(config_id),
+    nom TEXT NOT NULL,
+    valeur_num REAL,
+    valeur_texte TEXT,
+    PRIMARY KEY (config_id, nom)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_config_params_nom ON config_params (nom, valeur_num);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    config_id INTEGER NOT NULL REFERENCES configs(config_id),
+    libelle TEXT,
+    graine TEXT,
+    cree_le TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    metric_id INTEGER PRIMARY KEY,
+    nom TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    annee INTEGER NOT NULL,
+    metric_id INTEGER NOT NULL REFERENCES metrics(metric_id),
+    scenario INTEGER NOT NULL,
+    valeur REAL,
+    PRIMARY KEY (run_id, annee, metric_id, scenario)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_results_metric_annee ON results (metric_id, annee);
+"""
+
+# Agrégations calculées par SQLite (la médiane par fonctions de fenêtre)
+_AGGREGATES = {'mean': 'AVG', 'min': 'MIN', 'max': 'MAX', 'sum': 'SUM', 'count': 'COUNT'}
+_OPERATORS = {'=', '!=', '<', '<=', '>', '>='}
+
+
+def _param_value(value):
+    """(valeur_num, valeur_texte) d'un paramètre: nombres réels (scalaires NumPy compris,
+    booléens exclus) en colonne numérique, le reste en JSON"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        return float(value), None
+    return None, json.dumps(value, default=str)
+
+
+class PSResultStore:
+    """Base SQLite locale des exécutions: configurations, exécutions et valeurs annuelles
+
+    Tables normalisées (une ligne par exécution, année, métrique et scénario), index
+    sur (exécution, année, métrique), journal WAL et insertions groupées
+    (executemany dans une transaction). Les requêtes d'agrégation sont calculées
+    par SQLite: seules les lignes agrégées remontent en pandas.
+    """
+
+    def __init__(self, path='PS_resultats.sqlite'):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _config_id(self, config):
+        content = json.dumps(config, sort_keys=True, default=str)
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        row = self.connection.execute("SELECT config_id FROM configs WHERE hash = ?",
+                                      (digest,)).fetchone()
+        if row:
+            return row[0]
+        cursor = self.connection.execute("INSERT INTO configs (hash, contenu) VALUES (?, ?)",
+                                         (digest, content))
+        config_id = cursor.lastrowid
+        params = []
+        for name, value in config.items():
+            params.append((config_id, name) + _param_value(value))
+        self.connection.executemany(
+            "INSERT INTO config_params (config_id, nom, valeur_num, valeur_texte) VALUES (?, ?, ?, ?)",
+            params)
+        return config_id
+
+    def _metric_ids(self, names):
+        self.connection.executemany("INSERT OR IGNORE INTO metrics (nom) VALUES (?)",
+                                    [(name,) for name in names])
+        ids = dict(self.connection.execute("SELECT nom, metric_id FROM metrics"))
+        return np.array([ids[name] for name in names], dtype=np.int64)
+
+    def add_run(self, data, config, label=None, seed=None, extra=None):
+        """Enregistre une exécution (scénario unique ou ensemble long); renvoie son run_id
+
+        `config` est la configuration de l'analyseur; `extra` ajoute des paramètres de
+        balayage (ex. {'microsim_agents': 50000}) interrogeables comme la configuration.
+        """
+        config = dict(config, **(extra or {}))
+        columns = [c for c in data.columns if c not in ('Scenario', 'Annee')]
+        years = data['Annee'].to_numpy(dtype=np.int64)
+        scenarios = (data['Scenario'].to_numpy(dtype=np.int64) if 'Scenario' in data.columns
+                     else np.zeros(len(data), dtype=np.int64))
+        values = data[columns].to_numpy(dtype=np.float64)
+
+        with self.connection:
+            config_id = self._config_id(config)
+            cursor = self.connection.execute(
+                "INSERT INTO runs (config_id, libelle, graine, cree_le) VALUES (?, ?, ?, ?)",
+                (config_id, label, None if seed is None else str(seed),
+                 datetime.now().isoformat(timespec='seconds')))
+            run_id = cursor.lastrowid
+            metric_ids = self._metric_ids(columns)
+
+            # Format long (ligne × métrique) construit en NumPy, inséré en un seul lot
+            n_rows, n_metrics = values.shape
+            rows = zip(np.full(n_rows * n_metrics, run_id).tolist(),
+                       np.repeat(years, n_metrics).tolist(),
+                       np.tile(metric_ids, n_rows).tolist(),
+                       np.repeat(scenarios, n_metrics).tolist(),
+                       values.ravel().tolist())
+            self.connection.executemany(
+                "INSERT INTO results (run_id, annee, metric_id, scenario, valeur) "
+                "VALUES (?, ?, ?, ?, ?)", rows)
+        return run_id
+
+    def import_csv(self, path, config, label=None):
+        """Importe un ancien fichier CSV (ex. PS_financial_data_1971_2025.csv)"""
+        return self.add_run(pd.read_csv(path), config, label=label or path)
+
+    def _filters(self, where):
+        """Conditions sur les paramètres de configuration: {nom: valeur | (opérateur, valeur)}"""
+        clauses, params = [], []
+        for name, condition in (where or {}).items():
+            op, value = condition if isinstance(condition, tuple) else ('=', condition)
+            if op not in _OPERATORS:
+                raise ValueError(f"Opérateur non supporté: {op}")
+            number, text = _param_value(value)
+            field, value = ('valeur_texte', text) if number is None else ('valeur_num', number)
+            clauses.append("EXISTS (SELECT 1 FROM config_params p WHERE p.config_id = r.config_id "
+                           f"AND p.nom = ? AND p.{field} {op} ?)")
+            params += [name, value]
+        return clauses, params
+
+    def aggregate(self, metric, year=None, how='median', where=None, by=None):
+        """Agrège une métrique sur les exécutions sélectionnées, calculé par SQLite
+
+        how: 'median', 'mean', 'min', 'max', 'sum' ou 'count'; by: None, 'run' ou 'annee'.
+        Exemple: médiane de l'endettement 2025 quand budget_base > 25:
+        aggregate('Endettement', 2025, 'median', where={'budget_base': ('>', 25)})
+        """
+        clauses, params = self._filters(where)
+        clauses = ["m.nom = ?"] + clauses
+        params = [metric] + params
+        if year is not None:
+            clauses.append("v.annee = ?")
+            params.append(year)
+        group = {None: [], 'run': ['v.run_id'], 'annee': ['v.annee']}[by]
+        source = ("FROM results v JOIN metrics m ON m.metric_id = v.metric_id "
+                  "JOIN runs r ON r.run_id = v.run_id WHERE " + " AND ".join(clauses))
+
+        if how == 'median':
+            partition = f"PARTITION BY {', '.join(group)} " if group else ""
+            keys = "".join(f"{g.split('.')[1]}, " for g in group)
+            sql = (f"WITH ordered AS (SELECT {''.join(g + ', ' for g in group)}v.valeur, "
+                   f"ROW_NUMBER() OVER ({partition}ORDER BY v.valeur) AS rang, "
+                   f"COUNT(*) OVER ({partition.strip()}) AS n {source}) "
+                   f"SELECT {keys}AVG(valeur) AS valeur FROM ordered "
+                   "WHERE rang IN ((n + 1) / 2, (n + 2) / 2)"
+                   + (f" GROUP BY {keys.rstrip(', ')}" if group else ""))
+        else:
+            if how not in _AGGREGATES:
+                raise ValueError(f"Agrégation non supportée: {how}")
+            select = "".join(g + ', ' for g in group)
+            sql = (f"SELECT {select}{_AGGREGATES[how]}(v.valeur) AS valeur {source}"
+                   + (f" GROUP BY {', '.join(group)}" if group else ""))
+        frame = pd.read_sql_query(sql, self.connection, params=params)
+        return frame['valeur'].iloc[0] if not group else frame
+
+    def runs(self, where=None):
+        """Exécutions enregistrées (filtrées sur la configuration)"""
+        clauses, params = self._filters(where)
+        sql = ("SELECT r.run_id, r.libelle, r.graine, r.cree_le, c.hash FROM runs r "
+               "JOIN configs c ON c.config_id = r.config_id"
+               + (" WHERE " + " AND ".join(clauses) if clauses else "") + " ORDER BY r.run_id")
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    def query(self, sql, params=()):
+        """Requête SQL libre → DataFrame"""
+        return pd.read_sql_query(sql, self.connection, params=list(params))
@@ -0,0 +1,166 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from ps_kernels import compound_paths
+from ps_microsim import PSMembershipMicrosim
+from ps_series import PSSeriesStore
+
+
+class PSWhatIf:
+    """Recalcul incrémental d'un jeu de données généré quand un choc ou un régime change
+
+    Chaque colonne est décomposée en valeur = croissance * residu * choc, où la
+    croissance est la partie déterministe des régimes (growth_regimes, debt_regime),
+    le choc le facteur de party_events et le résidu la base et le bruit tirés lors
+    de la génération. Modifier une entrée ne recalcule que les cellules qui en
+    dépendent (et, pour l'endettement, la récurrence à partir de l'année touchée).
+    Les colonnes issues de la microsimulation (analyzer.microsim_agents) intègrent
+    les chocs dans la dynamique des agents: elles ne sont pas recalculables en
+    place et leurs chocs et régimes ne peuvent pas être modifiés.
+    """
+
+    def __init__(self, analyzer, df):
+        self.analyzer = analyzer
+        self.growth_regimes = copy.deepcopy(analyzer.growth_regimes)
+        self.debt_regime = dict(analyzer.debt_regime)
+        self.party_events = copy.deepcopy(analyzer.party_events)
+        self.microsim_columns = PSMembershipMicrosim.colonnes if analyzer.microsim_agents else ()
+
+        # Lignes des années résolues par l'index du store; les valeurs sont copiées
+        # (modifiables) une fois depuis ses séries
+        store = PSSeriesStore.of(df)
+        self.years = store.years
+        self.columns = list(store.columns)
+        self._row = store.index
+        self._has_year = store.has_year
+        self._steps = np.arange(len(self.years), dtype=np.float64)
+
+        self._values = {c: store[c].copy() for c in self.columns}
+        self._growth = {}
+        self._shock = {}
+        self._residual = {}
+        self._dependencies = {}
+        self._rows = {}
+
+        if 'Endettement' in self._values:
+            self._debt_keys = list(self.debt_regime)
+            keys = np.array([self.analyzer._debt_regime_key(int(y)) for y in self.years])
+            self._debt_codes = np.array([self._debt_keys.index(k) for k in keys])
+            for code, key in enumerate(self._debt_keys):
+                rows = np.flatnonzero(self._debt_codes == code)
+                self._rows[('dette', key)] = rows
+                # Récurrence: toutes les années à partir de la première occurrence
+                first = rows[0] if len(rows) else len(self.years)
+                self._dependencies[('dette', key)] = [('Endettement', int(y)) for y in self.years[first:]]
+
+        for column in self.columns:
+            shock = np.ones(len(self.years))
+            for year, shocks in self.party_events.items():
+                if column in shocks and self._has_year(year):
+                    shock[self._row(year)] = shocks[column]
+                    self._dependencies[('choc', year, column)] = [(column, year)]
+            self._shock[column] = shock
+            self._growth[column] = self._compute_growth(column)
+
+            denom = self._growth[column] * shock
+            residual = np.zeros(len(self.years))
+            np.divide(self._values[column], denom, out=residual, where=denom != 0)
+            self._residual[column] = residual
+
+        for column, regime in self.growth_regimes.items():
+            if column not in self._values:
+                continue
+            index = self._regime_indices(column)
+            for k in range(len(regime['periodes']) + 1):
+                rows = np.flatnonzero(index == k)
+                self._rows[('regime', column, k)] = rows
+                self._dependencies[('regime', column, k)] = [(column, int(self.years[r])) for r in rows]
+
+    def _regime_indices(self, column):
+        """Indice d'entrée de régime pour chaque année (les bornes des périodes sont fixes)"""
+        return np.array([self.analyzer._regime_index(column, int(y)) for y in self.years])
+
+    def _regime_rates(self, column):
+        regime = self.growth_regimes[column]
+        rates = np.array([p[2] for p in regime['periodes']] + [regime['defaut']])
+        return rates[self._regime_indices(column)]
+
+    def _debt_rates(self):
+        return np.array([self.debt_regime[k] for k in self._debt_keys])[self._debt_codes]
+
+    def _compute_growth(self, column):
+        """Partie déterministe de la colonne"""
+        if column in self.growth_regimes:
+            echelle = self.growth_regimes[column]['echelle']
+            return 1 + self._regime_rates(column) * (self._steps / echelle)
+        if column == 'Endettement':
+            return compound_paths(1.0, self._debt_rates())
+        return np.ones(len(self.years))
+
+    def _refresh(self, column, rows):
+        values = self._values[column]
+        values[rows] = self._growth[column][rows] * self._residual[column][rows] * self._shock[column][rows]
+
+    def dependents(self, key):
+        """Cellules (colonne, année) qui dépendent d'une entrée de régime ou d'un choc
+
+        Clés: ('choc', année, colonne), ('regime', colonne, indice) et ('dette', position).
+        """
+        return list(self._dependencies.get(key, []))
+
+    def _check_incremental(self, column):
+        if column in self.microsim_columns:
+            raise ValueError(f"{column} provient de la microsimulation: régénérer le jeu de données "
+                             f"avec generate_financial_data plutôt que de le recalculer en place")
+
+    def set_shock(self, year, column, factor):
+        """Modifie le choc d'une année sur une colonne; renvoie les cellules recalculées"""
+        self._check_incremental(column)
+        row = self._row(year)
+        self.party_events.setdefault(year, {})[column] = factor
+        self._shock[column][row] = factor
+        self._refresh(column, row)
+        self._dependencies[('choc', year, column)] = [(column, year)]
+        return self.dependents(('choc', year, column))
+
+    def set_regime(self, column, index, rate):
+        """Modifie le taux d'une entrée de régime de croissance (indice len(periodes) = défaut)"""
+        self._check_incremental(column)
+        regime = self.growth_regimes[column]
+        if index == len(regime['periodes']):
+            regime['defaut'] = rate
+        else:
+            debut, fin, _ = regime['periodes'][index]
+            regime['periodes'][index] = (debut, fin, rate)
+
+        rows = self._rows[('regime', column, index)]
+        echelle = regime['echelle']
+        self._growth[column][rows] = 1 + rate * (self._steps[rows] / echelle)
+        self._refresh(column, rows)
+        return self.dependents(('regime', column, index))
+
+    def set_debt_regime(self, key, rate):
+        """Modifie la variation de dette d'une position du cycle et propage la récurrence"""
+        self.debt_regime[key] = rate
+        rows = self._rows[('dette', key)]
+        if not len(rows):
+            return []
+        first = rows[0]
+        rates = self._debt_rates()[first:]
+        previous = self._growth['Endettement'][first - 1] if first > 0 else 1.0
+        self._growth['Endettement'][first:] = compound_paths(previous, rates)
+        self._refresh('Endettement', slice(first, None))
+        return self.dependents(('dette', key))
+
+    def value(self, column, year):
+        """Valeur courante d'une cellule"""
+        return self._values[column][self._row(year)]
+
+    @property
+    def data(self):
+        """Jeu de données courant (nouveau DataFrame)"""
+        frame = {'Annee': self.years}
+        frame.update({c: self._values[c].copy() for c in self.columns})
+        return pd.DataFrame(frame)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from Ps import PSFinanceAnalyzer
+
+
+def test_generation_does_not_depend_on_max_workers():
+    analyzer = PSFinanceAnalyzer()
+    frames = []
+    for max_workers in (None, 1, 4):
+        np.random.seed(11)
+        frames.append(analyzer.generate_financial_data(verbose=False, max_workers=max_workers))
+    for df in frames[1:]:
+        pd.testing.assert_frame_equal(df, frames[0])
+
+
+def test_unseeded_bootstrap_leaves_global_generator_untouched():
+    analyzer = PSFinanceAnalyzer()
+    np.random.seed(5)
+    df = analyzer.generate_financial_data(verbose=False)
+    state = np.random.get_state()
+    expected = np.random.random()
+
+    np.random.set_state(state)
+    analyzer.bootstrap_metrics(df, n_boot=100)
+    assert np.random.random() == expected
+
+
+def test_metrics_match_bootstrap_estimates():
+    analyzer = PSFinanceAnalyzer()
+    np.random.seed(6)
+    df = analyzer.generate_financial_data(verbose=False)
+    metrics = analyzer.compute_financial_metrics(df)
+    intervals = analyzer.bootstrap_metrics(df, n_boot=100, seed=1)
+    assert list(metrics) == list(intervals.index)
+    assert [metrics[k] for k in metrics] == intervals['Estimation'].tolist()
+
+
+def test_scenarios_leave_global_generator_untouched():
+    analyzer = PSFinanceAnalyzer()
+    np.random.seed(8)
+    expected = np.random.random()
+
+    np.random.seed(8)
+    first = [df for _, df in analyzer.iter_scenarios(3, seed=4)]
+    assert np.random.random() == expected
+
+    # Même graine: mêmes scénarios, quel que soit l'état du générateur global
+    second = [df for _, df in analyzer.iter_scenarios(3, seed=4)]
+    for a, b in zip(first, second):
+        pd.testing.assert_frame_equal(a, b)
+    assert not first[0].equals(first[1])
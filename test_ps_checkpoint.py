@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import ps_checkpoint
+from Ps import PSFinanceAnalyzer
+from ps_checkpoint import PSEnsembleJob
+
+
+def test_resume_after_crash_between_accumulators_and_manifest(tmp_path, monkeypatch):
+    analyzer = PSFinanceAnalyzer()
+    reference = PSEnsembleJob(analyzer, str(tmp_path / 'reference'), 6, seed=7, chunk_size=3)
+    reference.run(verbose=False)
+
+    path = str(tmp_path / 'job')
+    PSEnsembleJob(analyzer, path, 6, seed=7, chunk_size=3).run(max_chunks=1, verbose=False)
+
+    # Interruption après l'écriture des accumulateurs du second bloc, avant le manifeste
+    write = ps_checkpoint._atomic_write
+
+    def crash_on_manifest(target, func):
+        if target.endswith(PSEnsembleJob.MANIFEST):
+            raise KeyboardInterrupt
+        write(target, func)
+    monkeypatch.setattr(ps_checkpoint, '_atomic_write', crash_on_manifest)
+    with pytest.raises(KeyboardInterrupt):
+        PSEnsembleJob(analyzer, path, 6, seed=7, chunk_size=3).run(verbose=False)
+    monkeypatch.setattr(ps_checkpoint, '_atomic_write', write)
+
+    resumed = PSEnsembleJob(analyzer, path, 6, seed=7, chunk_size=3)
+    assert resumed.accumulators['n'][0] == 3
+    assert resumed.run(verbose=False)
+
+    assert resumed.accumulators['n'][0] == 6
+    np.testing.assert_array_equal(resumed.accumulators['somme'], reference.accumulators['somme'])
+    pd.testing.assert_frame_equal(resumed.summary(), reference.summary())
+    pd.testing.assert_frame_equal(resumed.result(), reference.result())
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import ks_2samp
+
+from ps_compare import PSScenarioComparison
+from ps_kernels import ks_sorted
+
+
+def _ensemble(rng, n_scenarios, years, shift):
+    # Valeurs entières sur une petite plage: nombreux ex aequo entre et dans les échantillons
+    n_years = len(years)
+    return pd.DataFrame({
+        'Scenario': np.repeat(np.arange(n_scenarios), n_years),
+        'Annee': np.tile(years, n_scenarios),
+        'Adherents': rng.integers(0, 6, n_scenarios * n_years) + shift,
+        'Maires': rng.normal(shift, 1.0, n_scenarios * n_years).round(1),
+    })
+
+
+def test_ks_sorted_matches_scipy_with_ties():
+    rng = np.random.default_rng(0)
+    base = np.sort(rng.integers(0, 5, (4, 30)).astype(np.float64), axis=-1)
+    variants = np.sort(rng.integers(0, 6, (2, 4, 17)).astype(np.float64), axis=-1)
+    ks = ks_sorted(base, variants)
+    for v in range(2):
+        for r in range(4):
+            expected = ks_2samp(base[r], variants[v, r], method='asymp').statistic
+            np.testing.assert_allclose(ks[v, r], expected, rtol=0, atol=1e-12)
+
+
+def test_comparison_matches_scipy_and_numpy_quantiles():
+    rng = np.random.default_rng(1)
+    years = np.arange(2000, 2004)
+    baseline = _ensemble(rng, 40, years, 0)
+    variants = {'egal': _ensemble(rng, 40, years, 0), 'decale': _ensemble(rng, 25, years, 1)}
+    quantiles = (0.05, 0.5, 0.95)
+    comparison = PSScenarioComparison(baseline, variants, quantiles=quantiles, max_memory='1KB')
+
+    for v, df in enumerate(variants.values()):
+        for c, column in enumerate(comparison.columns):
+            for t, year in enumerate(years):
+                base = baseline.loc[baseline['Annee'] == year, column].to_numpy(dtype=np.float64)
+                values = df.loc[df['Annee'] == year, column].to_numpy(dtype=np.float64)
+                np.testing.assert_allclose(comparison.ks[v, t, c],
+                                           ks_2samp(base, values, method='asymp').statistic,
+                                           atol=1e-12)
+                np.testing.assert_allclose(
+                    comparison.quantile_shift[v, :, t, c],
+                    np.quantile(values, quantiles) - np.quantile(base, quantiles), atol=1e-12)
+                np.testing.assert_allclose(comparison.delta[v, t, c],
+                                           values.mean() - base.mean(), atol=1e-12)
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Ps import PSFinanceAnalyzer
+
+
+def test_cycle_reductions_match_groupby():
+    analyzer = PSFinanceAnalyzer()
+    ensemble = pd.concat([df.assign(Scenario=k) for k, df in analyzer.iter_scenarios(2, seed=5)],
+                         ignore_index=True)
+    index = analyzer.cycle_index()
+    elections = np.asarray(sorted(analyzer.presidential_years))
+
+    # Référence: début de cycle de chaque année, puis groupby pandas
+    start = elections[np.searchsorted(elections, ensemble['Annee'], side='right') - 1]
+    start = np.where(ensemble['Annee'] < elections[0], analyzer.start_year, start)
+    expected = (ensemble.assign(Debut_Cycle=start)
+                .groupby(['Scenario', 'Debut_Cycle'])[['Revenus_Total', 'Adherents']].mean()
+                .reset_index())
+    means = index.cycle_totals(ensemble, how='mean')[expected.columns]
+    pd.testing.assert_frame_equal(means, expected, check_dtype=False)
+
+    deltas = index.election_deltas(ensemble).set_index(['Scenario', 'Election', 'Phase'])
+    series = ensemble.set_index(['Scenario', 'Annee'])['Revenus_Total']
+    for year in (1981, 2017):
+        assert deltas.loc[(1, year, 'pre'), 'Revenus_Total'] == pytest.approx(
+            series[1, year] - series[1, year - 1], rel=1e-12)
+        assert deltas.loc[(1, year, 'post'), 'Revenus_Total'] == pytest.approx(
+            series[1, year + 1] - series[1, year], rel=1e-12)
+
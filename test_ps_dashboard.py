@@ -0,0 +1,37 @@
+import matplotlib
+matplotlib.use('agg')
+
+import numpy as np
+
+from Ps import PSFinanceAnalyzer
+
+
+def _data_pixels(frame):
+    """Pixels rouges (couleur des séries) de l'image RGBA"""
+    return int(((frame[..., 0] > 200) & (frame[..., 1] < 80) & (frame[..., 2] < 80)).sum())
+
+
+def test_frame_contains_data_after_full_redraw():
+    analyzer = PSFinanceAnalyzer()
+    np.random.seed(0)
+    df = analyzer.generate_financial_data(verbose=False)
+    dashboard = analyzer.create_dashboard(df)
+    try:
+        initial = _data_pixels(dashboard.frame())
+
+        # Changement d'échelle: rendu complet (pas de blitting)
+        scaled = df.copy()
+        scaled['Revenus_Total'] *= 5
+        limits = dashboard._current_limits()
+        dashboard.update(scaled)
+        assert dashboard._current_limits() != limits
+        redrawn = _data_pixels(dashboard.frame())
+
+        # Échelles inchangées: mise à jour par blitting
+        dashboard.update(scaled)
+        blitted = _data_pixels(dashboard.frame())
+
+        assert initial > 0.5 * blitted
+        assert redrawn == blitted
+    finally:
+        dashboard.close()
@@ -0,0 +1,20 @@
+import numpy as np
+
+from Ps import PSFinanceAnalyzer
+from ps_detection import PSBreakDetector, anomalies
+
+
+def test_anomaly_rate_on_gaussian_noise():
+    noise = np.random.default_rng(0).normal(size=(100, 2000))
+    rate = anomalies(noise, threshold=3.5).mean()
+    # P(|Z| > 3.5) ≈ 0.047 %
+    assert 0.0002 < rate < 0.001
+
+
+def test_2017_collapse_detected_as_break():
+    analyzer = PSFinanceAnalyzer()
+    detector = PSBreakDetector()
+    for seed in range(5):
+        np.random.seed(seed)
+        df = analyzer.generate_financial_data(verbose=False)
+        assert detector.events(df).get(2017) == 'rupture'
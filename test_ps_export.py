@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from openpyxl import load_workbook
+
+from Ps import PSFinanceAnalyzer
+from ps_export import PSExcelExporter
+
+
+def test_full_sheet_rolls_over(tmp_path):
+    analyzer = PSFinanceAnalyzer()
+    scenarios = list(analyzer.iter_scenarios(3, seed=2))
+    path = str(tmp_path / 'ensemble.xlsx')
+    with PSExcelExporter(path) as exporter:
+        exporter.max_rows = 100
+        for scenario, df in scenarios:
+            exporter.write_scenario(scenario, df)
+
+    workbook = load_workbook(path, read_only=True)
+    n_years = len(scenarios[0][1])
+    parts = ['Revenus'] + [f'Revenus_{k}' for k in range(2, -(-3 * n_years // 99) + 1)]
+    assert [name for name in workbook.sheetnames if name.startswith('Revenus')] == parts
+    rows = []
+    for name in parts:
+        sheet = list(workbook[name].values)
+        assert len(sheet) <= 100
+        assert sheet[0][:2] == ('Scenario', 'Annee')
+        rows.extend(sheet[1:])
+    assert len(rows) == 3 * n_years
+    expected = np.concatenate([df['Revenus_Total'].to_numpy() for _, df in scenarios])
+    np.testing.assert_allclose([row[2] for row in rows], expected)
+    workbook.close()
+
+
+def test_failed_export_leaves_no_workbook(tmp_path):
+    analyzer = PSFinanceAnalyzer()
+    path = tmp_path / 'ensemble.xlsx'
+    with pytest.raises(KeyError):
+        with PSExcelExporter(str(path)) as exporter:
+            for scenario, df in analyzer.iter_scenarios(2, seed=2):
+                exporter.write_scenario(scenario, df.drop(columns='Endettement'))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from Ps import PSFinanceAnalyzer
+from ps_federations import PSFederationModel
+
+
+def test_federation_totals_match_national_series():
+    analyzer = PSFinanceAnalyzer()
+    years = np.arange(analyzer.start_year, analyzer.end_year + 1)
+    national = PSFederationModel(analyzer, n_federations=2000, seed=3).run(years).national()
+
+    # Séries nationales sans bruit: base × régime × chocs historiques
+    trends = pd.DataFrame({'Annee': years})
+    for shocks in analyzer.party_events.values():
+        for column in shocks:
+            trends[column] = 1.0
+    for column in ('Adherents', 'Maires'):
+        trends[column] = analyzer._regime_growth(column, years)
+    analyzer._add_party_trends(trends)
+    expected = {'Adherents': analyzer.config['adherents_base'] * trends['Adherents'],
+                'Maires': analyzer.config['maires_base'] * trends['Maires']}
+
+    for column, values in expected.items():
+        # Années où la croissance n'est pas écrêtée par le plancher du modèle local
+        kept = analyzer._regime_growth(column, years) > 0.3
+        np.testing.assert_allclose(national.loc[kept, column], values[kept], rtol=0.05)
+    assert national.set_index('Annee').loc[1971, 'Adherents'] > 1.8 * analyzer.config['adherents_base']
+
+
+def test_microsim_members_follow_federation_weights():
+    analyzer = PSFinanceAnalyzer()
+    analyzer.microsim_agents = 50000
+    result = analyzer.generate_federation_data(n_federations=50, seed=11)
+
+    # Poids structurels du modèle agrégé, tirés avec le même flux dérivé de la graine
+    model_seed, _ = np.random.SeedSequence(11).spawn(2)
+    size = PSFederationModel(analyzer, n_federations=50, seed=model_seed).size
+    shares = result.shares('Adherents')[:, 0]
+    np.testing.assert_allclose(shares, size, atol=0.01)
+    assert np.corrcoef(shares, size)[0, 1] > 0.95
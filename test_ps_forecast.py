@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+import ps_forecast
+from Ps import PSFinanceAnalyzer
+from ps_forecast import PSForecaster
+
+
+def test_ensemble_forecast_and_disk_cache(tmp_path, monkeypatch):
+    analyzer = PSFinanceAnalyzer()
+    ensemble = pd.concat([df.assign(Scenario=k) for k, df in analyzer.iter_scenarios(2, seed=3)],
+                         ignore_index=True)
+    columns = ['Revenus_Total', 'Adherents']
+    last_year = int(ensemble['Annee'].max())
+
+    forecaster = PSForecaster(max_workers=1, cache_dir=str(tmp_path))
+    forecast = forecaster.forecast(ensemble, until_year=last_year + 4, columns=columns)
+    assert len(forecast) == 2 * len(columns) * 4
+    assert sorted(forecast['Annee'].unique()) == list(range(last_year + 1, last_year + 5))
+    assert (forecast['Borne_Inf'] <= forecast['Prevision']).all()
+    assert (forecast['Prevision'] <= forecast['Borne_Sup']).all()
+
+    # Un nouveau forecaster relit les modèles du cache disque sans rien réajuster
+    def refit(task):
+        raise AssertionError("modèle réajusté malgré le cache")
+    monkeypatch.setattr(ps_forecast, '_fit_series', refit)
+    cached = PSForecaster(max_workers=1, cache_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(
+        cached.forecast(ensemble, until_year=last_year + 4, columns=columns), forecast)
+    np.testing.assert_array_equal(
+        cached.forecast_cycles(ensemble, cycle_years=(last_year + 2,), columns=columns)['Annee'],
+        last_year + 2)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('numba')
+
+from ps_kernels import (_compound_jit, _compound_numpy, _exits_jit, _exits_numpy, _ks_jit,
+                        _ks_numpy)
+
+
+def test_compound_kernels_agree():
+    rng = np.random.default_rng(0)
+    start = rng.uniform(1, 10, 5)
+    rates = rng.normal(0.02, 0.05, (5, 55))
+    np.testing.assert_array_equal(_compound_jit(start, rates), _compound_numpy(start, rates))
+
+
+@pytest.mark.parametrize('shock', [1.0, 0.6])
+def test_exit_kernels_agree(shock):
+    rng = np.random.default_rng(1)
+    n = 10000
+    seniority = rng.integers(0, 20, n).astype(np.int16)
+    tier = rng.integers(0, 4, n).astype(np.int8)
+    draws = rng.random(n)
+    fidelity = np.array([1.2, 1.0, 0.9, 0.7])
+    np.testing.assert_array_equal(_exits_jit(seniority, tier, draws, 0.1, fidelity, shock),
+                                  _exits_numpy(seniority, tier, draws, 0.1, fidelity, shock))
+
+
+def test_ks_kernels_agree_with_ties_and_nan():
+    rng = np.random.default_rng(2)
+    base = np.sort(rng.integers(0, 8, (6, 40)).astype(np.float64), axis=-1)
+    variants = rng.integers(0, 8, (3, 6, 25)).astype(np.float64)
+    # NaN dans la référence, dans les variantes, ou des deux côtés
+    base[1, -5:] = np.nan
+    variants[0, 2, :4] = np.nan
+    variants[1, 1, :10] = np.nan
+    variants[2, 3, :] = np.nan
+    variants = np.sort(variants, axis=-1)
+    np.testing.assert_array_equal(_ks_jit(base, variants), _ks_numpy(base, variants))
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Ps import PSFinanceAnalyzer
+from ps_memory import PSMemoryPlanner, parse_memory
+
+
+def test_budgeted_chunks_match_the_full_ensemble():
+    analyzer = PSFinanceAnalyzer()
+    full = analyzer.generate_ensemble(7, seed=9)
+    per_scenario = PSMemoryPlanner(analyzer, '1GB').scenario_bytes()
+
+    # Budget de 3 scénarios (plus le scénario en cours): blocs de 3, 3 et 1
+    budget = 5 * per_scenario
+    chunks = list(analyzer.iter_ensemble(7, seed=9, max_memory=budget))
+    assert [chunk['Scenario'].nunique() for chunk in chunks] == [3, 3, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), full)
+    assert analyzer.memory_report['pic_estime'] <= budget
+
+    with pytest.raises(MemoryError):
+        analyzer.generate_ensemble(7, seed=9, max_memory=budget)
+    bounded = analyzer.generate_ensemble(3, seed=9, max_memory=budget)
+    pd.testing.assert_frame_equal(bounded, full[full['Scenario'] < 3])
+
+
+def test_parse_memory_units():
+    assert parse_memory('4GB') == 4 * 10**9
+    assert parse_memory('512MiB') == 512 * 2**20
+    assert parse_memory(np.int64(1000)) == 1000
+    with pytest.raises(ValueError):
+        parse_memory('4 parsecs')
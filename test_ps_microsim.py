@@ -0,0 +1,16 @@
+import numpy as np
+
+from Ps import PSFinanceAnalyzer
+from ps_microsim import PSMembershipMicrosim
+
+
+def test_federation_ids_beyond_256_do_not_wrap():
+    analyzer = PSFinanceAnalyzer()
+    years = np.arange(analyzer.start_year, analyzer.start_year + 3)
+    result = PSMembershipMicrosim(analyzer, n_agents=20000, n_federations=300, seed=1).run(years)
+
+    per_federation = result['Adherents_Federations']
+    assert per_federation.shape == (3, 300)
+    # Les fédérations 256 à 299 reçoivent des adhérents et le total est conservé
+    assert per_federation[:, 256:].sum(axis=1).min() > 0
+    np.testing.assert_allclose(per_federation.sum(axis=1), result['Adherents'])
@@ -0,0 +1,47 @@
+import matplotlib
+matplotlib.use('agg')
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from Ps import PSFinanceAnalyzer
+
+
+def test_bars_are_one_collection_per_series():
+    analyzer = PSFinanceAnalyzer()
+    fig, ax = plt.subplots()
+    try:
+        years = np.arange(1971, 2026)
+        heights = np.linspace(1, 3, len(years))
+        collection = analyzer._plot_bars(ax, years, heights, bottom=0.5)
+        assert list(ax.collections) == [collection]
+        verts = np.stack([path.vertices[:4] for path in collection.get_paths()])
+        assert len(verts) == len(years)
+        np.testing.assert_allclose(verts[:, 0, 1], 0.5)
+        np.testing.assert_allclose(verts[:, 1, 1], 0.5 + heights)
+        np.testing.assert_allclose(verts[:, 0, 0], years - 0.4)
+    finally:
+        plt.close(fig)
+
+
+def test_long_series_are_bounded_by_axis_resolution():
+    analyzer = PSFinanceAnalyzer()
+    fig, ax = plt.subplots()
+    try:
+        x = np.arange(200000, dtype=np.float64)
+        y = np.sin(x / 5000)
+        y[123457] = 10.0  # pic isolé, conservé par LTTB
+        line = analyzer._plot_line(ax, x, y)
+        xs, ys = line.get_data()
+        assert len(xs) <= analyzer._max_points(ax)
+        assert xs[0] == 0 and xs[-1] == x[-1]
+        assert ys.max() == 10.0
+
+        signed = np.where(y > 0, '#009900', '#FF0000')
+        collection = analyzer._plot_bars(ax, x, y, color=signed)
+        # Un polygone en escalier par couleur, de taille bornée par la résolution
+        paths = collection.get_paths()
+        assert len(paths) == 2
+        assert max(len(path.vertices) for path in paths) <= 4 * analyzer._max_points(ax)
+    finally:
+        plt.close(fig)
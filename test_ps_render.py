@@ -0,0 +1,45 @@
+import matplotlib
+matplotlib.use('agg')
+
+import os
+
+import numpy as np
+
+from Ps import PSFinanceAnalyzer
+from ps_render import PANELS, PSRenderCache
+
+
+def test_only_changed_panels_are_redrawn(tmp_path):
+    analyzer = PSFinanceAnalyzer()
+    np.random.seed(4)
+    df = analyzer.generate_financial_data(verbose=False)
+    cache = PSRenderCache(analyzer, str(tmp_path / 'cache'))
+    output = str(tmp_path / 'analyse.png')
+
+    assert cache.render(df, output, quality='apercu') == {'rendus': len(PANELS) + 1, 'caches': 0}
+    # Rien n'a changé: la figure assemblée est relue telle quelle
+    assert cache.render(df, output, quality='apercu') == {'rendus': 0, 'caches': 1}
+
+    # Une colonne d'un seul panneau modifiée: ce panneau seul est retracé
+    changed = df.copy()
+    changed['Endettement'] *= 1.5
+    assert cache.render(changed, output, quality='apercu') == {'rendus': 1,
+                                                               'caches': len(PANELS)}
+    assert os.path.getsize(output) > 0
+
+
+def test_cache_is_bounded_and_optional(tmp_path):
+    analyzer = PSFinanceAnalyzer()
+    np.random.seed(4)
+    df = analyzer.generate_financial_data(verbose=False)
+
+    cache_dir = tmp_path / 'cache'
+    PSRenderCache(analyzer, str(cache_dir), max_size='200KB').render(
+        df, str(tmp_path / 'analyse.png'), quality='apercu')
+    assert sum(entry.stat().st_size for entry in os.scandir(cache_dir)) <= 200e3
+
+    # Sans cache_dir, seul le fichier demandé est écrit
+    plain = tmp_path / 'sans_cache'
+    plain.mkdir()
+    PSRenderCache(analyzer).render(df, str(plain / 'analyse.png'), quality='apercu')
+    assert os.listdir(plain) == ['analyse.png']
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Ps import PSFinanceAnalyzer
+from ps_series import PSSeriesStore
+
+
+def test_store_lookups_match_dataframe():
+    analyzer = PSFinanceAnalyzer()
+    ensemble = analyzer.generate_ensemble(3, seed=8)
+    # Lignes mélangées: le store réordonne par scénario puis par année
+    store = PSSeriesStore.of(ensemble.sample(frac=1, random_state=0))
+    indexed = ensemble.set_index(['Scenario', 'Annee'])
+
+    assert store.value('Revenus_Total', 1981, 2) == indexed.loc[(2, 1981), 'Revenus_Total']
+    np.testing.assert_array_equal(store['Adherents', 1981:1995, 1],
+                                  indexed.loc[1].loc[1981:1995, 'Adherents'].to_numpy())
+    assert store['Maires'].shape == (3, len(store.years))
+    assert store.array(['Endettement', 'Maires']).shape == (3, len(store.years), 2)
+    assert store.index(slice(2000, 2002)) == slice(29, 32)
+    pd.testing.assert_frame_equal(store.frame(), ensemble, check_dtype=False)
+
+    with pytest.raises(KeyError):
+        store['Revenus_Total', 1950]
+    with pytest.raises(ValueError):
+        store['Revenus_Total'][0, 0] = 0.0
+
+
+def test_federation_frames_are_indexed_by_federation():
+    analyzer = PSFinanceAnalyzer()
+    result = analyzer.generate_federation_data(n_federations=5, seed=2)
+    store = PSSeriesStore.of(result.frame())
+    assert store.entity_name == 'Federation'
+    np.testing.assert_array_equal(store['Adherents', None, 'F003'],
+                                  result.values[2, :, result.metrics.index('Adherents')])
+    assert list(store.frame().columns[:2]) == ['Federation', 'Annee']
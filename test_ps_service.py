@@ -0,0 +1,47 @@
+import asyncio
+import json
+
+import pytest
+
+from ps_service import MAX_SCENARIOS, PSSimulationService, _validate
+
+
+@pytest.mark.parametrize('params', [
+    {'n_scenarios': 0},
+    {'n_scenarios': MAX_SCENARIOS + 1},
+    {'n_scenarios': True},
+    {'seed': -1},
+    {'config': []},
+    {'config': {'adherents': 1000}},
+    {'config': {'adherents_base': '100000'}},
+    {'config': {'electorat_cible': 'ouvriers'}},
+])
+def test_invalid_parameters_are_rejected(params):
+    with pytest.raises(ValueError):
+        _validate(params)
+
+
+def test_valid_parameters_are_accepted():
+    _validate({'n_scenarios': MAX_SCENARIOS, 'seed': 3,
+               'config': {'adherents_base': 120000, 'budget_base': 25.5, 'orientation': 'centre_gauche'}})
+
+
+def test_invalid_request_answers_400_before_queueing():
+    async def request(body):
+        service = PSSimulationService(max_workers=1)
+        server = await asyncio.start_server(service.handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            payload = json.dumps(body).encode('utf-8')
+            writer.write(b"POST /simulate HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(payload)
+                         + payload)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        return response, service.stats
+
+    response, stats = asyncio.run(request({'n_scenarios': 2, 'config': {'inconnu': 1}}))
+    assert response.startswith(b"HTTP/1.1 400")
+    assert b"inconnu" in response
+    assert stats['recues'] == 0
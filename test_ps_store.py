@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Ps import PSFinanceAnalyzer
+from ps_store import PSResultStore
+
+
+def test_sql_aggregates_match_pandas(tmp_path):
+    analyzer = PSFinanceAnalyzer()
+    small = analyzer.generate_ensemble(3, seed=1)
+    large = analyzer.generate_ensemble(4, seed=2)
+    with PSResultStore(str(tmp_path / 'resultats.sqlite')) as store:
+        store.add_run(small, dict(analyzer.config, budget_base=20),
+                      extra={'agents': np.int64(50000), 'microsim': False})
+        run_id = store.add_run(large, dict(analyzer.config, budget_base=30),
+                               extra={'agents': np.int64(80000), 'microsim': True})
+
+        last = large[large['Annee'] == 2025]['Endettement']
+        both = pd.concat([small, large])
+        assert store.aggregate('Endettement', 2025, 'median',
+                               where={'budget_base': ('>', 25)}) == pytest.approx(last.median())
+        assert store.aggregate('Endettement', 2025, 'mean') == pytest.approx(
+            both[both['Annee'] == 2025]['Endettement'].mean())
+
+        by_year = store.aggregate('Adherents', how='median', where={'agents': np.int64(80000)},
+                                  by='annee')
+        np.testing.assert_allclose(by_year['valeur'],
+                                   large.groupby('Annee')['Adherents'].median().to_numpy())
+
+        # Booléens stockés en texte (JSON): le filtre True ne retient que l'exécution microsimulée
+        assert store.runs(where={'microsim': True})['run_id'].tolist() == [run_id]
+        with pytest.raises(ValueError):
+            store.aggregate('Endettement', 2025, how='mode')
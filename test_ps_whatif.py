@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Ps import PSFinanceAnalyzer
+
+
+def _generate(analyzer, seed=21):
+    np.random.seed(seed)
+    return analyzer.generate_financial_data(verbose=False)
+
+
+def test_shock_with_microsim_matches_full_regeneration():
+    analyzer = PSFinanceAnalyzer()
+    analyzer.microsim_agents = 2000
+    whatif = analyzer.what_if(_generate(analyzer))
+    whatif.set_shock(2017, 'Revenus_Total', 0.8)
+
+    analyzer.party_events[2017]['Revenus_Total'] = 0.8
+    pd.testing.assert_frame_equal(whatif.data, _generate(analyzer), check_dtype=False)
+
+
+@pytest.mark.parametrize('column', ['Adherents', 'Cotisations_Adherents'])
+def test_microsim_columns_are_not_incremental(column):
+    analyzer = PSFinanceAnalyzer()
+    analyzer.microsim_agents = 2000
+    whatif = analyzer.what_if(_generate(analyzer))
+    with pytest.raises(ValueError):
+        whatif.set_shock(2017, column, 0.9)
+    with pytest.raises(ValueError):
+        whatif.set_regime(column, 0, 0.05)
+
+    # Sans microsimulation, ces colonnes restent recalculables en place
+    analyzer.microsim_agents = None
+    whatif = analyzer.what_if(_generate(analyzer))
+    whatif.set_shock(2017, column, 0.9)
+    analyzer.party_events[2017][column] = 0.9
+    assert whatif.value(column, 2017) == pytest.approx(_generate(analyzer).set_index('Annee').loc[2017, column])